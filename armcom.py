@@ -33,33 +33,44 @@
 ##########################################################################################
 
 import sys, os                                # for command line functions, for SDL window instruction, other OS-related stuff
+import time                                   # for wait function, startup timing
+IMPORT_START = time.perf_counter()            # when the game began loading
 if getattr(sys, 'frozen', False):             # needed for pyinstaller
     os.chdir(sys._MEIPASS)
-os.environ['PYSDL2_DLL_PATH'] = os.getcwd()   # set sdl2 dll path
 
 ##### Libraries #####
+from collections import deque          # for message log
 from datetime import datetime           # for recording date and time in campaign journal
 from math import atan2, degrees         # more "
 from math import pi, floor, ceil, sqrt  # math functions
 from operator import attrgetter         # for list sorting
 from textwrap import wrap               # for breaking up game messages
+import atexit                           # for saving queued screenshots and results on exit
 import csv                              # for loading campaign info
+import json                             # for saved game index
 import libtcodpy as libtcod             # The Doryen Library
 import random                           # for randomly selecting items from a list
 import shelve                           # for saving and loading games
-import time                             # for wait function
+import shutil                           # for copying the campaign journal
+import struct                           # for map pool file errors
+import threading                        # for starting steamworks and generating campaign maps in the background
 import xml.etree.ElementTree as xml     # ElementTree library for xml
 import xp_loader                        # for loading image files
 import gzip                             # for loading image files
-import zipfile, io                      # for loading from zip archive
-
-MIXER_ACTIVE = True
-try:
-	import sdl2.sdlmixer as mixer       # sound effects
-except:
-	MIXER_ACTIVE = False
-from steamworks import STEAMWORKS       # main steamworks library
-
+import heapq                            # for quest deadlines
+import io                               # for reading xml files from the asset pack
+
+# sdl2 and steamworks are only imported once the game starts them up, see InitMixer()
+#  and InitSteamworks()
+MIXER_ACTIVE = False
+
+from armcom_assets import AssetPack, PACK_FILE    # data files and sounds in one file
+from armcom_bones import BonesStore     # high scores and graveyard
+from armcom_mappool import MapPool, GenerateLayout, GetEdgesAndLinks, CheckPath    # campaign map layouts
+from armcom_screenshot import GrabScreen, ScreenshotWriter    # screenshots saved in the background
+from armcom_spectator import SpectatorServer, GetAddress    # streaming the screen to spectators
+from armcom_odds import ToHitOdds, ToKillOdds, MGOdds, VehicleKillOdds, InfantryKillOdds, FormatOdds    # combat odds
+from armcom_snapshot import EncounterSnapshot    # encounter snapshots for debug rollback
 from armcom_defs import *               # general definitions
 from armcom_vehicle_defs import *       # vehicle stat definitions
 
@@ -77,6 +88,16 @@ COMPATIBLE_VERSIONS = ['Beta 3.0']      # list of older versions for which the s
 
 DATAPATH = 'data' + os.sep        # path to data files
 
+SAVE_SLOTS = 3                # number of saved game slots
+SAVE_INDEX_FILE = 'savegames.json'    # header info for each saved game slot
+JOURNAL_BATCH = 20            # number of journal entries to hold before writing them
+STEAM_INIT_TIMEOUT = 15.0        # seconds to wait for steamworks to start up
+STEAM_CALLBACK_INTERVAL = 0.1        # minimum seconds between steamworks callback updates
+SCREENSHOT_BURST_FRAMES = 20        # number of frames captured by a rapid-fire screenshot
+SCREENSHOT_BURST_INTERVAL = 0.25    # seconds between rapid-fire screenshot frames
+MAP_POOL_FILE = DATAPATH + 'mappool.dat'    # pre-generated campaign map layouts
+ROLLBACK_MAX = 20            # number of encounter save points kept for debug rollback
+
 PI = pi
 
 SCREEN_WIDTH = 149            # width of game window in characters
@@ -89,6 +110,8 @@ TANK_CON_HEIGHT = 37    # height "
 
 MSG_CON_WIDTH = TANK_CON_WIDTH    # width of message console in characters
 MSG_CON_HEIGHT = 19        # height "
+MSG_HISTORY_MAX = 2000        # maximum number of message lines kept for review
+MSG_WRAP_CACHE_MAX = 256    # maximum number of wrapped messages to cache
 
 MAP_CON_WIDTH = 73    # width of encounter map console in characters
 MAP_CON_HEIGHT = 51    # height "
@@ -116,6 +139,10 @@ TEXT_CON_HEIGHT = 57            # height "
 TEXT_CON_XM = int(TEXT_CON_WIDTH/2)    # horizontal center "
 TEXT_CON_X = SCREEN_XM - TEXT_CON_XM    # x/y location to draw window
 TEXT_CON_Y = 2
+TEXT_VIEW_WIDTH = 84            # width of text lines in text display console
+TEXT_VIEW_LINES = 49            # number of text lines displayed at once "
+TEXT_WRAP_CACHE_MAX = 8            # maximum number of texts to keep wrapped lines for
+SCREEN_CACHE_MAX = 12            # maximum number of pre-rendered screens to keep
 
 C_MAP_CON_WIDTH = 90        # width of campaign map console
 C_MAP_CON_HEIGHT = 90        # height "
@@ -165,6 +192,90 @@ DIRT_ROAD_MOVE_TIME = 45    # " dirt road
 NO_ROAD_MOVE_TIME = 60        # " no road
 GROUND_MOVE_TIME_MODIFIER = 15    # additional time required if ground is muddy / rain / snow
 
+# VP for each enemy unit destroyed, by its index in the battle record stats, see
+# GetKORecordIndex()
+VP_SCORES = [1, 1, 2, 6, 7, 9, 12, 4]
+
+# sector bitmasks for crew spotting areas that don't depend on a selected sector or
+# on the turret facing; bit n is set if sector n can be spotted
+SPOT_AREA_MASKS = {
+    'None' : 0,
+    'All' : 0b111111,
+    'All Except Rear' : 0b111101,
+    'Tank Front' : 0b010000
+}
+
+# enemy unit action odds tables, by unit class and scenario type
+# upper limits of percentile rolls for: do nothing, move closer, move laterally, move
+#  away, attack infantry, attack friendly tank (player if shot at), attack player tank;
+#  anything higher is an attack on the lead tank
+ENEMY_ACTION_ODDS = {
+    ('TANK', 'Advance') : [10,30,40,60,65,80,85],
+    ('TANK', 'Battle') : [10,20,25,35,40,85,90],
+    ('TANK', 'Counterattack') : [10,50,60,70,75,95,100],
+    ('APC', 'Advance') : [10,20,30,40,60,65,80],
+    ('APC', 'Battle') : [10,15,20,25,35,40,85],
+    ('APC', 'Counterattack') : [10,40,50,60,70,75,80],
+    ('TRUCK', None) : [30,40,75,110,0,0,0],
+    ('AC', None) : [15,25,50,60,75,85,100],
+    ('AT_GUN', 'Advance') : [30,0,0,0,0,65,70],
+    ('AT_GUN', 'Battle') : [30,0,0,0,0,80,90],
+    ('LW', 'Advance') : [10,20,40,60,95,0,0],
+    ('LW', 'Battle') : [10,20,40,60,95,0,0],
+    ('LW', 'Counterattack') : [10,40,60,70,95,0,100]
+}
+for (unit_class, scen_type) in list(ENEMY_ACTION_ODDS.keys()):
+    if unit_class == 'TANK':
+        ENEMY_ACTION_ODDS[('SPG', scen_type)] = ENEMY_ACTION_ODDS[(unit_class, scen_type)]
+    elif unit_class == 'LW':
+        ENEMY_ACTION_ODDS[('MG', scen_type)] = ENEMY_ACTION_ODDS[(unit_class, scen_type)]
+
+# final enemy action tables, keyed by unit class, scenario type, and ambush flag; an ambush
+#  modifier is added to the action roll, so it is applied here by lowering each limit instead
+ENEMY_ACTION_TABLE = {}
+for (unit_class, scen_type), ranges in ENEMY_ACTION_ODDS.items():
+    for scen in ([scen_type] if scen_type is not None else ['Advance', 'Battle', 'Counterattack']):
+        ENEMY_ACTION_TABLE[(unit_class, scen, False)] = tuple(ranges)
+        modifier = 10
+        if unit_class in ['LW', 'MG', 'AT_GUN']: modifier += 10
+        ENEMY_ACTION_TABLE[(unit_class, scen, True)] = tuple([n - modifier for n in ranges])
+
+# enemy unit terrain charts, by campaign map area type; highest D10 roll for each of
+#  ENEMY_TERRAIN_TYPES, see EnemyUnit.SetTerrain()
+ENEMY_TERRAIN_TYPES = ['Hull Down', 'Woods', 'Building', 'Open']
+INFANTRY_TERRAIN = {
+    'A' : [0, 2, 8, 10],    # farm buildings and fields
+    'B' : [0, 3, 5, 10],    # fields
+    'C' : [0, 1, 6, 10],    # village
+    'D' : [0, 6, 7, 10],    # woods
+    'F' : [0, 4, 5, 10]    # bocage
+}
+VEHICLE_TERRAIN = {
+    'A' : [4, 6, 0, 10],
+    'B' : [2, 3, 0, 10],
+    'C' : [5, 6, 0, 10],
+    'D' : [2, 7, 0, 10],
+    'F' : [7, 8, 0, 10]
+}
+
+# highest D10 roll for a front and a side facing, by enemy unit class; other classes
+#  have no facing, see EnemyUnit.SetFacing()
+FACING_ROLLS = {
+    'SPG' : (6, 9), 'AT_GUN' : (6, 9), 'TANK' : (5, 9), 'TRUCK' : (3, 7), 'APC' : (3, 7),
+    'AC' : (3, 7)
+}
+
+# enemy attack kill numbers at close, medium and long range: against friendly infantry
+#  by unit class, and against friendly tanks by gun type
+ATTACK_INFANTRY_TK = {
+    'TANK' : [65, 40, 10], 'SPG' : [65, 40, 10], 'AC' : [30, 20, 3], 'LW' : [30, 20, 3],
+    'MG' : [55, 30, 3], 'APC' : [55, 30, 3], 'TRUCK' : [55, 30, 3], 'AT_GUN' : [55, 30, 3]
+}
+ATTACK_TANK_TK = {
+    '50L' : [15, 5, 1], '75L' : [52, 40, 22], '75LL' : [68, 66, 61], '88L' : [68, 63, 43],
+    '88LL' : [68, 66, 61]
+}
+
 # Colour Defintions
 KEY_COLOR = libtcod.Color(255, 0, 255)            # key color for transparency
 
@@ -198,14 +309,31 @@ HIGHLIGHT = (libtcod.COLCTRL_1, libtcod.COLCTRL_STOP)    # constant for highligh
 
 TITLE_GROUND_COLOR = libtcod.Color(26, 79, 5)        # color of ground in main menu
 
+# sound effects that the game can play, loaded the first time each one is played
+SOUND_LIST = ['20_mm_gun', '75_mm_gun', '76_mm_gun', '88_mm_gun', 'main_gun_misfire',
+    'menu_select', 'aa_mg_firing', 'armour_save',
+    'arty_firing', 'bow_mg_firing', 'coax_mg_firing', 'dice_roll',
+    'engine_noise', 'german_rifle_fire', 'german_mg_fire', 'infantry_moving',
+    'panzerfaust_firing', 'radio', 'screenshot', 'shell_move',
+    'sherman_movement', 'smoke_hit', 'tank_knocked_out',
+    'hatch_open', 'hatch_close', 'he_hit', 'ap_hit', 'main_gun_miss',
+    'new_skill'
+    ]
 SOUNDS = {}                        # sound effects
+MSG_WRAP_CACHE = {}                    # wrapped lines for recent message texts
+TEXT_WRAP_CACHE = {}                    # wrapped lines for recently displayed texts, by
+                            #  text id and width
+SCREEN_CACHE = {}                    # pre-rendered static screens, by screen id and
+                            #  state, least recently used first
+JOURNAL_BUFFER = []                    # journal entries not yet written to journal file
 
 ##########################################################################################
 #                                       Classes                                          #
 ##########################################################################################
 
 # Bones Class
-# records high scores and other info between play sessions
+# records high scores and other info between play sessions; replaced by the bones
+# database, only used now to read bones files from older versions
 class Bones:
     def __init__(self):
         self.score_list = []
@@ -224,12 +352,25 @@ class Bones:
 # holds basic information about a saved game, only read by main menu and only written to
 # by SaveGame, doesn't impact gameplay otherwise
 class SavedGameInfo:
-    def __init__(self, game_version, campaign_name, commander_name, tank_name, current_date):
+    def __init__(self, game_version, campaign_name, commander_name, tank_name, current_date,
+        play_time=0):
         self.game_version = game_version
         self.campaign_name = campaign_name
         self.commander_name = commander_name
         self.tank_name = tank_name
         self.current_date = current_date
+        self.play_time = play_time    # total time played in seconds
+
+    # returns true if this saved game can be loaded by this version
+    def IsCompatible(self):
+        return self.game_version == VERSION or self.game_version in COMPATIBLE_VERSIONS
+
+    # return a one-line description of this saved game
+    def GetDesc(self):
+        minutes = int(self.play_time / 60)
+        return (self.campaign_name + ', ' + self.commander_name + ', ' + self.tank_name +
+            ', ' + self.current_date + ' (' + str(int(minutes / 60)) + 'h ' +
+            str(minutes % 60).zfill(2) + 'm played)')
 
 
 # Campaign Day Map Class
@@ -242,6 +383,33 @@ class CampaignDayMap:
         self.blocked_nodes = set()    # set of impassible map nodes
         self.char_locations = dict()    # dictionary for character location parent nodes
         self.player_node = None        # pointer to player location
+        self.quest_deadlines = []    # heap of quest time limits: (hour, minute,
+                        #  node index)
+
+    # add a quest time limit for a node to the heap of deadlines
+    def AddQuestDeadline(self, node):
+        (h, m) = node.quest_time_limit
+        heapq.heappush(self.quest_deadlines, (h, m, self.nodes.index(node)))
+
+    # rebuild the heap of quest deadlines from the map nodes
+    def BuildQuestDeadlines(self):
+        self.quest_deadlines = []
+        for node in self.nodes:
+            if node.quest_time_limit is not None:
+                self.AddQuestDeadline(node)
+
+    # remove and return any nodes whose quest time limit has passed
+    # deadlines for quests that have since been completed are discarded
+    def PopExpiredQuests(self, hour, minute):
+        nodes = []
+        while len(self.quest_deadlines) > 0:
+            (h, m, i) = self.quest_deadlines[0]
+            if (hour, minute) <= (h, m): break
+            heapq.heappop(self.quest_deadlines)
+            node = self.nodes[i]
+            if node.quest_time_limit == (h, m):
+                nodes.append(node)
+        return nodes
 
 
 # Map Node Class
@@ -409,6 +577,26 @@ class Weather:
                 elif roll >= 8:
                     self.ground = 'Mud'
 
+    # advance the weather and ground cover over a number of minutes, returning a
+    #  pair of flags for whether the weather and the ground cover changed
+    # consoles are not updated, the caller should do this once afterward
+    def AdvanceTime(self, minutes):
+
+        # check for rain accumilation for mud, dry weather for dry ground,
+        # or snow for snow / deep snow cover
+        ground_change = self.CheckGround(minutes, update_consoles=False)
+
+        # check for weather change, 10% per 15 mins
+        weather_change = False
+        for c in range(int(ceil(float(minutes) / 15.0))):
+            if libtcod.random_get_int(0, 1, 10) == 1:
+                old_weather = (self.clouds, self.fog, self.precip)
+                self.CheckChange()
+                if (self.clouds, self.fog, self.precip) != old_weather:
+                    weather_change = True
+
+        return (weather_change, ground_change)
+
     # check to see if weather changes, and apply effects if so
     def CheckChange(self):
         d1, d2, roll = Roll2D6()
@@ -475,7 +663,7 @@ class Weather:
 
     # check for a change in ground cover based on accumilated precip
     # or lack thereof
-    def CheckGround(self, minutes_passed):
+    def CheckGround(self, minutes_passed, update_consoles=True):
         change = False
         if self.precip == 'Rain':
             if self.ground != 'Mud':
@@ -507,7 +695,7 @@ class Weather:
                     change = True
 
         # if there was a change, update consoles
-        if change:
+        if change and update_consoles:
             if battle is not None:
                 UpdateMapOverlay()
             else:
@@ -515,6 +703,8 @@ class Weather:
                 UpdateCActionCon()
                 UpdateCInfoCon(mouse.cx, mouse.cy)
 
+        return change
+
 
 # Hex Class
 # holds information on a hex location in the battle encounter map
@@ -616,6 +806,7 @@ class Campaign:
         self.sounds = True        # in-game sound effects
         self.pause_labels = True    # wait for enter after displaying a label
         self.tutorial_message = True    # display tutorial message windows
+        self.show_odds = False        # display the chance of success of attacks
 
         self.current_date = [0,0,0]    # current year, month, date
 
@@ -636,7 +827,8 @@ class Campaign:
         self.gyro_skill_avail = False    # gyrostabilier skill is available
 
         self.stats = {}            # campaign statistics, for display at end of campaign
-        self.campaign_journal = []    # list of text descriptions of campaign
+        self.journal_offset = 0        # length of journal file when game was last saved
+        self.play_time = 0        # seconds played in this campaign as of last save
         self.record_day_vp = 0        # highest one-day VP score this month
 
 
@@ -911,6 +1103,7 @@ class Campaign:
                 h = campaign.hour + libtcod.random_get_int(0, 2, 4)
                 m = campaign.minute
                 node.quest_time_limit = (h, m)
+                campaign.day_map.AddQuestDeadline(node)
                 text = ('Commander, you are requested to head to the highlighted ' +
                     'map location. Allied units are pinned down in the area ' +
                     'and require your help. If completed at or before ' +
@@ -1263,41 +1456,37 @@ class Campaign:
         self.hour += hours
         UpdateDateCon()
 
-        # check for rain accumilation for mud, dry weather for dry ground,
-        # or snow for snow / deep snow cover
-        self.weather.CheckGround(((hours*60) + minutes))
-
-        # check for weather change, 10% per 15 mins
-        checks = (hours * 4) + int(ceil(float(minutes) / 15.0))
-        for c in range(checks):
-            if libtcod.random_get_int(0, 1, 10) == 1:
-                self.weather.CheckChange()
-                # in case there was a change, update consoles
-                if battle is not None:
-                    PaintMapCon()
-                else:
-                    campaign.BuildActionList()
-                    UpdateCActionCon()
-                    UpdateCInfoCon(mouse.cx, mouse.cy)
+        # advance weather and ground cover over the whole period at once
+        (weather_change, ground_change) = self.weather.AdvanceTime((hours*60) + minutes)
 
         # check for quest time limit, eg. RESCUE
-        if self.quest_active:
-            for node in self.day_map.nodes:
-                if node.quest_time_limit is not None:
-                    (h,m) = node.quest_time_limit
-                    if self.hour > h or (self.hour == h and self.minute > m):
-                        # cancel quest
-                        text = ('Time has run out to complete ' +
-                            node.quest_type + ' quest.')
-                        PopUp(text)
-                        WriteJournal(text)
-                        node.quest_type = None
-                        node.quest_vp_bonus = None
-                        node.quest_time_limit = None
-                        self.quest_active = False
-                        if battle is None:
-                            UpdateCOverlay()
-                    break
+        quest_expired = False
+        if self.day_map is not None:
+            for node in self.day_map.PopExpiredQuests(self.hour, self.minute):
+                # cancel quest
+                text = ('Time has run out to complete ' +
+                    node.quest_type + ' quest.')
+                PopUp(text)
+                WriteJournal(text)
+                node.quest_type = None
+                node.quest_vp_bonus = None
+                node.quest_time_limit = None
+                self.quest_active = False
+                quest_expired = True
+
+        # update consoles once for any changes
+        if battle is not None:
+            if weather_change:
+                PaintMapCon()
+            if ground_change:
+                UpdateMapOverlay()
+        else:
+            if weather_change or ground_change:
+                self.BuildActionList()
+                UpdateCActionCon()
+                UpdateCInfoCon(mouse.cx, mouse.cy)
+            if quest_expired:
+                UpdateCOverlay()
 
     # check to see if it is at or past sunset, and trigger campaign day end if true
     def CheckSunset(self):
@@ -1995,6 +2184,7 @@ class Crewman:
         self.hatch = 'None'    # hatch status
         self.spot = 'None'    # spot status
         self.spot_sector = 4    # sector spotting in if limited to any one
+        self.spot_mask = 0    # bitmask of sectors in which crewman can spot
 
         self.orders_list = []    # list of possible orders for this crewman
 
@@ -2077,28 +2267,16 @@ class Crewman:
 
     # add an entry to the bones file recording this crewman's demise
     def AddHeadStone(self):
+        # get most recent decortation
+        if len(self.decorations) > 0:
+            decoration_text = self.decorations[-1]
+        else:
+            decoration_text = ''
+
         try:
-            # open bones file
-            save = shelve.open('bones')
-            bones = save['bones']
-            save.close()
-    
-            # add the entry
-    
-            # get most recent decortation
-            if len(self.decorations) > 0:
-                decoration_text = self.decorations[-1]
-            else:
-                decoration_text = ''
-    
-            bones.graveyard.append([self.GetRank(), self.name, self.hometown, campaign.GetDate(), decoration_text])
-    
-            # save the bones file
-            save = shelve.open('bones')
-            save['bones'] = bones
-            save.close()
+            bones.AddGrave([self.GetRank(), self.name, self.hometown, campaign.GetDate(), decoration_text])
         except:
-            print('ERROR: Could not open bones file')
+            print('ERROR: Could not write to bones file')
 
     # award a decoration to this crewman, and display a window with information about
     #  the decoration
@@ -2551,6 +2729,7 @@ class Crewman:
     def SetSpotAbility(self):
         if self.NoActions():
             self.spot = 'None'
+            self.SetSpotMask()
             return
 
         # check order spot effects
@@ -2558,6 +2737,7 @@ class Crewman:
             if order.name == self.order:
                 if not order.spot:
                     self.spot = 'None'
+                    self.SetSpotMask()
                     return
                 break
 
@@ -2602,6 +2782,21 @@ class Crewman:
         else:
             self.spot = 'None'        # should not be used
 
+        self.SetSpotMask()
+
+    # precalculate the sector bitmask for this crewman's spot ability; 'Any One Sector'
+    # and 'Turret Front' are resolved when spotting since they can change afterwards
+    def SetSpotMask(self):
+        self.spot_mask = SPOT_AREA_MASKS.get(self.spot, 0)
+
+    # return the bitmask of sectors in which this crewman can currently spot
+    def GetSpotMask(self):
+        if self.spot == 'Any One Sector':
+            return 1 << self.spot_sector
+        elif self.spot == 'Turret Front':
+            return 1 << tank.turret_facing
+        return self.spot_mask
+
     # check that our current order is allowed
     def CurrentOrderOK(self):
         for order in self.orders_list:
@@ -2857,8 +3052,15 @@ class Battle:
         self.smoke_factors = []    # list of active smoke factor hexes
                     # (hx, hy, smoke level)
 
-        self.messages = []    # list of game messages
+        self.messages = deque(maxlen=MSG_CON_HEIGHT)    # lines shown in message console
+        self.msg_history = deque(maxlen=MSG_HISTORY_MAX)    # all message lines, for review
+        self.msg_batch = 0    # if > 0, message console is only redrawn at end of batch
+        self.msg_dirty = False    # message console needs to be redrawn
         self.enemy_units = []    # list of active enemy units
+        self.spot_index = [[], [], [], [], [], []]    # live enemy units that still need
+                                # to be spotted or identified, by sector
+        self.label_queue = None    # labels waiting to be shown; if None, labels are
+                    # shown as they happen
         self.vp_total = 0    # current total player VP for encounter
 
         self.mouseover = (-1, -1)    # keeps track of mouse position
@@ -2909,6 +3111,7 @@ class Battle:
                         #  that have arrived in this battle
         self.rounds_passed = 1        # total number of game rounds that have
                         #  passed in this battle encounter
+        self.start_time = None        # campaign (hour, minute) when the encounter began
 
         # current encounter result
         self.result = 'Undetermined'
@@ -2917,11 +3120,65 @@ class Battle:
         for (hx, hy, rng, sector) in HEXES:
             self.maphexes.append(MapHex(hx, hy, rng, sector))
 
+    # remove a unit from the spotting index
+    def RemoveFromSpotIndex(self, unit):
+        for sector_list in self.spot_index:
+            if unit in sector_list:
+                sector_list.remove(unit)
+                return
+
+    # add or re-file a unit in the spotting index; called when a unit spawns, moves,
+    # is rotated around the player tank, or has its spotting status changed
+    def IndexUnit(self, unit):
+        self.RemoveFromSpotIndex(unit)
+        if unit.alive and unit.NeedsSpotting():
+            self.spot_index[unit.map_hex.sector].append(unit)
+
+    # rebuild the spotting index from scratch, used when loading a saved encounter
+    def BuildSpotIndex(self):
+        self.spot_index = [[], [], [], [], [], []]
+        for n, unit in enumerate(self.enemy_units):
+            unit.spawn_num = n
+            self.IndexUnit(unit)
+
+    # return a list of indexed units in any of the sectors of the given bitmask, in
+    # the order they were spawned
+    def GetSpotCandidates(self, mask):
+        candidates = []
+        for sector in range(6):
+            if not mask & (1 << sector): continue
+            for unit in self.spot_index[sector]:
+                candidates.append(unit)
+        return sorted(candidates, key=attrgetter('spawn_num'))
+
+
+# return the index of an enemy unit in the battle record stats: LW and MG, Truck, APCs
+# and ACs, SPG, PzKw IV H, PzKw V G, PzKw VI E and B, AT Gun; or -1 if it has none
+def GetKORecordIndex(unit_class, unit_type):
+    if unit_class in ['LW', 'MG']:
+        return 0
+    elif unit_class == 'TRUCK':
+        return 1
+    elif unit_class in ['APC', 'AC']:
+        return 2
+    elif unit_class == 'SPG':
+        return 3
+    elif unit_type == 'PzKw IV H':
+        return 4
+    elif unit_type == 'PzKw V G':
+        return 5
+    elif unit_type in ['PzKw VI E', 'PzKw VI B']:
+        return 6
+    elif unit_class == 'AT_GUN':
+        return 7
+    return -1
+
 
 # Enemy Units
 class EnemyUnit:
     def __init__(self):
         self.alive = True    # set to false if destroyed
+        self.spawn_num = 0    # order in which unit was added to the encounter
         self.map_hex = None    # hex location
         self.x = 0        # x position in map console
         self.y = 0        # y "
@@ -3024,6 +3281,7 @@ class EnemyUnit:
         roll_action.drm = drm
         roll_action.CalculateTotalDRM()
         roll_action.roll_req = roll_action.score_req - roll_action.total_drm
+        roll_action.odds = ToHitOdds(roll_action.roll_req, critical=False)['Hit']
 
         ##### To-hit Roll #####
         d1, d2, roll = Roll2D6()
@@ -3093,6 +3351,7 @@ class EnemyUnit:
             roll_action.drm = drm
             roll_action.CalculateTotalDRM()
             roll_action.roll_req = roll_req
+            roll_action.odds = ToKillOdds(roll_req)['Kill']
 
             ##### To kill Roll #####
             d1, d2, roll = Roll2D6()
@@ -3174,6 +3433,11 @@ class EnemyUnit:
     def Reset(self):
         self.shot_at = False
 
+    # returns true if this unit could still be spotted or identified by the player
+    def NeedsSpotting(self):
+        if not self.spotted: return True
+        return self.unit_class in ['TANK', 'SPG', 'AT_GUN'] and not self.identified
+
     # draw this unit on the map overlay
     def DrawMe(self):
         # skip if inactive
@@ -3266,34 +3530,22 @@ class EnemyUnit:
             if map_hex.hx == new_x and map_hex.hy == new_z:
                 self.map_hex = map_hex
                 (self.x, self.y) = self.GetCharLocation()
+                battle.IndexUnit(self)
                 return
         print ('ERROR: could not find hex ' + str(new_x) + ',' + str(new_z))
 
     # record this unit's destruction in the battle record
     def RecordKO(self, friendly=False, left_behind=False, advance_fire=False):
 
+        # unit no longer needs to be spotted
+        battle.RemoveFromSpotIndex(self)
+
         if not left_behind and friendly:
             text = self.GetDesc() + ' was destroyed by friendly action'
             WriteJournal(text)
 
         # determine index number for this unit in list of units destroyed
-        index = -1
-        if self.unit_class in ['LW', 'MG']:
-            index = 0
-        elif self.unit_class == 'TRUCK':
-            index = 1
-        elif self.unit_class in ['APC', 'AC']:
-            index = 2
-        elif self.unit_class == 'SPG':
-            index = 3
-        elif self.unit_type == 'PzKw IV H':
-            index = 4
-        elif self.unit_type == 'PzKw V G':
-            index = 5
-        elif self.unit_type in ['PzKw VI E', 'PzKw VI B']:
-            index = 6
-        elif self.unit_class == 'AT_GUN':
-            index = 7
+        index = GetKORecordIndex(self.unit_class, self.unit_type)
 
         if index < 0:
             print ('RecordKO() error: could not find unit type')
@@ -3338,32 +3590,19 @@ class EnemyUnit:
     # if facing has changed, return True
     def SetFacing(self):
         result = Roll1D10()
-        if self.unit_class in ['SPG', 'AT_GUN']:
-            if result <= 6:
-                new_facing = 'Front'
-            elif result <= 9:
-                new_facing = 'Side'
-            else:
-                new_facing = 'Rear'
-        elif self.unit_class == 'TANK':
-            if result <= 5:
-                new_facing = 'Front'
-            elif result <= 9:
-                new_facing = 'Side'
-            else:
-                new_facing = 'Rear'
-        elif self.unit_class in ['TRUCK', 'APC', 'AC']:
-            if result <= 3:
-                new_facing = 'Front'
-            elif result <= 7:
-                new_facing = 'Side'
-            else:
-                new_facing = 'Rear'
 
-        # otherwise, don't need to set facing
-        else:
+        # some units don't need to set facing
+        if self.unit_class not in FACING_ROLLS:
             return False
 
+        (front, side) = FACING_ROLLS[self.unit_class]
+        if result <= front:
+            new_facing = 'Front'
+        elif result <= side:
+            new_facing = 'Side'
+        else:
+            new_facing = 'Rear'
+
         # set facing if different and report back that it changed
         if new_facing != self.facing:
             self.facing = new_facing
@@ -3373,32 +3612,8 @@ class EnemyUnit:
     # set or redetermine the terrain for this unit
     def SetTerrain(self):
 
-        # list of terrain types
-        TERRAIN_TYPE = [
-            'Hull Down', 'Woods', 'Building', 'Open'
-        ]
-
-        # infantry unit chart
-        INFANTRY_TERRAIN = [
-            [0, 2, 8, 10],    # Area A: farm buildings and fields
-            [0, 3, 5, 10],    # Area B: fields
-            [0, 1, 6, 10],    # Area C: village
-            [0, 6, 7, 10],    # Area D: Woods
-            [0, 4, 5, 10],    # Area F: Bocage
-        ]
-
-        # vehicle unit chart
-        VEHICLE_TERRAIN = [
-            [4, 6, 0, 10],    # Area A
-            [2, 3, 0, 10],    # Area B
-            [5, 6, 0, 10],    # Area C
-            [2, 7, 0, 10],    # Area D
-            [7, 8, 0, 10]    # Area F
-        ]
-
         # determine table row to use
-        AREA_TYPES = ['A', 'B', 'C', 'D', 'F']
-        table_row = AREA_TYPES.index(campaign.day_map.player_node.node_type)
+        area_type = campaign.day_map.player_node.node_type
 
         # do roll
         result = Roll1D10()
@@ -3412,9 +3627,9 @@ class EnemyUnit:
         # infantry units
         if self.unit_class in ['LW', 'MG', 'AT_GUN']:
             n = 0
-            for value in INFANTRY_TERRAIN[table_row]:
+            for value in INFANTRY_TERRAIN[area_type]:
                 if result <= value:
-                    terrain = TERRAIN_TYPE[n]
+                    terrain = ENEMY_TERRAIN_TYPES[n]
                     break
                 n += 1
 
@@ -3430,9 +3645,9 @@ class EnemyUnit:
         # vehicle units
         else:
             n = 0
-            for value in VEHICLE_TERRAIN[table_row]:
+            for value in VEHICLE_TERRAIN[area_type]:
                 if result <= value:
-                    terrain = TERRAIN_TYPE[n]
+                    terrain = ENEMY_TERRAIN_TYPES[n]
                     break
                 n += 1
 
@@ -3530,6 +3745,7 @@ class EnemyUnit:
                 # move is ok, proceed
                 self.map_hex = map_hex
                 self.moving = True
+                battle.IndexUnit(self)
 
                 # re-determine draw location
                 (self.x, self.y) = self.GetCharLocation()
@@ -3569,6 +3785,7 @@ class EnemyUnit:
             if Roll1D6() <= 3: return False
 
             self.alive = False
+            battle.RemoveFromSpotIndex(self)
             Message(self.GetDesc() + ' has left the area.')
             UpdateMapOverlay()
             RenderEncounter()
@@ -3681,6 +3898,7 @@ class EnemyUnit:
             self.spotting_player = False
         self.SetFacing()
         self.SetTerrain()
+        battle.IndexUnit(self)
 
     # do an attack against friendly infantry
     def AttackInfantry(self):
@@ -3729,28 +3947,7 @@ class EnemyUnit:
             return
 
         # otherwise, determine tk number
-        if self.unit_class in ['TANK', 'SPG']:
-            if self.map_hex.rng == 0:
-                tk_num = 65    # close range
-            elif self.map_hex.rng == 1:
-                tk_num = 40    # medium range
-            else:
-                tk_num = 10    # long range
-        elif self.unit_class in ['AC', 'LW']:
-            if self.map_hex.rng == 0:
-                tk_num = 30
-            elif self.map_hex.rng == 1:
-                tk_num = 20
-            else:
-                tk_num = 3
-        else:
-            # MG / APC
-            if self.map_hex.rng == 0:
-                tk_num = 55
-            elif self.map_hex.rng == 1:
-                tk_num = 30
-            else:
-                tk_num = 3
+        tk_num = ATTACK_INFANTRY_TK[self.unit_class][self.map_hex.rng]
 
         # apply smoke modifier
         smoke_factors = GetSmokeFactors(0, 0, self.map_hex.hx, self.map_hex.hy)
@@ -3810,44 +4007,10 @@ class EnemyUnit:
         self.fired = True
 
         # determine tk number
-        if gun_type == '50L':
-            if self.map_hex.rng == 0:
-                tk_num = 15
-            elif self.map_hex.rng == 1:
-                tk_num = 5
-            else:
-                tk_num = 1
-        elif gun_type == '75L':
-            if self.map_hex.rng == 0:
-                tk_num = 52
-            elif self.map_hex.rng == 1:
-                tk_num = 40
-            else:
-                tk_num = 22
-        elif gun_type == '75LL':
-            if self.map_hex.rng == 0:
-                tk_num = 68
-            elif self.map_hex.rng == 1:
-                tk_num = 66
-            else:
-                tk_num = 61
-        elif gun_type == '88L':
-            if self.map_hex.rng == 0:
-                tk_num = 68
-            elif self.map_hex.rng == 1:
-                tk_num = 63
-            else:
-                tk_num = 43
-        elif gun_type == '88LL':
-            if self.map_hex.rng == 0:
-                tk_num = 68
-            elif self.map_hex.rng == 1:
-                tk_num = 66
-            else:
-                tk_num = 61
-        else:
+        if gun_type not in ATTACK_TANK_TK:
             Message('ERROR: Unrecognized gun type in AttackTank()')
             return
+        tk_num = ATTACK_TANK_TK[gun_type][self.map_hex.rng]
 
         # apply AT gun rotation modifier
         if self.unit_class == 'AT_GUN':
@@ -3979,6 +4142,7 @@ class EnemyUnit:
         roll_action.drm = drm
         roll_action.CalculateTotalDRM()
         roll_action.roll_req = roll_req
+        roll_action.odds = ToHitOdds(roll_req, critical=False, malfunction=False)['Hit']
 
         ##### To-hit Roll #####
         d1, d2, roll = Roll2D6()
@@ -4040,6 +4204,7 @@ class EnemyUnit:
                 roll_action.drm = drm
                 roll_action.CalculateTotalDRM()
                 roll_action.roll_req = roll_req
+                roll_action.odds = ToKillOdds(roll_req)['Kill']
 
                 ##### To kill Roll #####
                 d1, d2, roll = Roll2D6()
@@ -4192,6 +4357,7 @@ class EnemyUnit:
             roll_action.drm = drm
             roll_action.CalculateTotalDRM()
             roll_action.roll_req = roll_req
+            roll_action.odds = ToKillOdds(roll_req, infantry=(not vehicle))['Kill']
 
             # if KO is impossible or auto
             if roll_req <= 2 or roll_req > 12:
@@ -4513,20 +4679,9 @@ class EnemyUnit:
             ShowLabel(self.x+MAP_CON_X, self.y+MAP_CON_Y, self.GetDesc() + text)
             return
 
-        # build odds table for this unit:
-        # do nothing, move closer, move laterally, move away, attack infantry,
-        #  attack friendly tank (player if shot at), attack player tank, attack lead tank
-        if self.unit_class in ['TANK', 'SPG']:
-            if campaign.scen_type == 'Advance':
-                ranges = [10,30,40,60,65,80,85]
-            elif campaign.scen_type == 'Battle':
-                ranges = [10,20,25,35,40,85,90]
-            else:
-                ranges = [10,50,60,70,75,95,100]
-
         # APCs will not normally choose to attack armoured battlegroups. Their main
         # mission is to drop their crew if possible and then retreat to a safe distance
-        elif self.unit_class == 'APC':
+        if self.unit_class == 'APC':
 
             # chance to dismount infantry
             if self.full_apc and self.map_hex.rng <= 1:
@@ -4535,17 +4690,6 @@ class EnemyUnit:
                     self.DismountInfantry()
                     return
 
-            if campaign.scen_type == 'Advance':
-                ranges = [10,20,30,40,60,65,80]
-            elif campaign.scen_type == 'Battle':
-                ranges = [10,15,20,25,35,40,85]
-            else:
-                ranges = [10,40,50,60,70,75,80]
-
-        # Trucks move around a lot but don't do very much
-        elif self.unit_class == 'TRUCK':
-            ranges = [30,40,75,110,0,0,0]
-
         # Armoured Cars can attack friendly infantry, and can spot the player
         #  tank to help other enemy attacks
         elif self.unit_class == 'AC':
@@ -4561,32 +4705,16 @@ class EnemyUnit:
                 self.moving = False
                 return
 
-            ranges = [15,25,50,60,75,85,100]
-
-        # Anti-tank Gun
-        elif self.unit_class == 'AT_GUN':
-            if campaign.scen_type == 'Advance':
-                ranges = [30,0,0,0,0,65,70]
-            elif campaign.scen_type == 'Battle':
-                ranges = [30,0,0,0,0,80,90]
-
-        # Light Weapons or Machine Gun Infantry Squad
-        elif self.unit_class in ['LW', 'MG']:
-            if campaign.scen_type in ['Advance', 'Battle']:
-                ranges = [10,20,40,60,95,0,0]
-            else:
-                ranges = [10,40,60,70,95,0,100]
+        # get odds table for this unit; any ambush modifier is already applied
+        ranges = ENEMY_ACTION_TABLE[(self.unit_class, campaign.scen_type, ambush)]
 
         ###################################################################
         #   try to roll an action result that is possible for the unit    #
         ###################################################################
         for i in range(300):
 
-            # do action roll and apply ambush modifier if any
+            # do action roll
             result = Roll1D100()
-            if ambush:
-                result += 10
-                if self.unit_class in ['LW', 'MG', 'AT_GUN']: result += 10
 
             # check final result against odds table
 
@@ -4675,6 +4803,7 @@ class RollAction():
         self.d2 = 0            # d2 result
         self.result = ''        # description of roll result
         self.rof_result = ''        # rate of fire result if any
+        self.odds = None        # chance of success, displayed if odds are shown
 
     # add up all dice roll modifiers
     def CalculateTotalDRM(self):
@@ -4696,9 +4825,73 @@ def GetTimeUntil(h1, m1, h2, m2):
     return (hours, m2-m1)
 
 
-# add a line to the campaign journal
+# return the campaign journal stream file for the current saved game slot
+def GetJournalFile():
+    return GetSaveFilename(save_slot) + '_journal.txt'
+
+
+# add a line to the campaign journal; lines are written to the journal file in batches
 def WriteJournal(text):
-    campaign.campaign_journal.append(text)
+    JOURNAL_BUFFER.append(text)
+    if len(JOURNAL_BUFFER) >= JOURNAL_BATCH:
+        FlushJournal()
+
+
+# write any buffered journal lines to the end of the journal file
+def FlushJournal():
+    if len(JOURNAL_BUFFER) == 0: return
+    with open(GetJournalFile(), 'a') as f:
+        for line in JOURNAL_BUFFER:
+            f.write(line + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    del JOURNAL_BUFFER[:]
+
+
+# start a new, empty journal file for a new campaign
+def StartJournal():
+    del JOURNAL_BUFFER[:]
+    open(GetJournalFile(), 'w').close()
+    campaign.journal_offset = 0
+
+
+# record the current length of the journal file in the campaign object, called when
+# saving the game
+def MarkJournal():
+    FlushJournal()
+    if os.path.exists(GetJournalFile()):
+        campaign.journal_offset = os.path.getsize(GetJournalFile())
+    else:
+        campaign.journal_offset = 0
+
+
+# cut the journal file back to its length when the game was saved, discarding any
+# entries written since then; called when loading a saved game
+def RestoreJournal():
+    del JOURNAL_BUFFER[:]
+
+    # older saved games hold the whole journal
+    if hasattr(campaign, 'campaign_journal'):
+        with open(GetJournalFile(), 'w') as f:
+            for line in campaign.campaign_journal:
+                f.write(line + '\n')
+        del campaign.campaign_journal
+        MarkJournal()
+        return
+
+    if not os.path.exists(GetJournalFile()):
+        open(GetJournalFile(), 'w').close()
+    with open(GetJournalFile(), 'r+') as f:
+        f.truncate(campaign.journal_offset)
+
+
+# return all lines of the campaign journal so far
+def ReadJournal():
+    FlushJournal()
+    if not os.path.exists(GetJournalFile()):
+        return []
+    with open(GetJournalFile(), 'r') as f:
+        return f.read().splitlines()
 
 
 # output the completed campaign journal to a text file
@@ -4709,11 +4902,14 @@ def RecordJournal():
         lines = crewman.GenerateReport()
         for line in lines:
             WriteJournal(line)
+    FlushJournal()
 
     filename = 'Armoured_Commander_Journal_' + datetime.now().strftime("%H_%M_%d-%m-%Y") + '.txt'
-    with open(filename, 'a') as f:
-        for line in campaign.campaign_journal:
-            f.write(line + '\n')
+    if os.path.exists(filename):
+        with open(filename, 'a') as f, open(GetJournalFile(), 'r') as journal:
+            shutil.copyfileobj(journal, f)
+    else:
+        shutil.copyfile(GetJournalFile(), filename)
 
 
 # returns the crew member in the given tank position
@@ -4740,21 +4936,10 @@ def TutorialMessage(key):
         if not campaign.tutorial_message: return
 
     try:
-        save = shelve.open('bones')
-        bones = save['bones']
-    
-        # check to see if bones file already has key
-        if key in bones.tutorial_message_flags:
-            # key is already set to true
-            if bones.tutorial_message_flags[key]:
-                save.close()
-                return
-    
-        # mark that this text has been displayed in the bones file
-        # will also add the key if bones file did not already have it
-        bones.tutorial_message_flags[key] = True
-        save['bones'] = bones
-        save.close
+        # mark that this text has been displayed in the bones file, skip if it
+        # already had been
+        if not bones.SetTutorialFlag(key):
+            return
     
         # display the text
         for w in range(3, MENU_CON_WIDTH, 6):
@@ -4798,6 +4983,36 @@ def TutorialMessage(key):
         print('ERROR: Could not open bones file')
 
 
+# return a console with the static part of a screen drawn on it, for a screen id and a
+#  state such as the selected entry; the screen is only drawn, by calling
+#  render_function with the new console, the first time it is needed. once there are
+#  SCREEN_CACHE_MAX screens the least recently used one is dropped
+def GetCachedScreen(screen_id, state, w, h, render_function):
+    key = (screen_id, state)
+    if key in SCREEN_CACHE:
+        # remove and re-add so that it becomes the most recently used
+        console = SCREEN_CACHE.pop(key)
+    else:
+        if len(SCREEN_CACHE) >= SCREEN_CACHE_MAX:
+            oldest = next(iter(SCREEN_CACHE))
+            libtcod.console_delete(SCREEN_CACHE.pop(oldest))
+        console = CreateConsole(w, h, libtcod.black, libtcod.white, libtcod.LEFT)
+        render_function(console)
+    SCREEN_CACHE[key] = console
+    return console
+
+
+# copy the static part of a menu screen from the screen cache onto the menu console,
+#  replacing whatever was there; dynamic fields can then be drawn on top
+def DrawCachedMenu(screen_id, state, render_function):
+    console = GetCachedScreen(screen_id, state, MENU_CON_WIDTH, MENU_CON_HEIGHT,
+        render_function)
+    libtcod.console_blit(console, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT, menu_con, 0, 0)
+    libtcod.console_set_default_background(menu_con, libtcod.black)
+    libtcod.console_set_default_foreground(menu_con, libtcod.white)
+    libtcod.console_set_alignment(menu_con, libtcod.LEFT)
+
+
 # display help interface
 def ShowHelp():
     # select the first help dictionary item that starts with this character
@@ -4822,28 +5037,24 @@ def ShowHelp():
     libtcod.console_blit(con, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, 0, 0, 0,
         0.0, 0.7)
 
-    exit_view = False
-    while not exit_view:
-
-        # generate and display menu
-        libtcod.console_clear(menu_con)
-        libtcod.console_set_alignment(menu_con, libtcod.LEFT)
-        libtcod.console_print_frame(menu_con, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT,
+    # draw the help menu with the selected entry
+    def DrawHelp(console):
+        libtcod.console_print_frame(console, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT,
             clear=False, flag=libtcod.BKGND_DEFAULT, fmt=0)
 
-        libtcod.console_set_default_foreground(menu_con, MENU_TITLE_COLOR)
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, 1,
+        libtcod.console_set_default_foreground(console, MENU_TITLE_COLOR)
+        libtcod.console_print_ex(console, MENU_CON_XM, 1,
             libtcod.BKGND_NONE, libtcod.CENTER, 'Help Topics')
-        libtcod.console_set_default_foreground(menu_con, libtcod.white)
+        libtcod.console_set_default_foreground(console, libtcod.white)
 
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, 2, libtcod.BKGND_NONE, libtcod.CENTER, 'Type a letter to jump to its entry, arrow keys to scroll')
+        libtcod.console_print_ex(console, MENU_CON_XM, 2, libtcod.BKGND_NONE, libtcod.CENTER, 'Type a letter to jump to its entry, arrow keys to scroll')
 
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, MENU_CON_HEIGHT-2,
+        libtcod.console_print_ex(console, MENU_CON_XM, MENU_CON_HEIGHT-2,
             libtcod.BKGND_NONE, libtcod.CENTER, '[%cESC%c] Return'%HIGHLIGHT)
 
-        libtcod.console_hline(menu_con, 1, 3, MENU_CON_WIDTH-2, flag=libtcod.BKGND_DEFAULT)
-        libtcod.console_hline(menu_con, 1, MENU_CON_HEIGHT-3, MENU_CON_WIDTH-2, flag=libtcod.BKGND_DEFAULT)
-        libtcod.console_vline(menu_con, x, 4, MENU_CON_HEIGHT-7, flag=libtcod.BKGND_DEFAULT)
+        libtcod.console_hline(console, 1, 3, MENU_CON_WIDTH-2, flag=libtcod.BKGND_DEFAULT)
+        libtcod.console_hline(console, 1, MENU_CON_HEIGHT-3, MENU_CON_WIDTH-2, flag=libtcod.BKGND_DEFAULT)
+        libtcod.console_vline(console, x, 4, MENU_CON_HEIGHT-7, flag=libtcod.BKGND_DEFAULT)
 
 
         # display list of help topics, with selected one at yc
@@ -4856,10 +5067,10 @@ def ShowHelp():
             if y < 6 or y > MENU_CON_HEIGHT-9:
                 continue
             if (topic, text) == selected:
-                libtcod.console_set_default_background(menu_con, SELECTED_COLOR)
-                libtcod.console_rect(menu_con, 2, y, x-4, 1, False, flag=libtcod.BKGND_SET)
-                libtcod.console_set_default_background(menu_con, libtcod.black)
-            libtcod.console_print(menu_con, 2, y, topic)
+                libtcod.console_set_default_background(console, SELECTED_COLOR)
+                libtcod.console_rect(console, 2, y, x-4, 1, False, flag=libtcod.BKGND_SET)
+                libtcod.console_set_default_background(console, libtcod.black)
+            libtcod.console_print(console, 2, y, topic)
 
         # display explanational text of selected item, double spaced
         (topic, text) = selected
@@ -4867,9 +5078,14 @@ def ShowHelp():
         lines = wrap(text, MENU_CON_WIDTH-50-x, subsequent_indent = ' ')
         y = yc - int(len(lines)/2)
         for line in lines:
-            libtcod.console_print(menu_con, x+4, y, line)
+            libtcod.console_print(console, x+4, y, line)
             y += 1
 
+    exit_view = False
+    while not exit_view:
+
+        # display menu, drawing it only the first time this entry is selected
+        DrawCachedMenu('help', selected[0], DrawHelp)
         libtcod.console_blit(menu_con, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT, 0, MENU_CON_X, MENU_CON_Y)
         libtcod.console_flush()
 
@@ -4934,31 +5150,24 @@ def ShowTankInfo(select_tank = False):
     libtcod.console_blit(con, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, 0, 0, 0,
         0.0, 0.7)
 
-    exit_menu = False
-    while not exit_menu:
-
-        # generate and display menu
-        libtcod.console_clear(menu_con)
-        libtcod.console_print_frame(menu_con, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT,
+    # draw the menu for one tank model
+    def DrawTankInfo(console):
+        libtcod.console_print_frame(console, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT,
             clear=False, flag=libtcod.BKGND_DEFAULT, fmt=0)
 
-        libtcod.console_set_default_foreground(menu_con, MENU_TITLE_COLOR)
+        libtcod.console_set_default_foreground(console, MENU_TITLE_COLOR)
 
         if select_tank:
             text = 'Select a Tank Model'
         else:
             text = 'Player Tank Info'
 
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, 2,
+        libtcod.console_print_ex(console, MENU_CON_XM, 2,
             libtcod.BKGND_NONE, libtcod.CENTER, text)
-        libtcod.console_set_default_foreground(menu_con, libtcod.white)
+        libtcod.console_set_default_foreground(console, libtcod.white)
 
         # display tank info
-        if select_tank:
-            show_tank = selected_tank
-        else:
-            show_tank = tank.unit_type
-        ShowVehicleTypeInfo(show_tank, menu_con, 34, 8)
+        ShowVehicleTypeInfo(show_tank, console, 34, 8)
 
         # display possible actions
         if select_tank:
@@ -4966,9 +5175,19 @@ def ShowTankInfo(select_tank = False):
             text += '[%cEnter%c] Select Tank'%HIGHLIGHT
         else:
             text = '[%cESC%c] Return'%HIGHLIGHT
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, MENU_CON_HEIGHT-2,
+        libtcod.console_print_ex(console, MENU_CON_XM, MENU_CON_HEIGHT-2,
             libtcod.BKGND_NONE, libtcod.CENTER, text)
 
+    exit_menu = False
+    while not exit_menu:
+
+        # generate and display menu
+        if select_tank:
+            show_tank = selected_tank
+        else:
+            show_tank = tank.unit_type
+        DrawCachedMenu('tank_info', (show_tank, select_tank), DrawTankInfo)
+
         libtcod.console_blit(menu_con, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT, 0, MENU_CON_X, MENU_CON_Y)
         libtcod.console_flush()
 
@@ -5354,19 +5573,29 @@ def ShowCampaignStats():
     libtcod.console_blit(con, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, 0, 0, 0,
         0.0, 0.7)
 
+    # draw the frame, title, and commands
+    def DrawStatsMenu(console):
+        libtcod.console_print_frame(console, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT,
+            clear=False, flag=libtcod.BKGND_DEFAULT, fmt=0)
+
+        libtcod.console_set_default_foreground(console, MENU_TITLE_COLOR)
+        libtcod.console_print_ex(console, MENU_CON_XM, 2,
+            libtcod.BKGND_NONE, libtcod.CENTER, 'Campaign Stats')
+        libtcod.console_set_default_foreground(console, libtcod.white)
+
+        libtcod.console_print_ex(console, MENU_CON_XM, MENU_CON_HEIGHT-4,
+            libtcod.BKGND_NONE, libtcod.CENTER,
+            'Display Campaign [%cJ%c]ournal'%HIGHLIGHT)
+
+        libtcod.console_print_ex(console, MENU_CON_XM, MENU_CON_HEIGHT-2,
+            libtcod.BKGND_NONE, libtcod.CENTER,
+            '[%cESC%c] Return'%HIGHLIGHT)
+
     exit_menu = False
     while not exit_menu:
 
         # generate and display menu
-        libtcod.console_clear(menu_con)
-        libtcod.console_set_alignment(menu_con, libtcod.LEFT)
-        libtcod.console_print_frame(menu_con, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT,
-            clear=False, flag=libtcod.BKGND_DEFAULT, fmt=0)
-
-        libtcod.console_set_default_foreground(menu_con, MENU_TITLE_COLOR)
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, 2,
-            libtcod.BKGND_NONE, libtcod.CENTER, 'Campaign Stats')
-        libtcod.console_set_default_foreground(menu_con, libtcod.white)
+        DrawCachedMenu('campaign_stats', None, DrawStatsMenu)
 
         # display current day of campaign calendar
         libtcod.console_set_default_background(menu_con, ROW_COLOR)
@@ -5399,14 +5628,6 @@ def ShowCampaignStats():
             libtcod.console_print(menu_con, 53, y, text)
             y += 1
 
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, MENU_CON_HEIGHT-4,
-            libtcod.BKGND_NONE, libtcod.CENTER,
-            'Display Campaign [%cJ%c]ournal'%HIGHLIGHT)
-
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, MENU_CON_HEIGHT-2,
-            libtcod.BKGND_NONE, libtcod.CENTER,
-            '[%cESC%c] Return'%HIGHLIGHT)
-
         libtcod.console_blit(menu_con, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT, 0, MENU_CON_X, MENU_CON_Y)
         libtcod.console_flush()
 
@@ -5423,7 +5644,7 @@ def ShowCampaignStats():
             key_char = chr(key.c)
 
             if key_char in ['j', 'J']:
-                ShowTextWindow('Campaign Journal', campaign.campaign_journal)
+                ShowTextWindow('Campaign Journal', ReadJournal())
 
             # exit right away
             if libtcod.console_is_window_closed():
@@ -5439,60 +5660,191 @@ def ShowCampaignStats():
         RenderEncounter()
 
 
-# display a window of text lines, allow player to scroll up and down
-def ShowTextWindow(title, text_lines):
+# Text View Class
+# a scrolling window onto a list of text lines; lines are only wrapped once they are
+#  displayed or scrolled past, and the wrapped lines are cached by text id and width so
+#  that they can be reused the next time the same text is displayed
+# window positions are (text line, wrapped line within that text line)
+class TextView:
+    def __init__(self, text_id, text_lines, width, height):
+        self.text_lines = text_lines
+        self.width = width
+        self.height = height
+        self.match = None            # text line of last search match, if any
+
+        # wrapped lines by text line number: (original text, wrapped lines)
+        cache_key = (text_id, width)
+        if cache_key in TEXT_WRAP_CACHE:
+            self.wrapped = TEXT_WRAP_CACHE.pop(cache_key)
+        else:
+            self.wrapped = {}
+            if len(TEXT_WRAP_CACHE) >= TEXT_WRAP_CACHE_MAX:
+                del TEXT_WRAP_CACHE[next(iter(TEXT_WRAP_CACHE))]
+        TEXT_WRAP_CACHE[cache_key] = self.wrapped
+
+        # starting scroll position: bottom of text
+        self.top = (0, 0)
+        self.ScrollToBottom()
+
+    # return the wrapped lines for a text line, wrapping it if it hasn't been already or
+    #  if the line has changed since it was last wrapped
+    def GetWrapped(self, n):
+        line = self.text_lines[n]
+        if n in self.wrapped:
+            (old_line, lines) = self.wrapped[n]
+            if old_line == line:
+                return lines
+        if len(line) <= self.width:
+            lines = [line]
+        else:
+            lines = wrap(line, self.width, subsequent_indent = ' ')
+            if len(lines) == 0:
+                lines = ['']
+        self.wrapped[n] = (line, lines)
+        return lines
+
+    # return a window position moved forward or back by a number of wrapped lines,
+    #  stopping at the start or end of the text
+    def Step(self, position, lines):
+        (n, sub) = position
+        while lines > 0:
+            if sub + 1 < len(self.GetWrapped(n)):
+                sub += 1
+            elif n + 1 < len(self.text_lines):
+                n += 1
+                sub = 0
+            else:
+                break
+            lines -= 1
+        while lines < 0:
+            if sub > 0:
+                sub -= 1
+            elif n > 0:
+                n -= 1
+                sub = len(self.GetWrapped(n)) - 1
+            else:
+                break
+            lines += 1
+        return (n, sub)
+
+    # return the furthest the window can be scrolled down: the position at which the
+    #  last line of text is at the bottom of the window
+    def GetBottom(self):
+        if len(self.text_lines) == 0:
+            return (0, 0)
+        n = len(self.text_lines) - 1
+        return self.Step((n, len(self.GetWrapped(n)) - 1), 0 - (self.height - 1))
+
+    # scroll the window by a number of lines; returns True if it moved
+    def Scroll(self, lines):
+        old_top = self.top
+        if len(self.text_lines) > 0:
+            self.top = min(self.Step(self.top, lines), self.GetBottom())
+        return self.top != old_top
+
+    def ScrollToTop(self):
+        old_top = self.top
+        self.top = (0, 0)
+        return self.top != old_top
+
+    def ScrollToBottom(self):
+        old_top = self.top
+        self.top = self.GetBottom()
+        return self.top != old_top
+
+    # return the lines in the window, as a list of (text line number, wrapped line)
+    def GetVisibleLines(self):
+        visible = []
+        (n, sub) = self.top
+        while len(visible) < self.height and n < len(self.text_lines):
+            for line in self.GetWrapped(n)[sub:]:
+                visible.append((n, line))
+            n += 1
+            sub = 0
+        return visible[:self.height]
+
+    # find the next text line containing the search text, starting from the top of the
+    #  window or from after the last match, and wrapping around to the start; scrolls
+    #  the window to the match and returns True if one was found
+    def Search(self, search_text, next_match=False):
+        if search_text == '' or len(self.text_lines) == 0:
+            return False
+        search_text = search_text.lower()
+        start = self.top[0]
+        if next_match and self.match is not None:
+            start = self.match + 1
+        for i in range(len(self.text_lines)):
+            n = (start + i) % len(self.text_lines)
+            if search_text in self.text_lines[n].lower():
+                self.match = n
+                self.top = (n, 0)
+                self.Scroll(0)
+                return True
+        self.match = None
+        return False
+
+
+# display a window of text lines, allow player to scroll up and down and search the text
+# text_id identifies the text for caching its wrapped lines; defaults to the title
+def ShowTextWindow(title, text_lines, text_id=None):
 
     # copy existing screen to con
     libtcod.console_blit(0, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, con, 0, 0)
 
-    # generate list of lines to display
-    lines = []
-    for line in text_lines:
-        if len(line) <= 84:
-            lines.append(line)
-            continue
-        # split original line
-        split_lines = wrap(line, 84, subsequent_indent = ' ')
-        lines.extend(split_lines)
+    if text_id is None:
+        text_id = title
+    view = TextView(text_id, text_lines, TEXT_VIEW_WIDTH, TEXT_VIEW_LINES)
 
-    # starting y scroll position: bottom of list
-    y2 = len(lines) - 1
+    # display window frame, title, and commands; these don't change while scrolling
+    libtcod.console_clear(text_con)
+    libtcod.console_print_frame(text_con, 0, 0, TEXT_CON_WIDTH, TEXT_CON_HEIGHT,
+        clear=False, flag=libtcod.BKGND_DEFAULT, fmt=0)
 
-    exit_menu = False
-    while not exit_menu:
+    libtcod.console_set_default_foreground(text_con, MENU_TITLE_COLOR)
+    libtcod.console_print_ex(text_con, TEXT_CON_XM, 1,
+        libtcod.BKGND_NONE, libtcod.CENTER,
+        title)
+    libtcod.console_set_default_foreground(text_con, libtcod.white)
 
-        # generate and display window
-        libtcod.console_clear(text_con)
-        libtcod.console_print_frame(text_con, 0, 0, TEXT_CON_WIDTH, TEXT_CON_HEIGHT,
-            clear=False, flag=libtcod.BKGND_DEFAULT, fmt=0)
+    libtcod.console_print_ex(text_con, TEXT_CON_XM, TEXT_CON_HEIGHT-3,
+        libtcod.BKGND_NONE, libtcod.CENTER,
+        '[%cUp/Down/PgUp/PgDn/Home/End%c] Scroll  '%HIGHLIGHT +
+        '[%cF%c]ind  [%cN%c]ext Match'%(HIGHLIGHT + HIGHLIGHT))
+    libtcod.console_print_ex(text_con, TEXT_CON_XM, TEXT_CON_HEIGHT-2,
+        libtcod.BKGND_NONE, libtcod.CENTER,
+        '[%cESC%c] Return'%HIGHLIGHT)
 
-        # window title
-        libtcod.console_set_default_foreground(text_con, MENU_TITLE_COLOR)
-        libtcod.console_print_ex(text_con, TEXT_CON_XM, 1,
-            libtcod.BKGND_NONE, libtcod.CENTER,
-            title)
-        libtcod.console_set_default_foreground(text_con, libtcod.white)
+    search_text = ''
+    searching = False            # player is typing in search text
+    status = ''                # result of last search
 
-        # commands
-        libtcod.console_print_ex(text_con, TEXT_CON_XM, TEXT_CON_HEIGHT-3,
-            libtcod.BKGND_NONE, libtcod.CENTER,
-            '[%cUp/Down/PgUp/PgDn/Home/End%c] Scroll'%HIGHLIGHT)
-        libtcod.console_print_ex(text_con, TEXT_CON_XM, TEXT_CON_HEIGHT-2,
-            libtcod.BKGND_NONE, libtcod.CENTER,
-            '[%cESC%c] Return'%HIGHLIGHT)
+    exit_menu = False
+    while not exit_menu:
 
-        # text content
-        if len(lines) <= 48:
-            y1 = 0
-        else:
-            y1 = y2 - 48
+        # clear and redraw the text area and status line only
+        libtcod.console_rect(text_con, 1, 3, TEXT_CON_WIDTH-2, TEXT_VIEW_LINES+2, True,
+            flag=libtcod.BKGND_SET)
 
         y = 3
-        for n in range(y1, y2+1):
-            if n > len(lines) - 1: break
-            libtcod.console_print(text_con, 2, y, lines[n])
+        for (n, line) in view.GetVisibleLines():
+            if n == view.match:
+                libtcod.console_set_default_background(text_con, ROW_COLOR)
+                libtcod.console_rect(text_con, 1, y, TEXT_CON_WIDTH-2, 1, False,
+                    flag=libtcod.BKGND_SET)
+                libtcod.console_set_default_background(text_con, libtcod.black)
+            libtcod.console_print(text_con, 2, y, line)
             y += 1
 
+        y = TEXT_CON_HEIGHT-5
+        if searching:
+            libtcod.console_print(text_con, 2, y, 'Find: ' + search_text + '_')
+        else:
+            libtcod.console_print(text_con, 2, y, status)
+        if len(text_lines) > 0:
+            text = 'Line ' + str(view.top[0] + 1) + ' of ' + str(len(text_lines))
+            libtcod.console_print_ex(text_con, TEXT_CON_WIDTH-3, y,
+                libtcod.BKGND_NONE, libtcod.RIGHT, text)
+
         libtcod.console_blit(text_con, 0, 0, TEXT_CON_WIDTH, TEXT_CON_HEIGHT, 0, TEXT_CON_X, TEXT_CON_Y)
         libtcod.console_flush()
 
@@ -5500,45 +5852,73 @@ def ShowTextWindow(title, text_lines):
         while not refresh:
             # get input from user
             libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS|libtcod.EVENT_MOUSE, key, mouse)
+            UpdateSteam()
+            UpdateScreenshots()
+
+            # exit right away
+            if libtcod.console_is_window_closed():
+                sys.exit()
+
+            # typing in search text
+            if searching:
+                if key.vk == libtcod.KEY_ESCAPE:
+                    searching = False
+                    refresh = True
+                elif key.vk == libtcod.KEY_ENTER:
+                    searching = False
+                    if view.Search(search_text):
+                        status = 'Found "' + search_text + '"'
+                    else:
+                        status = '"' + search_text + '" not found'
+                    refresh = True
+                elif key.vk == libtcod.KEY_BACKSPACE:
+                    if len(search_text) > 0:
+                        search_text = search_text[:-1]
+                        refresh = True
+                elif 32 <= key.c <= 126:
+                    if len(search_text) < 40:
+                        search_text += chr(key.c)
+                        refresh = True
+                libtcod.console_flush()
+                continue
 
             if key.vk == libtcod.KEY_ESCAPE:
                 exit_menu = True
                 break
 
             elif key.vk == libtcod.KEY_UP:
-                if y2 > 48:
-                    y2 -= 1
-                    refresh = True
+                refresh = view.Scroll(-1)
 
             elif key.vk == libtcod.KEY_DOWN:
-                if y2 < len(lines) - 1:
-                    y2 += 1
-                    refresh = True
+                refresh = view.Scroll(1)
 
             elif key.vk == libtcod.KEY_HOME:
-                y2 = 48
-                refresh = True
+                refresh = view.ScrollToTop()
 
             elif key.vk == libtcod.KEY_END:
-                y2 = len(lines) - 1
-                refresh = True
+                refresh = view.ScrollToBottom()
 
             elif key.vk == libtcod.KEY_PAGEUP:
-                y2 -= 10
-                if y2 < 48: y2 = 48
-                refresh = True
+                refresh = view.Scroll(-10)
 
             elif key.vk == libtcod.KEY_PAGEDOWN:
-                y2 += 10
-                if y2 > len(lines) - 1: y2 = len(lines) - 1
-                refresh = True
-
-            # exit right away
-            if libtcod.console_is_window_closed():
-                sys.exit()
+                refresh = view.Scroll(10)
 
             key_char = chr(key.c)
 
+            if key_char in ['f', 'F']:
+                searching = True
+                search_text = ''
+                refresh = True
+
+            elif key_char in ['n', 'N']:
+                if search_text != '':
+                    if view.Search(search_text, next_match=True):
+                        status = 'Found "' + search_text + '"'
+                    else:
+                        status = '"' + search_text + '" not found'
+                    refresh = True
+
             libtcod.console_flush()
 
     # copy con back to screen
@@ -5555,30 +5935,52 @@ def ShowSettings():
     libtcod.console_blit(con, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, 0, 0, 0,
         0.0, 0.7)
 
-    exit_menu = False
-    while not exit_menu:
-
-        # generate and display menu
-        libtcod.console_clear(menu_con)
-        libtcod.console_set_alignment(menu_con, libtcod.LEFT)
-        libtcod.console_print_frame(menu_con, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT,
+    # draw the frames, titles, and notes; only the settings themselves change
+    def DrawSettingsMenu(console):
+        libtcod.console_print_frame(console, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT,
             clear=False, flag=libtcod.BKGND_DEFAULT, fmt=0)
 
-        libtcod.console_set_default_foreground(menu_con, MENU_TITLE_COLOR)
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, 2,
+        libtcod.console_set_default_foreground(console, MENU_TITLE_COLOR)
+        libtcod.console_print_ex(console, MENU_CON_XM, 2,
             libtcod.BKGND_NONE, libtcod.CENTER, 'Game Settings Menu')
-        libtcod.console_set_default_foreground(menu_con, libtcod.white)
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, 3,
+        libtcod.console_set_default_foreground(console, libtcod.white)
+        libtcod.console_print_ex(console, MENU_CON_XM, 3,
             libtcod.BKGND_NONE, libtcod.CENTER, VERSION + SUBVERSION)
-        #libtcod.console_print_ex(menu_con, MENU_CON_XM, 4,
+        #libtcod.console_print_ex(console, MENU_CON_XM, 4,
         #        libtcod.BKGND_NONE, libtcod.CENTER, "test")
 
         # Campaign Settings
-        libtcod.console_print_frame(menu_con, 50, 5, 40, 6, clear=False,
+        libtcod.console_print_frame(console, 50, 5, 40, 6, clear=False,
             flag=libtcod.BKGND_DEFAULT, fmt=0)
-        libtcod.console_set_default_foreground(menu_con, MENU_TITLE_COLOR)
-        libtcod.console_print(menu_con, 52, 6, 'Campaign Settings')
-        libtcod.console_set_default_foreground(menu_con, libtcod.white)
+        libtcod.console_set_default_foreground(console, MENU_TITLE_COLOR)
+        libtcod.console_print(console, 52, 6, 'Campaign Settings')
+        libtcod.console_set_default_foreground(console, libtcod.white)
+
+        # Display Settings
+        libtcod.console_print_frame(console, 50, 12, 58, 13, clear=False,
+            flag=libtcod.BKGND_DEFAULT, fmt=0)
+        libtcod.console_set_default_foreground(console, MENU_TITLE_COLOR)
+        libtcod.console_print(console, 52, 13, 'Display Settings')
+        libtcod.console_set_default_foreground(console, libtcod.white)
+
+        if libtcod.sys_get_renderer() in [3, 4]:
+            libtcod.console_set_default_foreground(console, libtcod.lighter_blue)
+            libtcod.console_print(console, 53, 22, 'Changing either of these two settings may')
+            libtcod.console_print(console, 53, 23, 'pause your computer for a few seconds')
+            libtcod.console_set_default_foreground(console, libtcod.white)
+
+        libtcod.console_print_ex(console, MENU_CON_XM, MENU_CON_HEIGHT-3,
+            libtcod.BKGND_NONE, libtcod.CENTER, 'Press highlighted letter to change setting')
+
+        libtcod.console_print_ex(console, MENU_CON_XM, MENU_CON_HEIGHT-2,
+            libtcod.BKGND_NONE, libtcod.CENTER,
+            '[%cESC%c] Return'%HIGHLIGHT)
+
+    exit_menu = False
+    while not exit_menu:
+
+        # generate and display menu
+        DrawCachedMenu('settings', None, DrawSettingsMenu)
 
         text = 'Tank Selection: '
         if campaign.unlimited_tank_selection:
@@ -5594,13 +5996,6 @@ def ShowSettings():
             text += 'Realistic'
         libtcod.console_print(menu_con, 52, 9, text)
 
-        # Display Settings
-        libtcod.console_print_frame(menu_con, 50, 12, 58, 13, clear=False,
-            flag=libtcod.BKGND_DEFAULT, fmt=0)
-        libtcod.console_set_default_foreground(menu_con, MENU_TITLE_COLOR)
-        libtcod.console_print(menu_con, 52, 13, 'Display Settings')
-        libtcod.console_set_default_foreground(menu_con, libtcod.white)
-
         text = '[%cA%c]nimations: '%HIGHLIGHT
         if campaign.animations:
             text += 'On'
@@ -5629,6 +6024,13 @@ def ShowSettings():
             text += 'Off'
         libtcod.console_print(menu_con, 52, 18, text)
 
+        text = 'Show Attack [%cO%c]dds: '%HIGHLIGHT
+        if campaign.show_odds:
+            text += 'On'
+        else:
+            text += 'Off'
+        libtcod.console_print(menu_con, 52, 19, text)
+
         # NEW: only display option if allowed by renderer
         if libtcod.sys_get_renderer() in [3, 4]:
             text = '[%cF%c]ull Screen: '%HIGHLIGHT
@@ -5643,18 +6045,6 @@ def ShowSettings():
             text += str(campaign.fs_res_x) + ' x ' + str(campaign.fs_res_y)
             libtcod.console_print(menu_con, 52, 21, text)
 
-            libtcod.console_set_default_foreground(menu_con, libtcod.lighter_blue)
-            libtcod.console_print(menu_con, 53, 22, 'Changing either of these two settings may')
-            libtcod.console_print(menu_con, 53, 23, 'pause your computer for a few seconds')
-            libtcod.console_set_default_foreground(menu_con, libtcod.white)
-
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, MENU_CON_HEIGHT-3,
-            libtcod.BKGND_NONE, libtcod.CENTER, 'Press highlighted letter to change setting')
-
-        libtcod.console_print_ex(menu_con, MENU_CON_XM, MENU_CON_HEIGHT-2,
-            libtcod.BKGND_NONE, libtcod.CENTER,
-            '[%cESC%c] Return'%HIGHLIGHT)
-
         libtcod.console_blit(menu_con, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT, 0, MENU_CON_X, MENU_CON_Y)
         libtcod.console_flush()
 
@@ -5689,6 +6079,10 @@ def ShowSettings():
                 campaign.tutorial_message = not campaign.tutorial_message
                 refresh = True
 
+            elif key_char in ['o', 'O']:
+                campaign.show_odds = not campaign.show_odds
+                refresh = True
+
             if libtcod.sys_get_renderer() not in [3, 4]: continue
 
             if key_char in ['f', 'F']:
@@ -5729,8 +6123,32 @@ def ShowSettings():
 # being displayed
 # x, y is highlighted object or location; label appears centered under this
 # if crewman is not none, label is being spoken by that crewman
+# if labels are being queued during an encounter phase, label is added to the queue
+# instead and shown later by ShowQueuedLabels()
 def ShowLabel(x, y, original_text, crewman=None):
 
+    if battle is not None and battle.label_queue is not None:
+        battle.label_queue.append((x, y, original_text, crewman))
+        AddMessage(original_text, libtcod.light_grey)
+        return
+
+    DrawLabel(x, y, original_text, crewman=crewman, reveal=campaign.animations)
+
+    if campaign.pause_labels:
+        WaitForEnter()
+    else:
+        Wait(1100)
+    libtcod.console_set_default_background(0, libtcod.black)
+
+    # if in an encounter, add the label to the message queue, and re-render the screen
+    if battle is not None:
+        AddMessage(original_text, libtcod.light_grey)
+        RenderEncounter()
+
+
+# draw a label to the root console, either all at once or revealed two characters at a time
+def DrawLabel(x, y, original_text, crewman=None, reveal=False, prompt=None):
+
     libtcod.console_set_default_background(0, GREYED_COLOR)
 
     # build text string
@@ -5742,7 +6160,9 @@ def ShowLabel(x, y, original_text, crewman=None):
     text += original_text
 
     # if wait for enter is on in campaign settings, add to text to display
-    if campaign.pause_labels:
+    if prompt is not None:
+        text += prompt
+    elif campaign.pause_labels:
         text += ' [Enter to continue]'
 
     # divide text to be shown into lines
@@ -5764,8 +6184,8 @@ def ShowLabel(x, y, original_text, crewman=None):
             if x - int((len(line)+1)/2) <= C_MAP_CON_X:
                 x = C_MAP_CON_X + int((len(line)+1)/2)
 
-        # if animations are off, display labels all at once
-        if not campaign.animations:
+        # display label all at once
+        if not reveal:
             libtcod.console_print_ex(0, x, y+n, libtcod.BKGND_SET, libtcod.CENTER, line)
             libtcod.console_flush()
 
@@ -5783,25 +6203,127 @@ def ShowLabel(x, y, original_text, crewman=None):
                     Wait(1)
         n += 1
 
-    if campaign.pause_labels:
-        WaitForEnter()
+
+# start queueing encounter labels instead of showing each one as it happens, so that a
+# whole phase can be resolved without stopping for each label
+def QueueLabels():
+    battle.label_queue = []
+
+
+# show any labels queued so far; labels are shown all at once and the player can skim
+# to the next one with Enter or Space, or skip the rest with Escape. labels have already
+# been added to the message console. if stop_queue is True, labels are shown as they
+# happen again afterwards
+def ShowQueuedLabels(stop_queue=False):
+
+    if battle.label_queue is None: return
+
+    queue = battle.label_queue
+    if stop_queue:
+        battle.label_queue = None
     else:
-        Wait(1100)
-    libtcod.console_set_default_background(0, libtcod.black)
+        battle.label_queue = []
 
-    # if in an encounter, add the label to the message queue, and re-render the screen
-    if battle is not None:
-        Message(original_text, color=libtcod.light_grey)
-        RenderEncounter()
+    skip_all = False
+    for (x, y, text, crewman) in queue:
+        if skip_all: break
+
+        RenderEncounter(no_flush=True)
+        DrawLabel(x, y, text, crewman=crewman, prompt=' [Enter/Esc]')
+
+        # wait until time is up or player moves to next label
+        end_time = time.time() + 1.1
+        end_pause = False
+        while not end_pause:
+            libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS|libtcod.EVENT_MOUSE, key, mouse)
+
+            # exit right away
+            if libtcod.console_is_window_closed():
+                sys.exit()
+
+            if key.vk in [libtcod.KEY_ENTER, libtcod.KEY_SPACE]:
+                end_pause = True
+            elif key.vk == libtcod.KEY_ESCAPE:
+                skip_all = True
+                end_pause = True
+            elif not campaign.pause_labels and time.time() >= end_time:
+                end_pause = True
+
+            libtcod.console_flush()
+
+    libtcod.console_set_default_background(0, libtcod.black)
+    RenderEncounter()
 
 
 # wait for a specified amount of miliseconds, refreshing the screen in the meantime
 def Wait(wait_time):
     # added this to avoid the spinning wheel of death in Windows
     libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS|libtcod.EVENT_MOUSE, key, mouse)
+    UpdateSteam()
+    UpdateScreenshots()
     libtcod.sys_sleep_milli(wait_time)
 
 
+# start up steamworks on a background thread, so that a missing or slow Steam client
+#  never holds up the game
+def StartSteamworks():
+    global steam_thread, steam_start_time
+    steam_start_time = time.time()
+    steam_thread = threading.Thread(target=InitSteamworks)
+    steam_thread.daemon = True
+    steam_thread.start()
+
+
+# run on the background thread: try to start up steamworks; if it fails, it may just
+#  mean that Steam is offline, so do nothing
+def InitSteamworks():
+    global steam_result
+    try:
+        from steamworks import STEAMWORKS       # main steamworks library
+        new_steamworks = STEAMWORKS()
+        new_steamworks.initialize()
+    except:
+        return
+    with steam_lock:
+        # game already gave up waiting
+        if steam_cancelled:
+            try:
+                new_steamworks.unload()
+            except:
+                pass
+            return
+        steam_result = new_steamworks
+
+
+# check on steamworks start up and run any steamworks callbacks
+# called from the main input loops, but only does anything once per
+#  STEAM_CALLBACK_INTERVAL
+def UpdateSteam():
+    global steamworks, steam_thread, steam_cancelled, steam_callback_time
+
+    now = time.time()
+    if now - steam_callback_time < STEAM_CALLBACK_INTERVAL: return
+    steam_callback_time = now
+
+    # still starting up
+    if steam_thread is not None:
+        with steam_lock:
+            if steam_result is None:
+                if steam_thread.is_alive():
+                    if now - steam_start_time < STEAM_INIT_TIMEOUT: return
+                    steam_cancelled = True
+                steam_thread = None
+                return
+        steam_thread = None
+        steamworks = steam_result
+
+    if steamworks is None: return
+    try:
+        steamworks.run_callbacks()
+    except:
+        steamworks = None
+
+
 # returns true if number is odd
 def IsOdd(num):
     return num & 1 and True or False
@@ -5928,27 +6450,52 @@ def AllEnemiesDead():
     return True
 
 
-# add a new message to the encounter or campaign message queue and delete oldest one
-# if required
+# add a new message to the encounter message log and update the screen, unless messages
+# are being batched
 def Message(new_msg, color=libtcod.white):
 
     # don't show if not in an encounter
     if battle is None: return
 
+    AddMessage(new_msg, color)
+
+    # update the message console
+    if battle.msg_batch == 0:
+        RenderEncounter()
+
+
+# add a new message to the encounter message log without updating the screen; oldest lines
+# drop out of the message console automatically
+def AddMessage(new_msg, color):
+
     # split the message if necessary, among multiple lines
-    new_msg_lines = wrap(new_msg, MSG_CON_WIDTH-4, subsequent_indent = ' ')
+    if new_msg in MSG_WRAP_CACHE:
+        new_msg_lines = MSG_WRAP_CACHE[new_msg]
+    else:
+        if len(MSG_WRAP_CACHE) >= MSG_WRAP_CACHE_MAX:
+            MSG_WRAP_CACHE.clear()
+        new_msg_lines = wrap(new_msg, MSG_CON_WIDTH-4, subsequent_indent = ' ')
+        MSG_WRAP_CACHE[new_msg] = new_msg_lines
 
     for line in new_msg_lines:
-        #if the buffer is full, remove the first line to make room for the new one
-        if len(battle.messages) == MSG_CON_HEIGHT:
-            del battle.messages[0]
-
-        #add the new line as a tuple, with the text and the color
         battle.messages.append( (line, color) )
+        battle.msg_history.append( (line, color) )
 
-    # update the message console
-    UpdateMsgCon()
-    RenderEncounter()
+    battle.msg_dirty = True
+
+
+# start batching messages: the message console will not be redrawn for each new message
+# until EndMessageBatch() is called; batches can be nested
+def StartMessageBatch():
+    battle.msg_batch += 1
+
+
+# end a message batch, redrawing the screen once if any messages were added
+def EndMessageBatch():
+    if battle.msg_batch > 0:
+        battle.msg_batch -= 1
+    if battle.msg_batch == 0 and battle.msg_dirty:
+        RenderEncounter()
 
 
 # roll on the activation table and spawn enemy units on the battle map
@@ -6208,7 +6755,9 @@ def SpawnEnemy(unit_class=None, map_hex=None):
     # determine initial unit terrain and movement status
     new_unit.SetTerrain()
 
+    new_unit.spawn_num = len(battle.enemy_units)
     battle.enemy_units.append(new_unit)
+    battle.IndexUnit(new_unit)
 
     # report message
     text = new_unit.GetDesc(new_spawn=True) + ' reported at '
@@ -6385,8 +6934,17 @@ def GetHitLocation(hull_down):
             return 'Track'
 
 
+# do a crew skill check for an attack roll; if only previewing the odds of an attack, no
+#  dice are rolled and the skill is not counted
+def AttackSkillCheck(crew_member, skill_name, preview):
+    if preview: return False
+    return crew_member.SkillCheck(skill_name)
+
+
 # calculate base to-hit number, drm, and final roll required for an ordinance to-hit attack
-def CalcTH(attacker, target, area_fire, ammo_type):
+# if preview is True, nothing is changed and crew skills are not checked, so that the
+#  odds of an attack can be shown before it is made
+def CalcTH(attacker, target, area_fire, ammo_type, preview=False):
 
     # determine range of attack
     # different calculation depending on whether player is attacker or target
@@ -6467,7 +7025,7 @@ def CalcTH(attacker, target, area_fire, ammo_type):
 
         # tank moving, firing with gyrostabilizer
         if tank.moving:
-            if not GetCrewByPosition('Gunner').SkillCheck('Gyrostabilizer'):
+            if not AttackSkillCheck(GetCrewByPosition('Gunner'), 'Gyrostabilizer', preview):
                 drm.append(('Firing on the move - Gyrostabilizer skill failed', 4))
             else:
                 drm.append(('Firing on the move', 2))
@@ -6478,7 +7036,7 @@ def CalcTH(attacker, target, area_fire, ammo_type):
         elif target.acquired == 2:
             drm.append(('Target acquired 2', -2))
         # increase acquired target number for next shot
-        if target.acquired < 2:
+        if not preview and target.acquired < 2:
             target.acquired += 1
 
     # some different modifiers used for enemy units
@@ -6503,7 +7061,7 @@ def CalcTH(attacker, target, area_fire, ammo_type):
                 drm.append(('Target acquired 2', -2))
 
         # increase acquired target level for next shot
-        if attacker.acquired_player < 2:
+        if not preview and attacker.acquired_player < 2:
             attacker.acquired_player += 1
 
         # AT Guns rotating to fire
@@ -6522,7 +7080,7 @@ def CalcTH(attacker, target, area_fire, ammo_type):
     # vehicle target is moving
     if target.unit_class not in ['LW', 'MG', 'AT_GUN']:
         if target.moving:
-            if not GetCrewByPosition('Gunner').SkillCheck('Target Tracking'):
+            if not AttackSkillCheck(GetCrewByPosition('Gunner'), 'Target Tracking', preview):
                 drm.append(('Vehicle target is moving', 2))
 
     # vehicle target size
@@ -6566,13 +7124,13 @@ def CalcTH(attacker, target, area_fire, ammo_type):
         crew_member = GetCrewByPosition('Commander')
         if crew_member.order == 'Direct Main Gun Fire':
             if crew_member.hatch == 'Open':
-                if crew_member.SkillCheck('Fire Direction'):
+                if AttackSkillCheck(crew_member, 'Fire Direction', preview):
                     mod = -3
                 else:
                     mod = -2
                 drm.append(('Commander Directing Fire', mod))
             elif 'vision_cupola' in tank.stats:
-                if crew_member.SkillCheck('Fire Direction'):
+                if AttackSkillCheck(crew_member, 'Fire Direction', preview):
                     mod = -2
                 else:
                     mod = -1
@@ -6765,7 +7323,8 @@ def CalcTK(attacker, target, target_facing, ammo_type, critical, area_fire, hit_
 
 
 # calculate base to-kill number, drm, and final tk number for a player attack on the IFT
-def CalcIFT(attacker, target, attack_weapon, critical, area_fire, fp=0, rng=0):
+# if preview is True, crew skills are not checked
+def CalcIFT(attacker, target, attack_weapon, critical, area_fire, fp=0, rng=0, preview=False):
 
     # determine base roll to get a kill result
     if attack_weapon == 'MG':
@@ -6869,7 +7428,7 @@ def CalcIFT(attacker, target, attack_weapon, critical, area_fire, fp=0, rng=0):
         # commander directing MG fire
         crew_member = GetCrewByPosition('Commander')
         if (rng == 12 and crew_member.order == 'Direct Co-ax MG Fire') or (rng == 8 and crew_member.order == 'Direct Bow MG Fire'):
-            if crew_member.SkillCheck('Fire Direction'):
+            if AttackSkillCheck(crew_member, 'Fire Direction', preview):
                 mod = -2
             else:
                 mod = -1
@@ -6879,7 +7438,7 @@ def CalcIFT(attacker, target, attack_weapon, critical, area_fire, fp=0, rng=0):
         if rng == 8:
             crew_member = GetCrewByPosition('Asst. Driver')
             if crew_member.order == 'Fire Bow MG':
-                if crew_member.SkillCheck('Apprentice Gunner'):
+                if AttackSkillCheck(crew_member, 'Apprentice Gunner', preview):
                     drm.append(('Asst. Driver Skill', -1))
 
         # LoS hinderance (smoke)
@@ -7028,33 +7587,36 @@ def UnitInfo(mx, my):
             libtcod.console_blit(con, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, 0, 0, 0,
                 0.0, 0.7)
 
-            # generate display
-            libtcod.console_clear(menu_con)
-            libtcod.console_print_frame(menu_con, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT,
-                clear=False, flag=libtcod.BKGND_DEFAULT, fmt=0)
-            libtcod.console_set_alignment(menu_con, libtcod.LEFT)
+            # draw the info for this type of unit
+            def DrawUnitInfo(console):
+                libtcod.console_print_frame(console, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT,
+                    clear=False, flag=libtcod.BKGND_DEFAULT, fmt=0)
 
-            libtcod.console_set_default_foreground(menu_con, MENU_TITLE_COLOR)
-            libtcod.console_print_ex(menu_con, MENU_CON_XM, 2,
-                libtcod.BKGND_NONE, libtcod.CENTER, 'Unit Info')
-            libtcod.console_set_default_foreground(menu_con, libtcod.white)
+                libtcod.console_set_default_foreground(console, MENU_TITLE_COLOR)
+                libtcod.console_print_ex(console, MENU_CON_XM, 2,
+                    libtcod.BKGND_NONE, libtcod.CENTER, 'Unit Info')
+                libtcod.console_set_default_foreground(console, libtcod.white)
+
+                # grab description from UNIT_INFO if not vehicle
+                if unit.unit_class in ['LW', 'MG', 'AT_GUN']:
+                    text = UNIT_INFO[unit.unit_type]
+                    lines = wrap(text, 56, subsequent_indent = ' ')
+                    y = 6
+                    for line in lines:
+                        libtcod.console_print(console, MENU_CON_XM-28, y, line)
+                        y += 1
+                else:
+                    # show vehicle info
+                    ShowVehicleTypeInfo(unit.unit_type, console, 58, 7)
+
+                libtcod.console_print_ex(console, MENU_CON_XM, MENU_CON_HEIGHT-4,
+                    libtcod.BKGND_NONE, libtcod.CENTER, 'Press ESC to exit')
+
+            # generate display
+            DrawCachedMenu('unit_info', (unit.unit_class, unit.unit_type), DrawUnitInfo)
             libtcod.console_print_ex(menu_con, MENU_CON_XM, 4,
                 libtcod.BKGND_NONE, libtcod.CENTER, unit.GetDesc())
 
-            # grab description from UNIT_INFO if not vehicle
-            if unit.unit_class in ['LW', 'MG', 'AT_GUN']:
-                text = UNIT_INFO[unit.unit_type]
-                lines = wrap(text, 56, subsequent_indent = ' ')
-                y = 6
-                for line in lines:
-                    libtcod.console_print(menu_con, MENU_CON_XM-28, y, line)
-                    y += 1
-            else:
-                # show vehicle info
-                ShowVehicleTypeInfo(unit.unit_type, menu_con, 58, 7)
-
-            libtcod.console_print_ex(menu_con, MENU_CON_XM, MENU_CON_HEIGHT-4,
-                libtcod.BKGND_NONE, libtcod.CENTER, 'Press ESC to exit')
             libtcod.console_blit(menu_con, 0, 0, MENU_CON_WIDTH, MENU_CON_HEIGHT, 0, MENU_CON_X, MENU_CON_Y)
             libtcod.console_flush()
 
@@ -7065,6 +7627,12 @@ def UnitInfo(mx, my):
 # show a pop-up window describing an attack or a to kill roll and its results
 def DisplayRoll(roll_action, tk_roll=False):
 
+    # show any queued labels and batched messages first so that events appear in order
+    if battle.label_queue:
+        ShowQueuedLabels()
+    elif battle.msg_dirty:
+        RenderEncounter(no_flush=True)
+
     # display the menu as it is being drawn, pausing for animation effect
     def UpdateMenu(wait_time):
         if not campaign.animations: return
@@ -7160,6 +7728,16 @@ def DisplayRoll(roll_action, tk_roll=False):
         else:
             libtcod.console_print(menu_con, MENU_CON_XM, 26, 'Required to hit: ' + str(roll_action.roll_req) + ' or less')
             libtcod.console_print(menu_con, MENU_CON_XM, 28, 'To Hit roll (2D6):')
+
+        # chance of success if odds are shown
+        if campaign.show_odds and roll_action.odds is not None:
+            libtcod.console_set_default_foreground(menu_con, libtcod.light_grey)
+            if tk_roll:
+                text = 'Chance to kill: '
+            else:
+                text = 'Chance to hit: '
+            libtcod.console_print(menu_con, MENU_CON_XM, 27, text + FormatOdds(roll_action.odds))
+            libtcod.console_set_default_foreground(menu_con, libtcod.white)
         UpdateMenu(900)
 
     # dice roll animation and sound
@@ -7428,6 +8006,8 @@ def DepleteSmoke():
 # do spotting and identification checks for each crewmember that is able to do so
 def DoSpotting():
 
+    StartMessageBatch()
+
     # flag if anything results from spotting attempts
     spot_result = False
     for crewman in tank.crew:
@@ -7435,38 +8015,23 @@ def DoSpotting():
         # skip if this crew member cannot spot
         if crewman.spot == 'None': continue
 
-        sectors = []
-
-        # determine sectors in which crew member can spot
-        if crewman.spot == 'All':
-            sectors = [0, 1, 2, 3, 4, 5]
-        elif crewman.spot == 'Any One Sector':
-            sectors = [crewman.spot_sector]
-        elif crewman.spot == 'Turret Front':
-            # set according to turret facing
-            sectors = [tank.turret_facing]
-        elif crewman.spot == 'All Except Rear':
-            sectors = [0, 2, 3, 4, 5]
-        elif crewman.spot == 'Tank Front':
-            sectors = [4]
-
-        # test to spot and/or identify each enemy unit
-        for unit in battle.enemy_units:
+        # test to spot and/or identify each indexed enemy unit in this crew member's
+        # spotting area
+        for unit in battle.GetSpotCandidates(crewman.GetSpotMask()):
 
             # skip if unit not alive
-            if not unit.alive: continue
-
-            # skip if unit is outside of spotting area for this crew member
-            if unit.map_hex.sector not in sectors: continue
+            if not unit.alive:
+                battle.RemoveFromSpotIndex(unit)
+                continue
 
             # skip if unit is already hidden
             if unit.hidden: continue
 
-            # skip if unit is spotted and identified
-            if unit.spotted and unit.identified: continue
-
-            # skip if unit is spotted and doesn't need to be identified
-            if unit.spotted and unit.unit_class not in ['TANK', 'SPG', 'AT_GUN']: continue
+            # skip if unit is spotted and identified, or spotted and doesn't need to be
+            # identified
+            if not unit.NeedsSpotting():
+                battle.RemoveFromSpotIndex(unit)
+                continue
 
             # skip if foggy or falling snow and target is at medium and long range
             if unit.map_hex.rng > 0 and (campaign.weather.fog or campaign.weather.precip == 'Snow'):
@@ -7522,6 +8087,7 @@ def DoSpotting():
                 unit.spotted = True
                 if unit.unit_class in ['TANK', 'SPG', 'AT_GUN']:
                     unit.identified = True
+                battle.IndexUnit(unit)
                 text = unit.GetDesc() + ' spotted!'
                 ShowLabel(unit.x+MAP_CON_X, unit.y+MAP_CON_Y, text, crewman=crewman)
                 spot_result = True
@@ -7535,6 +8101,7 @@ def DoSpotting():
                 # if already spotted, no additional benefit
                 if unit.spotted: continue
                 unit.spotted = True
+                battle.IndexUnit(unit)
                 text = unit.GetDesc() + ' spotted!'
                 ShowLabel(unit.x+MAP_CON_X, unit.y+MAP_CON_Y, text, crewman=crewman)
 
@@ -7557,6 +8124,7 @@ def DoSpotting():
 
     # redraw units on map to reflect new spotting status
     UpdateMapOverlay()
+    EndMessageBatch()
 
 
 # try to set up firing MG(s)
@@ -7647,6 +8215,7 @@ def FireMG():
     roll_action.drm = drm
     roll_action.CalculateTotalDRM()
     roll_action.roll_req = roll_req
+    roll_action.odds = MGOdds(roll_req, infantry=(battle.target.unit_class in ['LW', 'MG', 'AT_GUN']))['Kill']
 
     # record if KO is impossible
     if roll_req <= 2: roll_action.nc = True
@@ -7866,23 +8435,91 @@ def SelectNextTarget():
     # if no targets possible, return
     if len(targets) == 0:
         battle.target = None
-        return
 
-    # if no target is already set, then return the first in the list
-    if battle.target is None:
+    # if no target is already set, then select the first in the list
+    elif battle.target is None:
         battle.target = targets[0]
-        return
 
-    # otherwise, skip to the already selected target
-    for target in targets:
-        if target == battle.target: break
-
-    # if there's a next one, return that, otherwise return the first one in the list
-    index_num = targets.index(target)
-    if index_num < len(targets) - 1:
-        battle.target = targets[index_num + 1]
     else:
-        battle.target = targets[0]
+        # otherwise, skip to the already selected target
+        for target in targets:
+            if target == battle.target: break
+
+        # if there's a next one, select that, otherwise select the first one in the list
+        index_num = targets.index(target)
+        if index_num < len(targets) - 1:
+            battle.target = targets[index_num + 1]
+        else:
+            battle.target = targets[0]
+
+    # update the odds shown for the new target
+    if campaign.show_odds:
+        UpdateTankCon()
+
+
+# return a description of the odds of the player's next attack against the selected
+#  target, or None if there is nothing to show; crew skills are not counted
+def GetTargetOddsText():
+
+    if battle.target is None: return None
+    target = battle.target
+    infantry = target.unit_class in ['LW', 'MG', 'AT_GUN']
+
+    if battle.phase == 'Fire Main Gun':
+        if tank.ammo_load == 'None': return None
+
+        (base_th, roll_req, drm) = CalcTH(tank, target, battle.area_fire, tank.ammo_load,
+            preview=True)
+        to_hit = ToHitOdds(roll_req, critical=(tank.ammo_load not in ['WP', 'HCBI']))
+        text = 'Hit ' + FormatOdds(to_hit['Hit'] + to_hit['Critical'])
+
+        # smoke can't kill, nor can AP types against infantry
+        if tank.ammo_load in ['WP', 'HCBI']:
+            return text
+        gun = tank.stats['main_gun']
+        if infantry:
+            if tank.ammo_load != 'HE':
+                return text
+            tk_reqs = (CalcIFT(tank, target, gun, False, battle.area_fire, preview=True)[1],
+                CalcIFT(tank, target, gun, True, battle.area_fire, preview=True)[1])
+            kill = InfantryKillOdds(roll_req, tk_reqs)
+        else:
+            # HVAP and APDS to kill numbers are only known for armoured locations
+            if tank.ammo_load in ['HVAP', 'APDS']:
+                for stat in ['hull_front_armour', 'hull_side_armour',
+                    'turret_front_armour', 'turret_side_armour']:
+                    if stat not in target.stats:
+                        return text
+            tk_reqs = []
+            for critical in [False, True]:
+                reqs = []
+                for hit_location in ['Turret', 'Hull']:
+                    (base_tk, tk_req, drm) = CalcTK(tank, target, target.facing,
+                        tank.ammo_load, critical, battle.area_fire, hit_location)
+                    reqs.append(tk_req)
+                tk_reqs.append(tuple(reqs))
+            kill = VehicleKillOdds(roll_req, tuple(tk_reqs),
+                (target.terrain == 'Hull Down'))['Kill']
+        return text + ', Kill ' + FormatOdds(kill)
+
+    elif battle.phase == 'Fire MGs':
+        if tank.active_mg == 0:
+            (mg_fp, mg_rng) = (tank.stats['co_ax_mg'], 12)
+        elif tank.active_mg == 1:
+            (mg_fp, mg_rng) = (tank.stats['bow_mg'], 8)
+        elif tank.active_mg == 2:
+            (mg_fp, mg_rng) = (tank.stats['aa_mg'], 8)
+        else:
+            return None
+        (base_tk, roll_req, drm) = CalcIFT(tank, target, 'MG', False, False, fp=mg_fp,
+            rng=mg_rng, preview=True)
+        odds = MGOdds(roll_req, infantry)
+        text = 'Kill ' + FormatOdds(odds['Kill'])
+        if infantry:
+            text += ', Pin ' + FormatOdds(odds['Pin'])
+        return text
+
+    return None
 
 
 # fire the player tank's main gun at the selected target
@@ -7944,6 +8581,8 @@ def FireMainGun():
     roll_action.drm = drm
     roll_action.CalculateTotalDRM()
     roll_action.roll_req = roll_req
+    odds = ToHitOdds(roll_req, critical=(tank.ammo_load not in ['WP', 'HCBI']))
+    roll_action.odds = odds['Hit'] + odds['Critical']
 
     ##### To-hit Roll #####
     d1, d2, roll = Roll2D6()
@@ -8728,6 +9367,7 @@ def MoveTank():
             unit.acquired_player = 0
             if unit.unit_class == 'AC':
                 unit.spotting_player = False
+            battle.IndexUnit(unit)
 
         for obj in battle.smoke_factors:
             obj.YMove(move_dist)
@@ -9317,6 +9957,7 @@ def UpdateMsgCon():
         libtcod.console_set_default_foreground(msg_con, color)
         libtcod.console_print(msg_con, 0, y, line)
         y += 1
+    battle.msg_dirty = False
 
 
 # draw tank info to tank info console
@@ -9599,6 +10240,15 @@ def UpdateTankCon():
             libtcod.console_print(tank_con, 1, 28, text)
             libtcod.console_set_default_foreground(tank_con, libtcod.white)
 
+        # display odds of attacking the selected target
+        if campaign.show_odds and battle.phase in ['Fire Main Gun', 'Fire MGs']:
+            text = GetTargetOddsText()
+            if text is not None:
+                libtcod.console_set_default_foreground(tank_con, HIGHLIGHT_COLOR)
+                libtcod.console_print_ex(tank_con, TANK_CON_WIDTH-2, 28, libtcod.BKGND_NONE,
+                    libtcod.RIGHT, 'Target Odds: ' + text)
+                libtcod.console_set_default_foreground(tank_con, libtcod.white)
+
         # display instructions based on current input mode
         lines = []
         if battle.phase == 'Set Spot Sectors':
@@ -9958,6 +10608,10 @@ def DisplayMenuBar():
 #  location
 def RenderEncounter(no_flush=False, zoom_in=False):
 
+    # redraw message console if new messages have been added
+    if battle is not None and battle.msg_dirty:
+        UpdateMsgCon()
+
     # clear the display console
     libtcod.console_clear(con)
 
@@ -10008,6 +10662,8 @@ def WaitForEnter():
     while not end_pause:
         # get input from user
         libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS|libtcod.EVENT_MOUSE, key, mouse)
+        UpdateSteam()
+        UpdateScreenshots()
 
         # exit right away
         if libtcod.console_is_window_closed():
@@ -10105,38 +10761,152 @@ def WaitForEscape():
         libtcod.console_flush()
 
 
-# save the game in progress
+# return the base filename for a saved game slot; slot 1 uses the original saved game
+# filename
+def GetSaveFilename(slot):
+    if slot == 1:
+        return 'savegame'
+    return 'savegame' + str(slot)
+
+
+# read the saved game index and return a dictionary of SavedGameInfo objects keyed by
+# slot number; the index is only re-read from disk if it has changed
+def ReadSaveIndex():
+    global save_index_cache
+
+    if os.path.exists(SAVE_INDEX_FILE):
+        mtime = os.path.getmtime(SAVE_INDEX_FILE)
+    else:
+        mtime = None
+    if save_index_cache is not None and save_index_cache[0] == mtime:
+        return save_index_cache[1]
+
+    save_index = {}
+    if mtime is not None:
+        try:
+            with open(SAVE_INDEX_FILE, 'r') as f:
+                for slot, entry in json.load(f).items():
+                    save_index[int(slot)] = SavedGameInfo(**entry)
+        except:
+            print('ERROR: Could not read saved game index')
+
+    # add an entry for a game saved by an older version that has no index
+    if mtime is None and os.path.exists(GetSaveFilename(1) + '.dat'):
+        try:
+            save = shelve.open(GetSaveFilename(1))
+            info = save['info']
+            save.close()
+            save_index[1] = SavedGameInfo(info.game_version, info.campaign_name,
+                info.commander_name, info.tank_name, info.current_date)
+            WriteSaveIndex(save_index)
+            return save_index
+        except:
+            print('ERROR: Could not read saved game')
+
+    save_index_cache = (mtime, save_index)
+    return save_index
+
+
+# write the saved game index to disk, replacing the old one in a single step
+def WriteSaveIndex(save_index):
+    global save_index_cache
+
+    data = {}
+    for slot, info in save_index.items():
+        data[str(slot)] = vars(info)
+    with open(SAVE_INDEX_FILE + '.tmp', 'w') as f:
+        json.dump(data, f, indent=1)
+    os.replace(SAVE_INDEX_FILE + '.tmp', SAVE_INDEX_FILE)
+    save_index_cache = (os.path.getmtime(SAVE_INDEX_FILE), save_index)
+
+
+# return the first slot that has no saved game in it, or None if all are in use
+def GetFreeSaveSlot():
+    save_index = ReadSaveIndex()
+    for slot in range(1, SAVE_SLOTS+1):
+        if slot not in save_index:
+            return slot
+    return None
+
+
+# delete the saved game in a slot; the campaign journal is left for RecordJournal()
+def DeleteSave(slot):
+    filename = GetSaveFilename(slot)
+    for ext in ['', '.dat', '.dir', '.bak', '.db']:
+        if os.path.exists(filename + ext):
+            os.remove(filename + ext)
+    save_index = dict(ReadSaveIndex())
+    if slot in save_index:
+        del save_index[slot]
+        WriteSaveIndex(save_index)
+
+
+# save the game in progress to the current saved game slot
 def SaveGame():
+    global play_clock
 
     # don't save if campaign is over
     if campaign.over:
         return
 
+    # add time played since last save
+    campaign.play_time += int(time.time() - play_clock)
+    play_clock = time.time()
+
     # create a new SavedGameInfo class
     name = ''
     for crewman in tank.crew:
         if crewman.position == 'Commander':
             name = crewman.name
             break
-    info = SavedGameInfo(VERSION, campaign.campaign_name, name, tank.name, campaign.GetDate())
+    info = SavedGameInfo(VERSION, campaign.campaign_name, name, tank.name, campaign.GetDate(),
+        play_time=campaign.play_time)
+
+    # write out the journal and record its length
+    MarkJournal()
 
-    save = shelve.open('savegame', 'n')
+    save = shelve.open(GetSaveFilename(save_slot), 'n')
     save['info'] = info
     save['campaign'] = campaign
     save['tank'] = tank
     save['battle'] = battle
-    save.close
+    save.close()
+
+    # update the saved game index
+    save_index = dict(ReadSaveIndex())
+    save_index[save_slot] = info
+    WriteSaveIndex(save_index)
 
+    # in debug mode, also keep the encounter as it is now so that it can be rolled back to
+    if DEBUG and battle is not None:
+        PushRollback()
 
-# load a saved game
+
+# load the saved game in the current saved game slot
 def LoadGame():
-    global campaign, tank, battle
-    save = shelve.open('savegame')
+    global campaign, tank, battle, play_clock
+    save = shelve.open(GetSaveFilename(save_slot))
     campaign = save['campaign']
     tank = save['tank']
     battle = save['battle']
     save.close()
 
+    # older saves don't have a heap of quest deadlines
+    if campaign.day_map is not None and not hasattr(campaign.day_map, 'quest_deadlines'):
+        campaign.day_map.BuildQuestDeadlines()
+
+    # older saves don't have the odds display setting
+    if not hasattr(campaign, 'show_odds'):
+        campaign.show_odds = False
+
+    # start timing play
+    if not hasattr(campaign, 'play_time'):
+        campaign.play_time = 0
+    play_clock = time.time()
+
+    # discard any journal entries written after the game was saved
+    RestoreJournal()
+
     # reset campaign calendar info from xml file
     LoadCampaignInfo()
 
@@ -10144,7 +10914,7 @@ def LoadGame():
 # load campaign info from xml file
 def LoadCampaignInfo():
 
-    root = xml.parse(DATAPATH + campaign.campaign_file)
+    root = ParseDataXML(campaign.campaign_file)
     campaign.campaign_name = root.find('name').text
     campaign.player_nation = root.find('player_nation').text
     campaign.enemy_nation = root.find('enemy_nation').text
@@ -10235,12 +11005,40 @@ def LoadCampaignInfo():
     del root
 
 
+# return True if the asset pack is open and has the given asset
+def InAssetPack(name):
+    return asset_pack is not None and asset_pack.Has(name)
+
+
+# return a list of the files in the data directory
+def GetDataFiles():
+    if asset_pack is not None:
+        filenames = [name[5:] for name in asset_pack.GetNames('data')]
+    else:
+        filenames = []
+    if os.path.isdir(DATAPATH):
+        for f in next(os.walk(DATAPATH))[2]:
+            if f not in filenames:
+                filenames.append(f)
+    return filenames
+
+
+# parse an xml file from the data directory
+def ParseDataXML(filename):
+    if InAssetPack('data/' + filename):
+        return xml.parse(io.BytesIO(asset_pack.GetBytes('data/' + filename)))
+    return xml.parse(DATAPATH + filename)
+
+
 # load a console image from an .xp file
+# images in the asset pack are already decompressed and are read in place
 def LoadXP(filename):
-    filename = DATAPATH + filename
-    xp_file = gzip.open(filename)
-    raw_data = xp_file.read()
-    xp_file.close()
+    if InAssetPack('data/' + filename):
+        raw_data = asset_pack.GetView('data/' + filename)
+    else:
+        xp_file = gzip.open(DATAPATH + filename)
+        raw_data = xp_file.read()
+        xp_file.close()
     xp_data = xp_loader.load_xp_string(raw_data)
     console = libtcod.console_new(xp_data['width'], xp_data['height'])
     xp_loader.load_layer_to_console(console, xp_data['layer_data'][0])
@@ -10250,11 +11048,6 @@ def LoadXP(filename):
 # open the highscores file and try to add this campaign's outcome
 def AddHighScore():
     try:
-        # load the existing highscores object from the bones file
-        save = shelve.open('bones')
-        bones = save['bones']
-        save.close()
-    
         # compose the outcome text to be added
         for crew_member in tank.crew:
             if crew_member.position == 'Commander':
@@ -10266,35 +11059,85 @@ def AddHighScore():
         else:
             outcome = 'Survived'
     
-        # add the new entry to the list of highscores
+        # add the new entry to the list of highscores, limited to max length
         vp = campaign.vp + campaign.day_vp
-        bones.score_list.append((tank.name, crew_member.name, vp, outcome,
+        bones.AddScore((tank.name, crew_member.name, vp, outcome,
             campaign.unlimited_tank_selection,
             campaign.casual_commander,
-            campaign.campaign_name))
-    
-        # sort the new list
-        bones.score_list.sort(key=lambda tup: tup[2], reverse=True)
-    
-        # limit to max length
-        if len(bones.score_list) > MAX_HS:
-            del bones.score_list[-1]
-    
-        # save the new bones file
-        save = shelve.open('bones')
-        save['bones'] = bones
-        save.close()
+            campaign.campaign_name), MAX_HS)
     except:
         print('ERROR: Could not open bones file.')
 
 
-# save a screenshot of the current main console
+# save a screenshot of the current main console as a PNG file, in the background; with
+#  shift held, start or stop a rapid-fire burst of screenshots instead
 def SaveScreenshot():
-    img = libtcod.image_from_console(0)
-    filename = 'screenshot_' + time.strftime("%Y_%m_%d_%H_%M_%S") + '.bmp'
-    libtcod.image_save(img, filename)
+    global screenshot_burst
+    filename = 'screenshot_' + time.strftime("%Y_%m_%d_%H_%M_%S")
+
+    # shift starts or stops a rapid-fire burst
+    if key.shift:
+        if screenshot_burst is None:
+            screenshot_burst = [filename, 0, time.time(), 0]
+        else:
+            screenshot_burst = None
+        PlaySound('screenshot')
+        return
+
+    if not QueueScreenshot(filename):
+        ShowScreenshotNote('Screenshot skipped, too many still being saved')
+        return
     PlaySound('screenshot')
-    PopUp("Screenshot saved as: " + filename)
+    ShowScreenshotNote('Screenshot saved as: ' + filename + '.png')
+
+
+# note something about screenshots along the bottom of the screen until it is next
+#  redrawn
+def ShowScreenshotNote(text):
+    libtcod.console_print_ex(0, SCREEN_XM, SCREEN_HEIGHT-1, libtcod.BKGND_SET,
+        libtcod.CENTER, ' ' + text + ' ')
+    libtcod.console_flush()
+
+
+# copy the screen and queue it to be saved in the background
+def QueueScreenshot(filename):
+    global screenshot_writer
+    if screenshot_writer is None:
+        screenshot_writer = ScreenshotWriter(libtcod)
+        # don't lose any screenshots still being saved when the game exits
+        atexit.register(screenshot_writer.Finish)
+    return screenshot_writer.Save(GrabScreen(libtcod, cells=screenshot_text), filename)
+
+
+# report any screenshots that could not be saved, and capture the next frame of a
+#  rapid-fire screenshot burst if one is running and the frame is due; called from the
+#  main input loops
+def UpdateScreenshots():
+    global screenshot_burst
+    if screenshot_writer is not None:
+        errors = screenshot_writer.GetErrors()
+        for (filename, error) in errors:
+            print('ERROR: Could not save screenshot ' + filename + ': ' + str(error))
+        if len(errors) > 0:
+            (filename, error) = errors[-1]
+            ShowScreenshotNote('Screenshot not saved: ' + filename + '.png (' +
+                str(error) + ')')
+
+    if screenshot_burst is None: return
+    (filename, frame, next_time, skipped) = screenshot_burst
+    now = time.time()
+    if now < next_time: return
+    if not QueueScreenshot(filename + '_' + str(frame).zfill(3)):
+        skipped += 1
+    frame += 1
+    if frame >= SCREENSHOT_BURST_FRAMES:
+        screenshot_burst = None
+        PlaySound('screenshot')
+        if skipped > 0:
+            ShowScreenshotNote(str(skipped) + ' burst screenshots skipped, too many ' +
+                'still being saved')
+    else:
+        screenshot_burst = [filename, frame, now + SCREENSHOT_BURST_INTERVAL, skipped]
 
 
 # display a crew speech box, either on the encounter or the campaign day map
@@ -10334,6 +11177,13 @@ def CrewTalk(message, position_list=None):
 # if confirm, we want a confirmation from the player
 def PopUp(message, confirm=False, skip_update=False):
 
+    # show any queued labels and batched messages first so that events appear in order
+    if battle is not None:
+        if battle.label_queue:
+            ShowQueuedLabels()
+        elif battle.msg_dirty:
+            RenderEncounter(no_flush=True)
+
     # darken screen
     libtcod.console_clear(con)
     libtcod.console_blit(con, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, 0, 0, 0,
@@ -10364,6 +11214,8 @@ def PopUp(message, confirm=False, skip_update=False):
     exit_menu = False
     while not exit_menu:
         libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS|libtcod.EVENT_MOUSE, key, mouse)
+        UpdateSteam()
+        UpdateScreenshots()
 
         key_char = chr(key.c)
 
@@ -10461,6 +11313,8 @@ def EncounterMenu():
             libtcod.BKGND_NONE, libtcod.CENTER, '[%cEnter%c] Return to Game'%HIGHLIGHT)
         libtcod.console_print_ex(menu_con, MENU_CON_XM, 4,
             libtcod.BKGND_NONE, libtcod.CENTER, '[%cQ%c] Save Game and Quit'%HIGHLIGHT)
+        libtcod.console_print_ex(menu_con, MENU_CON_XM, 5,
+            libtcod.BKGND_NONE, libtcod.CENTER, '[%cM%c] Message History'%HIGHLIGHT)
 
     # display enemy units destroyed
     x = 36
@@ -10480,7 +11334,6 @@ def EncounterMenu():
     libtcod.console_print(menu_con, x, 17, 'Anti-Tank Gun                4')
 
     libtcod.console_set_alignment(menu_con, libtcod.RIGHT)
-    VP_SCORES = [1, 1, 2, 6, 7, 9, 12, 4]
 
     # destroyed by player
     y = 10
@@ -10558,6 +11411,8 @@ def EncounterMenu():
     while not exit_menu:
         # get input from user
         libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS|libtcod.EVENT_MOUSE, key, mouse)
+        UpdateSteam()
+        UpdateScreenshots()
 
         if key.vk == libtcod.KEY_ENTER: break
 
@@ -10570,6 +11425,9 @@ def EncounterMenu():
             libtcod.console_clear(con)
             return
 
+        elif battle.result == 'Undetermined' and key_char in ['m', 'M']:
+            ShowTextWindow('Message History', [line for (line, color) in battle.msg_history])
+
         # exit right away
         if libtcod.console_is_window_closed():
             sys.exit()
@@ -10583,6 +11441,8 @@ def EncounterMenu():
 # set a new phase for the encounter, update phase display title on encounter map,
 # and update tank console to reflect new phase
 def NewPhase(new_phase):
+    if results_sinks is not None:
+        TimePhase(new_phase)
     battle.phase = new_phase
     UpdateMapOverlay()
     UpdateTankCon()
@@ -10629,15 +11489,159 @@ def DoEncounter():
         text = 'You are awarded ' + str(battle.vp_total)
     text += ' VP for this encounter.'
 
+    if results_sinks is not None:
+        RecordEncounterResult()
+
     battle = None
 
     Message(text)
 
 
+# clear the time spent in each encounter phase
+def ResetPhaseTimes():
+    global results_phase, results_times
+    results_phase = None
+    results_times = {}
+
+
+# add the time spent in the encounter phase that is ending to the results, and start
+#  timing the next one
+def TimePhase(new_phase):
+    global results_phase
+    now = time.perf_counter()
+    if results_phase is not None:
+        (phase, start_time) = results_phase
+        field = armcom_results.GetPhaseField(phase)
+        results_times[field] = results_times.get(field, 0.0) + now - start_time
+    if new_phase is None:
+        results_phase = None
+    else:
+        results_phase = (new_phase, now)
+
+
+# clear the totals for the action day in progress
+def ResetDayResults():
+    global results_day
+    results_day = {'encounters' : 0, 'kos' : 0, 'crew_losses' : 0}
+
+
+# write a record of the encounter that has just ended to the results, and add it to
+#  the day's totals
+def RecordEncounterResult():
+    TimePhase(None)
+    if results_day is None:
+        ResetDayResults()
+
+    (hour, minute) = battle.start_time
+    kos = sum(battle.tank_ko_record)
+    crew_losses = len([crewman for crewman in tank.crew if not crewman.alive or
+        crewman.v_serious_wound])
+    record = {
+        'seed' : campaign.day_map.seed,
+        'index' : results_day['encounters'],
+        'date' : armcom_results.GetDateText(campaign.current_date),
+        'tank' : tank.unit_type,
+        'enemies' : armcom_results.GetComposition([unit.unit_type for unit in battle.enemy_units]),
+        'enemy_count' : len(battle.enemy_units),
+        'kos' : kos,
+        'friendly_kos' : sum(battle.friendly_ko_record),
+        'player_ko' : not tank.alive,
+        'crew_losses' : crew_losses,
+        'tanks_lost' : battle.tanks_lost,
+        'inf_lost' : battle.inf_lost,
+        'vp' : battle.vp_total,
+        'minutes' : (campaign.hour - hour) * 60 + campaign.minute - minute,
+        'rounds' : battle.rounds_passed,
+        'result' : battle.result
+    }
+    record.update(results_times)
+    results_sinks[0].Add(record)
+
+    results_day['encounters'] += 1
+    results_day['kos'] += kos
+    results_day['crew_losses'] += crew_losses
+    for (field, seconds) in results_times.items():
+        results_day[field] = results_day.get(field, 0.0) + seconds
+    ResetPhaseTimes()
+
+
+# write a record of the action day that has just ended to the results
+def RecordDayResult():
+    if results_day is None:
+        ResetDayResults()
+    if not tank.alive:
+        result = 'Tank Destroyed'
+    elif tank.swiss_cheese:
+        result = 'Damaged Beyond Repair'
+    elif tank.immobilized:
+        result = 'Immobilized'
+    else:
+        result = 'Sunset'
+    (hour, minute) = campaign.GetSunrise()
+    record = dict(results_day)
+    record.update({
+        'seed' : campaign.day_map.seed,
+        'index' : campaign.stats.get('Days of Combat', 1) - 1,
+        'date' : armcom_results.GetDateText(campaign.current_date),
+        'tank' : tank.unit_type,
+        'vp' : campaign.day_vp,
+        'minutes' : (campaign.hour - hour) * 60 + campaign.minute - minute,
+        'result' : result
+    })
+    results_sinks[1].Add(record)
+    ResetDayResults()
+
+
+# keep a snapshot of the encounter as it is now for debug rollback, sharing anything
+#  that hasn't changed with the last one
+def PushRollback():
+    global rolled_back
+    parent = None
+    if len(rollback_snapshots) > 0:
+        parent = rollback_snapshots[-1]
+    rollback_snapshots.append(EncounterSnapshot(sys.modules[__name__], parent))
+    if len(rollback_snapshots) > ROLLBACK_MAX:
+        rollback_snapshots.pop(0).Discard()
+    rolled_back = False
+
+
+def ClearRollback():
+    global rolled_back
+    for snapshot in rollback_snapshots:
+        snapshot.Discard()
+    del rollback_snapshots[:]
+    rolled_back = False
+
+
+# put the encounter back as it was at the last save point, or at the one before that if
+#  it has just been rolled back to the last one
+def RollBack():
+    global rolled_back
+    if rolled_back and len(rollback_snapshots) > 1:
+        rollback_snapshots.pop().Discard()
+    if len(rollback_snapshots) == 0:
+        Message('DEBUG: No save point to roll back to')
+        return
+    rollback_snapshots[-1].Restore()
+    rolled_back = True
+
+    # redraw everything, as when loading an encounter in progress
+    battle.msg_dirty = True
+    PaintMapCon()
+    UpdateMapOverlay()
+    UpdateMapInfoCon(mouse.cx, mouse.cy)
+    UpdateTankCon()
+    UpdateMsgCon()
+    UpdateDateCon()
+    RenderEncounter()
+
+
 # get input and do encounter actions
 def GetEncounterInput():
     # check for keyboard or mouse input
     libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS|libtcod.EVENT_MOUSE, key, mouse)
+    UpdateSteam()
+    UpdateScreenshots()
 
     # mouse stuff first
     mx, my = mouse.cx, mouse.cy
@@ -10834,15 +11838,21 @@ def GetEncounterInput():
                 ##### Enemy Action #####
                 NewPhase('Enemy Action')
 
-                # do an action for each active enemy unit on the board
+                # do an action for each active enemy unit on the board, then show
+                # the results
+                QueueLabels()
+                StartMessageBatch()
                 for unit in battle.enemy_units:
                     if not unit.alive: continue
                     unit.DoAction()
                     UpdateMapOverlay()
-                    RenderEncounter()
                     # check to see if tank has been knocked out by enemy action
                     if battle.result != 'Undetermined':
-                        return
+                        break
+                ShowQueuedLabels(stop_queue=True)
+                EndMessageBatch()
+                if battle.result != 'Undetermined':
+                    return
 
             ##### Friendly Action #####
             # Skip if no alive enemy units
@@ -10851,12 +11861,14 @@ def GetEncounterInput():
 
                 # do an action for each active enemy unit on the board
                 result = False
+                StartMessageBatch()
                 for unit in battle.enemy_units:
                     if not unit.alive: continue
                     if unit.FriendlyAction():
                         result = True
                     UpdateMapOverlay()
-                    RenderEncounter()
+                EndMessageBatch()
+                RenderEncounter()
 
                 if not result:
                     PopUp('No results from Friendly Action.')
@@ -10961,6 +11973,11 @@ def GetEncounterInput():
             RenderEncounter()
             return
 
+        # roll back to the last save point
+        elif key_char == 'z' and (key.lctrl or key.rctrl):
+            RollBack()
+            return
+
     # select spot sector mode
     if battle.phase == 'Set Spot Sectors':
         # select next crew member that can select a spot sector
@@ -11170,7 +12187,9 @@ def GetEncounterInput():
 
         # fire gun!
         if key.vk == libtcod.KEY_ENTER:
+            StartMessageBatch()
             FireMainGun()
+            EndMessageBatch()
 
         # cycle through ammo reload selections
         elif key_char in ['r', 'R']:
@@ -11224,7 +12243,9 @@ def GetEncounterInput():
 
         # fire an MG
         elif key.vk == libtcod.KEY_ENTER:
+            StartMessageBatch()
             FireMG()
+            EndMessageBatch()
             # no more MGs can fire
             if tank.active_mg == -1:
                 battle.trigger_phase = True
@@ -11241,6 +12262,13 @@ def InitEncounter(load=False, counterattack=False, res_level=None):
 
     global battle
 
+    # start timing encounter phases afresh
+    if results_sinks is not None:
+        ResetPhaseTimes()
+
+    # save points from any earlier encounter can't be rolled back to
+    ClearRollback()
+
     # loading a battle in progress
     if load:
 
@@ -11251,6 +12279,20 @@ def InitEncounter(load=False, counterattack=False, res_level=None):
                 battle.selected_crew = crew_member
                 break
 
+        # rebuild spotting index and crew spot masks, labels are never queued between
+        # phases
+        battle.BuildSpotIndex()
+        battle.label_queue = None
+        battle.msg_batch = 0
+        if not hasattr(battle, 'msg_history'):
+            battle.msg_history = deque(battle.messages, maxlen=MSG_HISTORY_MAX)
+            battle.messages = deque(battle.messages, maxlen=MSG_CON_HEIGHT)
+            battle.msg_dirty = False
+        for crew_member in tank.crew:
+            crew_member.SetSpotMask()
+        if not hasattr(battle, 'start_time'):
+            battle.start_time = (campaign.hour, campaign.minute)
+
         # draw consoles for first time
         UpdateDateCon()
         UpdateTankCon()
@@ -11264,6 +12306,7 @@ def InitEncounter(load=False, counterattack=False, res_level=None):
 
         # set up battle object
         battle = Battle(counterattack=counterattack, res_level=res_level)
+        battle.start_time = (campaign.hour, campaign.minute)
 
         # roll on deployment table for player tank status
         tank.SetDeployment()
@@ -11394,17 +12437,22 @@ def InitEncounter(load=False, counterattack=False, res_level=None):
                     PopUp('Your tank has been ambushed! Enemy gets first attack.')
                     ##### Enemy Action #####
                     NewPhase('Enemy Action')
+                    QueueLabels()
+                    StartMessageBatch()
                     for unit in battle.enemy_units:
                         if not unit.alive: continue
                         unit.DoAction(ambush=True)
                         UpdateMapOverlay()
-                        RenderEncounter()
                         # check to see if tank has been knocked out by enemy action
                         # or if commander has been taken out
                         if battle.result != 'Undetermined' or campaign.over:
-                            if not campaign.over:
-                                EncounterMenu()
-                            return
+                            break
+                    ShowQueuedLabels(stop_queue=True)
+                    EndMessageBatch()
+                    if battle.result != 'Undetermined' or campaign.over:
+                        if not campaign.over:
+                            EncounterMenu()
+                        return
                 ##### Random Events #####
                 NewPhase('Random Events')
                 RandomEvent()
@@ -11816,35 +12864,134 @@ def PaintCampaignMap():
                         DrawBocage(x+w,y1)
 
 
-# draw and update the campaign map overlay
-# used to show things that change on the campaign map: area control, player location, etc.
-def UpdateCOverlay(highlight_node=None, anim_x=-1, anim_y=-1):
-    # clear to key colour
-    libtcod.console_set_default_background(c_overlay_con, KEY_COLOR)
-    libtcod.console_clear(c_overlay_con)
-    libtcod.console_set_default_background(c_overlay_con, libtcod.black)
+# return the foreground colour to use for the campaign map overlay
+def GetCOverlayColor():
+    if campaign.color_scheme == 'WINTER_OR_GROUND_SNOW':
+        return libtcod.blue
+    return libtcod.white
 
-    # highlight frontline between friendly and hostile map areas
-    libtcod.console_set_default_foreground(c_overlay_con, FRONTLINE_COLOR)
-    for node in campaign.day_map.nodes:
-        if not node.friendly_control: continue
-        # skip impassible nodes too
-        if node in campaign.day_map.blocked_nodes: continue
+
+# find the map character locations that lie along the border of each pair of adjacent
+# campaign map areas; these never change once the day map has been generated
+def BuildFrontlineCells(day_map):
+    cells = {}
+    for node in day_map.nodes:
+        # impassible nodes never have a frontline drawn along their edges
+        if node in day_map.blocked_nodes: continue
         for (x,y) in node.edges:
             # check adjacent map character locations
             for (x2,y2) in [(x,y-1), (x-1,y), (x+1,y), (x,y+1)]:
                 # adjacent character location is outside of map
-                if (x2,y2) not in campaign.day_map.char_locations: continue
-                node2 = campaign.day_map.char_locations[(x2,y2)]
-                if node2 != node and not node2.friendly_control:
-                    # draw the character
-                    libtcod.console_put_char(c_overlay_con, x2, y2, 178, libtcod.BKGND_SET)
+                if (x2,y2) not in day_map.char_locations: continue
+                node2 = day_map.char_locations[(x2,y2)]
+                if node2 == node: continue
+                if (node, node2) not in cells:
+                    cells[(node, node2)] = []
+                cells[(node, node2)].append((x2,y2))
+    return cells
+
+
+# redraw any cached campaign map overlay layers that are out of date
+# the frontline layer only changes when area control changes, the static layer when a
+# new day map is generated or the map colours change, and the area info layer when
+# area control, resistance, strikes, or quests change
+def UpdateCOverlayLayers():
+    global c_overlay_map, c_frontline_cells, c_overlay_control, c_overlay_static
+    global c_overlay_info
+
+    day_map = campaign.day_map
+
+    # new day map: recalculate the area borders and redraw everything
+    if c_overlay_map is not day_map:
+        c_overlay_map = day_map
+        c_frontline_cells = BuildFrontlineCells(day_map)
+        c_overlay_control = None
+        c_overlay_static = None
+        c_overlay_info = None
+
+    # frontline between friendly and hostile map areas
+    control = tuple([node.friendly_control for node in day_map.nodes])
+    if control != c_overlay_control:
+        c_overlay_control = control
+        libtcod.console_set_default_background(c_frontline_con, KEY_COLOR)
+        libtcod.console_clear(c_frontline_con)
+        libtcod.console_set_default_background(c_frontline_con, libtcod.black)
+        libtcod.console_set_default_foreground(c_frontline_con, FRONTLINE_COLOR)
+        for (node, node2), cells in c_frontline_cells.items():
+            if not node.friendly_control or node2.friendly_control: continue
+            for (x,y) in cells:
+                libtcod.console_put_char(c_frontline_con, x, y, 178, libtcod.BKGND_SET)
 
     # set foreground colour based on campaign map colours
-    if campaign.color_scheme == 'WINTER_OR_GROUND_SNOW':
-        libtcod.console_set_default_foreground(c_overlay_con, libtcod.blue)
-    else:
-        libtcod.console_set_default_foreground(c_overlay_con, libtcod.white)
+    col = GetCOverlayColor()
+
+    # start / exit nodes, node center points
+    if campaign.color_scheme != c_overlay_static:
+        c_overlay_static = campaign.color_scheme
+        c_overlay_info = None
+        libtcod.console_set_default_background(c_static_con, KEY_COLOR)
+        libtcod.console_clear(c_static_con)
+        libtcod.console_set_default_background(c_static_con, libtcod.black)
+        libtcod.console_set_default_foreground(c_static_con, col)
+        for node in day_map.nodes:
+            if node.start:
+                libtcod.console_print_ex(c_static_con, node.x, node.y-1,
+                    libtcod.BKGND_SET, libtcod.CENTER, 'Start')
+            elif node.exit:
+                libtcod.console_print_ex(c_static_con, node.x, node.y-1,
+                    libtcod.BKGND_SET, libtcod.CENTER, 'Exit')
+            libtcod.console_put_char(c_static_con, node.x, node.y, libtcod.CHAR_BULLET,
+                libtcod.BKGND_SET)
+
+    # area control, resistance, strikes, and quests
+    info = [campaign.player_nation]
+    for node in day_map.nodes:
+        info.append((node.friendly_control, node.res_known, node.resistance,
+            node.arty_strike, node.air_strike, node.quest_type))
+    if info != c_overlay_info:
+        c_overlay_info = info
+        libtcod.console_set_default_background(c_area_info_con, KEY_COLOR)
+        libtcod.console_clear(c_area_info_con)
+        libtcod.console_set_default_background(c_area_info_con, libtcod.black)
+        libtcod.console_set_default_foreground(c_area_info_con, col)
+        for node in day_map.nodes:
+            if node.friendly_control:
+                libtcod.console_print_ex(c_area_info_con, node.x, node.y+1,
+                    libtcod.BKGND_SET, libtcod.CENTER, campaign.player_nation)
+            elif node.res_known and node.resistance is not None:
+                libtcod.console_print_ex(c_area_info_con, node.x, node.y+1,
+                    libtcod.BKGND_SET, libtcod.CENTER, node.resistance)
+
+            if not node.friendly_control:
+                if node.arty_strike or node.air_strike:
+                    libtcod.console_print_ex(c_area_info_con, node.x, node.y+2,
+                        libtcod.BKGND_SET, libtcod.CENTER, 'Area hit by')
+                    if node.arty_strike:
+                        text = 'Artillery'
+                    else:
+                        text = 'Air Strike'
+                    libtcod.console_print_ex(c_area_info_con, node.x, node.y+3,
+                        libtcod.BKGND_SET, libtcod.CENTER, text)
+
+            # active quest node
+            if node.quest_type is not None:
+                libtcod.console_print_ex(c_area_info_con, node.x, node.y-2,
+                    libtcod.BKGND_SET, libtcod.CENTER, node.quest_type)
+
+
+# draw and update the campaign map overlay
+# used to show things that change on the campaign map: area control, player location, etc.
+# the slower layers are cached and only redrawn when they change, so this only has to
+# draw the player location and the current selection each time it is called
+def UpdateCOverlay(highlight_node=None, anim_x=-1, anim_y=-1):
+
+    UpdateCOverlayLayers()
+
+    # copy the frontline layer, replacing whatever was there before
+    libtcod.console_blit(c_frontline_con, 0, 0, C_MAP_CON_WIDTH, C_MAP_CON_HEIGHT,
+        c_overlay_con, 0, 0)
+    libtcod.console_set_default_background(c_overlay_con, libtcod.black)
+    libtcod.console_set_default_foreground(c_overlay_con, GetCOverlayColor())
 
     # draw a line to new location if doing campaign action
     # will appear beneath other information drawn below
@@ -11855,56 +13002,25 @@ def UpdateCOverlay(highlight_node=None, anim_x=-1, anim_y=-1):
             for (x, y) in line:
                 libtcod.console_put_char(c_overlay_con, x, y, 250, libtcod.BKGND_SET)
 
-    # display start / exit nodes, node center point
-    for node in campaign.day_map.nodes:
-
-        if node.start:
-            libtcod.console_print_ex(c_overlay_con, node.x, node.y-1,
-                libtcod.BKGND_SET, libtcod.CENTER, 'Start')
-        elif node.exit:
-            libtcod.console_print_ex(c_overlay_con, node.x, node.y-1,
-                libtcod.BKGND_SET, libtcod.CENTER, 'Exit')
-
-        # highlight player node or draw node center
-        # don't draw player indicator if we are animating it
-        if campaign.day_map.player_node == node and anim_x == -1:
-            libtcod.console_put_char(c_overlay_con, node.x, node.y, '@', libtcod.BKGND_SET)
-            for (x,y) in campaign.day_map.player_node.edges:
-                libtcod.console_put_char(c_overlay_con, x, y, libtcod.CHAR_BULLET, libtcod.BKGND_SET)
-        else:
-            libtcod.console_put_char(c_overlay_con, node.x, node.y, libtcod.CHAR_BULLET,
-                libtcod.BKGND_SET)
-
-        if node.friendly_control:
-            libtcod.console_print_ex(c_overlay_con, node.x, node.y+1,
-                libtcod.BKGND_SET, libtcod.CENTER, campaign.player_nation)
-        elif node.res_known and node.resistance is not None:
-            libtcod.console_print_ex(c_overlay_con, node.x, node.y+1,
-                libtcod.BKGND_SET, libtcod.CENTER, node.resistance)
-
-        # highlighting node (overwrites player node highlight)
-        if highlight_node == node:
-            col = libtcod.console_get_default_foreground(c_overlay_con)
-            libtcod.console_set_default_foreground(c_overlay_con, SELECTED_COLOR)
-            for (x,y) in node.edges:
-                libtcod.console_put_char(c_overlay_con, x, y, libtcod.CHAR_BULLET, libtcod.BKGND_SET)
-            libtcod.console_set_default_foreground(c_overlay_con, col)
-
-        if not node.friendly_control:
-            if node.arty_strike or node.air_strike:
-                libtcod.console_print_ex(c_overlay_con, node.x, node.y+2,
-                    libtcod.BKGND_SET, libtcod.CENTER, 'Area hit by')
-                if node.arty_strike:
-                    text = 'Artillery'
-                else:
-                    text = 'Air Strike'
-                libtcod.console_print_ex(c_overlay_con, node.x, node.y+3,
-                    libtcod.BKGND_SET, libtcod.CENTER, text)
+    # add the static and area info layers on top
+    libtcod.console_blit(c_static_con, 0, 0, C_MAP_CON_WIDTH, C_MAP_CON_HEIGHT,
+        c_overlay_con, 0, 0)
+    libtcod.console_blit(c_area_info_con, 0, 0, C_MAP_CON_WIDTH, C_MAP_CON_HEIGHT,
+        c_overlay_con, 0, 0)
+
+    # highlight player node
+    # don't draw player indicator if we are animating it
+    node = campaign.day_map.player_node
+    if node is not None and anim_x == -1:
+        libtcod.console_put_char(c_overlay_con, node.x, node.y, '@', libtcod.BKGND_SET)
+        for (x,y) in node.edges:
+            libtcod.console_put_char(c_overlay_con, x, y, libtcod.CHAR_BULLET, libtcod.BKGND_SET)
 
-        # active quest node
-        if node.quest_type is not None:
-            libtcod.console_print_ex(c_overlay_con, node.x, node.y-2,
-                libtcod.BKGND_SET, libtcod.CENTER, node.quest_type)
+    # highlighting node (overwrites player node highlight)
+    if highlight_node is not None:
+        libtcod.console_set_default_foreground(c_overlay_con, SELECTED_COLOR)
+        for (x,y) in highlight_node.edges:
+            libtcod.console_put_char(c_overlay_con, x, y, libtcod.CHAR_BULLET, libtcod.BKGND_SET)
 
     # highlight selected area if any
     if campaign.input_mode != 'None' and campaign.selected_node is not None:
@@ -13276,6 +14392,8 @@ def CampaignMenu():
     while not exit_menu:
         # get input from user
         libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS|libtcod.EVENT_MOUSE, key, mouse)
+        UpdateSteam()
+        UpdateScreenshots()
 
         if key.vk == libtcod.KEY_ESCAPE:
             exit_menu = True
@@ -13431,113 +14549,81 @@ def GetPath(node1, node2, enemy_blocks=False):
 ##########################################################################################
 
 
+# return the pool of campaign map layouts, opening it the first time that it is needed;
+#  returns None if there is no pool
+def GetMapPool():
+    global map_pool, map_pool_checked
+    if not map_pool_checked:
+        map_pool_checked = True
+        if os.path.exists(MAP_POOL_FILE):
+            try:
+                map_pool = MapPool(MAP_POOL_FILE)
+            except (IOError, ValueError, struct.error):
+                print('Could not read campaign map pool file, maps will be generated instead')
+    return map_pool
+
+
 # randomly generate a map for a day of the campaign
 def GenerateCampaignMap():
 
-    MIN_DIST = 7        # minimum distance between node centres
-    NUM_NODES = 55        # number of nodes to try to create
+    # get the day terrain type if any
+    today = GetToday()
+    terrain = 'default'
+    if today is not None and 'terrain' in today:
+        terrain = today['terrain']
 
-    # check to make sure that this position is not within the minimum distance to
-    # another already-existing map node
-    def TooClose(x, y):
-        for node in campaign.day_map.nodes:
-            if GetDistance(x, y, node.x, node.y) <= MIN_DIST:
-                return True
+    GetMapPool()
+    day_map = BuildCampaignDayMap(terrain, campaign.scen_type, campaign.scen_res, random, 0)
+    if day_map is None:
         return False
-
-    # create a new instance of the day map class
-    campaign.day_map = CampaignDayMap()
+    campaign.day_map = day_map
 
     # clear the currently selected node if any
     campaign.selected_node = None
 
-    # generate the map nodes
-    for tries in range(0, 300):
+    return True
 
-        # find a random location on the map board
-        x = libtcod.random_get_int(0, 3, C_MAP_CON_WIDTH-4)
-        y = libtcod.random_get_int(0, 3, C_MAP_CON_HEIGHT-4)
 
-        # check that it's not within the minimum distance away from another
-        # map node
-        if TooClose(x, y):
-            continue
+# randomly generate a campaign day map and return it, or return None if the layout
+#  was no good; rng is a Python random generator and tcod_rng a libtcod one, so that
+#  this can be run away from the game's own random sequences, and it doesn't change the
+#  campaign. the map pool must already have been opened with GetMapPool()
+def BuildCampaignDayMap(terrain, scen_type, scen_res, rng, tcod_rng):
+
+    # draw a layout that is already known to be good from the map pool if we can,
+    #  otherwise generate a new one
+    layout = None
+    if map_pool is not None:
+        layout = map_pool.Draw(terrain, rng)
+    if layout is None:
+        layout = GenerateLayout(terrain, rng)
+        if layout is None:
+            return None
+    (edges, links) = GetEdgesAndLinks(layout)
+    if not CheckPath(layout, links):
+        return None
 
-        # create the node
-        campaign.day_map.nodes.append(MapNode(x, y))
+    # create a new instance of the day map class
+    day_map = CampaignDayMap()
 
-        # break if we have enough nodes
-        if len(campaign.day_map.nodes) >= NUM_NODES:
-            break
+    # create the map nodes
+    for (x, y, node_type) in layout.nodes:
+        node = MapNode(x, y)
+        node.node_type = node_type
+        day_map.nodes.append(node)
+    nodes = day_map.nodes
 
     # create list of character locations and set their node membership
     for y in range(0, C_MAP_CON_HEIGHT):
         for x in range (0, C_MAP_CON_WIDTH):
+            day_map.char_locations[(x,y)] = nodes[layout.GetArea(x, y)]
 
-            # find nearest node to this coordinate
-            nearest = None
-            nearest_dist = None
-            for node in campaign.day_map.nodes:
-                dist = GetDistance(x, y, node.x, node.y)
-                if nearest is None:
-                    nearest = node
-                    nearest_dist = dist
-                    continue
-                if dist < nearest_dist:
-                    nearest = node
-                    nearest_dist = dist
-
-            # create the new character location
-            campaign.day_map.char_locations[(x,y)] = nearest
-
-    # check an adjacent coordinate to see if it belongs to a different map node
-    def CheckCoord(x, xmod, y, ymod, node):
-        node2 = campaign.day_map.char_locations[(x+xmod,y+ymod)]
-        if node2 != node:
-
-            # add to set of edge coordinates
-            node.edges.add((x,y))
-
-            # create link if not already present
-            if node2 not in node.links:
-                node.links.append(node2)
-                node2.links.append(node)
-
-    # determine edge coordinates of node, and generate links to adjacent nodes
-    for y in range(0, C_MAP_CON_HEIGHT):
-        for x in range (0, C_MAP_CON_WIDTH):
-            parent_node = campaign.day_map.char_locations[(x,y)]
-
-            # check the four adjacent coordinates; if any are off the map or
-            # belong to a different area, this is an edge coordinate
-            if x-1<0 or x+1>=C_MAP_CON_WIDTH or y-1<0 or y+1>=C_MAP_CON_HEIGHT:
-                parent_node.edges.add((x,y))
-                continue
-
-            CheckCoord(x, -1, y, 0, parent_node)
-            CheckCoord(x, 1, y, 0, parent_node)
-            CheckCoord(x, 0, y, -1, parent_node)
-            CheckCoord(x, 0, y, 1, parent_node)
-
-    # set node terrain chances based on day terrain type if any
-    today = GetToday()
-    if 'terrain' in today:
-        if today['terrain'] == 'bocage':
-            terrain_chances = [(4,'C'), (5,'A'), (8,'F'), (10,'B'), (11,'D'), (12,'E')]
-        elif today['terrain'] == 'forest':
-            terrain_chances = [(3,'C'), (4,'A'), (8,'D'), (10,'B'), (11,'E')]
-    else:
-        terrain_chances = [(4,'C'), (5,'A'), (8,'B'), (9,'D'), (12,'E')]
-
-    # sort links for each node and set terrain types
-    for node in campaign.day_map.nodes:
-        node.links.sort(key=attrgetter('y', 'x'))
+    # set edge coordinates and links to adjacent nodes
+    for node, node_edges, node_links in zip(nodes, edges, links):
+        node.edges = node_edges
+        node.links = [nodes[i] for i in node_links]
 
-        d1, d2, roll = Roll2D6()
-        for (target_score, node_type) in terrain_chances:
-            if roll <= target_score:
-                node.node_type = node_type
-                break
+    for node in nodes:
 
         # set special settings for particular nodes types
         if node.node_type == 'C':    # village
@@ -13557,83 +14643,40 @@ def GenerateCampaignMap():
                 node.village_radius = 1
 
         elif node.node_type == 'E':    # marshland
-            campaign.day_map.blocked_nodes.add(node)    # mark as impassible
-
-    ##### Prune any adjacent villages #####
-    for node in random.sample(campaign.day_map.nodes, len(campaign.day_map.nodes)):
-        if node.node_type == 'C':
-            for linked_node in node.links:
-                if linked_node.node_type == 'C':
-                    node.node_type = 'A'
-
-    ##### Sever links with impassible nodes #####
-    for node1 in campaign.day_map.nodes:
-        if node1 in campaign.day_map.blocked_nodes:
-            # remove all links from other nodes to this one
-            for node2 in node1.links:
-                node2.links.remove(node1)
-            # remove all links from this node to others
-            node1.links = []
+            day_map.blocked_nodes.add(node)    # mark as impassible
 
     # mark map edge nodes
     for x in range (0, C_MAP_CON_WIDTH):
-        campaign.day_map.char_locations[(x,0)].top_edge = True
-        campaign.day_map.char_locations[(x,C_MAP_CON_HEIGHT-1)].bottom_edge = True
+        day_map.char_locations[(x,0)].top_edge = True
+        day_map.char_locations[(x,C_MAP_CON_HEIGHT-1)].bottom_edge = True
     for y in range (0, C_MAP_CON_HEIGHT):
-        campaign.day_map.char_locations[(0,y)].left_edge = True
-        campaign.day_map.char_locations[(C_MAP_CON_WIDTH-1,y)].right_edge = True
-
-    start_node = None
-    exit_node = None
-
-    # determine start node
-    for node in random.sample(campaign.day_map.nodes, len(campaign.day_map.nodes)):
-
-        if node in campaign.day_map.blocked_nodes: continue
-
-        # in counterattack missions, we start on the top edge
-        if campaign.scen_type == 'Counterattack':
-            if not node.top_edge: continue
-        else:
-            if not node.bottom_edge: continue
-
-        node.start = True
-        # set player node to this node
-        campaign.day_map.player_node = node
-        node.friendly_control = True
-        start_node = node
-        break
-
-    # counterattack missions also have an 'exit' node
-    for node in random.sample(campaign.day_map.nodes, len(campaign.day_map.nodes)):
-        if campaign.scen_type == 'Counterattack':
-            if not node.bottom_edge: continue
-        else:
-            if not node.top_edge: continue
-        if node not in campaign.day_map.blocked_nodes:
-            node.exit = True
-            exit_node = node
-            break
-
-    # Make sure a path is possible from start to exit node; if not, return
-    #  false since map generation has failed
-    if start_node is None or exit_node is None:
-        return False
-    if GetPath(start_node, exit_node) == []:
-        return False
-
-    # for Counterattack missions, make sure we have a start node
+        day_map.char_locations[(0,y)].left_edge = True
+        day_map.char_locations[(C_MAP_CON_WIDTH-1,y)].right_edge = True
+
+    # set start and exit nodes; the layout has a path between an area on the bottom
+    #  edge and one on the top edge
+    # in counterattack missions, we start on the top edge
+    if scen_type == 'Counterattack':
+        start_node = nodes[layout.top]
+        exit_node = nodes[layout.bottom]
     else:
-        if start_node is None: return False
+        start_node = nodes[layout.bottom]
+        exit_node = nodes[layout.top]
+
+    start_node.start = True
+    # set player node to this node
+    day_map.player_node = start_node
+    start_node.friendly_control = True
+    exit_node.exit = True
 
     # determine area resistance levels
-    for node in campaign.day_map.nodes:
+    for node in day_map.nodes:
 
         # skip impassible nodes
-        if node in campaign.day_map.blocked_nodes: continue
+        if node in day_map.blocked_nodes: continue
 
         # do roll and apply modifiers
-        roll = Roll1D10()
+        roll = libtcod.random_get_int(tcod_rng, 1, 10)
 
         if node.node_type == 'A':
             roll += 1
@@ -13650,12 +14693,12 @@ def GenerateCampaignMap():
             roll += 1
 
         # check modified roll against odds for different day resistance levels
-        if campaign.scen_res == 'Light':
+        if scen_res == 'Light':
             if roll <= 7:
                 area_res = 'Light'
             else:
                 area_res = 'Medium'
-        elif campaign.scen_res == 'Medium':
+        elif scen_res == 'Medium':
             if roll <= 5:
                 area_res = 'Light'
             elif roll <= 9:
@@ -13673,18 +14716,15 @@ def GenerateCampaignMap():
         node.resistance = area_res
 
         # if counterattack scenario, set all map nodes to friendly control
-        if campaign.scen_type == 'Counterattack':
+        if scen_type == 'Counterattack':
             node.friendly_control = True
 
-    # use the default seed to generate a random seed to use to map painting
+    # generate a random seed to use for map painting
     # seed is an unsigned 32 bit int
-    campaign.day_map.seed = libtcod.random_get_int(0, 0, 2147483647)
-
-    # paint the map console for the first time
-    PaintCampaignMap()
+    day_map.seed = libtcod.random_get_int(tcod_rng, 0, 2147483647)
 
     # map complete!
-    return True
+    return day_map
 
 
 
@@ -13749,7 +14789,7 @@ def CheckCommander():
             PopUp('You have been seriously injured and are sent home. Your campaign is over.')
         # add high score
         AddHighScore()
-        os.remove('savegame')
+        DeleteSave(save_slot)
 
         # record final journal entries
         text = 'Campaign Over: '
@@ -13921,6 +14961,94 @@ def CheckPlayerTank():
         crewman.serious_wound = False
 
 
+# return the inputs that determine the campaign day map for the current day; a map
+#  generated in the background can only be used if these have not changed
+# weather is not included since it doesn't affect map generation
+def GetMapPrefetchKey():
+    today = GetToday()
+    terrain = None
+    if today is not None and 'terrain' in today:
+        terrain = today['terrain']
+    return (tuple(campaign.current_date), campaign.scen_type, campaign.scen_res, terrain)
+
+
+# generate the campaign day map for a set of map inputs, see GetMapPrefetchKey(), from a
+#  random seed; the same inputs and seed always give the same map. job is checked
+#  between attempts so that a cancelled prefetch can stop early, in which case None is
+#  returned
+def BuildSeededDayMap(key, seed, job=None):
+    (date, scen_type, scen_res, terrain) = key
+    if terrain is None:
+        terrain = 'default'
+    rng = random.Random(seed)
+    tcod_rng = libtcod.random_new_from_seed(seed)
+    day_map = None
+    while day_map is None:
+        if job is not None and job.cancelled: break
+        day_map = BuildCampaignDayMap(terrain, scen_type, scen_res, rng, tcod_rng)
+    libtcod.random_delete(tcod_rng)
+    return day_map
+
+
+# Map Prefetch Job Class
+# one campaign day map being generated on a background thread
+class MapPrefetchJob:
+    def __init__(self, key, seed):
+        self.key = key
+        self.seed = seed
+        self.day_map = None            # finished map
+        self.done = threading.Event()        # set once the map is finished
+        self.cancelled = False
+
+    # run on the background thread
+    def Run(self):
+        self.day_map = BuildSeededDayMap(self.key, self.seed, self)
+        self.done.set()
+
+
+# Map Prefetcher Class
+# generates the day map for an upcoming action day on a background thread while the
+#  player is on the calendar screen, so that it is ready when the combat day begins.
+#  the map only depends on the day's map inputs and a seed drawn once when the prefetch
+#  starts, so whether it is finished in the background or built when it is needed, and
+#  whatever is rolled in between, the day gets the same map
+class MapPrefetcher:
+    def __init__(self):
+        self.job = None            # map being generated, if any
+
+    # start generating a map for the given inputs, if not already doing so
+    def Start(self, key):
+        if self.job is not None:
+            if self.job.key == key: return
+            self.Cancel()
+        # open the map pool here so that the thread doesn't have to
+        GetMapPool()
+        seed = libtcod.random_get_int(0, 0, 2147483647)
+        self.job = MapPrefetchJob(key, seed)
+        thread = threading.Thread(target=self.job.Run)
+        thread.daemon = True
+        thread.start()
+
+    # stop any map generation in progress and discard its result
+    def Cancel(self):
+        if self.job is None: return
+        self.job.cancelled = True
+        self.job = None
+
+    # return the map for the given inputs: the one generated in the background if it is
+    #  finished, otherwise built right away from the same seed; if no map was started
+    #  for these inputs, a new seed is drawn
+    def Take(self, key):
+        job = self.job
+        self.Cancel()
+        if job is not None and job.key == key:
+            if job.done.is_set():
+                return job.day_map
+            return BuildSeededDayMap(key, job.seed)
+        GetMapPool()
+        return BuildSeededDayMap(key, libtcod.random_get_int(0, 0, 2147483647))
+
+
 # return a pointer to the current date in the list of campaign days
 def GetToday():
     for calendar_day in campaign.days:
@@ -13980,7 +15108,7 @@ def AdvanceDay():
                 'campaign! Congratulations!')
             campaign.over = True
             AddHighScore()
-            os.remove('savegame')
+            DeleteSave(save_slot)
 
             # record final journal entry
             WriteJournal('Campaign Over: End of campaign calendar')
@@ -14083,6 +15211,9 @@ def AdvanceDay():
 # run through the campaign calendar and get player input
 def RunCalendar(load_day):
 
+    # create the campaign consoles if this is the first campaign this session
+    InitGameConsoles()
+
     # loading a campaign
     if load_day:
         load_day = False
@@ -14210,6 +15341,12 @@ def RunCalendar(load_day):
         libtcod.console_blit(con, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, 0, 0, 0)
         libtcod.console_flush()
 
+        # start generating the day map while the player reads the briefing
+        if campaign.action_day:
+            map_prefetcher.Start(GetMapPrefetchKey())
+        else:
+            map_prefetcher.Cancel()
+
         refresh = False
         while not refresh:
 
@@ -14218,10 +15355,14 @@ def RunCalendar(load_day):
                 sys.exit()
 
             # exiting the campaign
-            if campaign.exiting: return
+            if campaign.exiting:
+                map_prefetcher.Cancel()
+                return
 
             # get player input
             libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS|libtcod.EVENT_MOUSE, key, mouse)
+            UpdateSteam()
+            UpdateScreenshots()
 
             # DEBUG / mapping
             if DEBUG and mouse.rbutton:
@@ -14273,6 +15414,7 @@ def RunCalendar(load_day):
 
             # save and quit
             if key_char in ['q', 'Q']:
+                map_prefetcher.Cancel()
                 SaveGame()
                 return True
 
@@ -14447,11 +15589,11 @@ def ChooseCampaign():
 
     # build list of available campaigns: (filename, name, description)
     campaign_list = []
-    filenames = next(os.walk(DATAPATH))[2]
+    filenames = GetDataFiles()
     for f in filenames:
         if f.endswith('.xml'):
             # try to parse this xml file
-            test = xml.parse(DATAPATH + f)
+            test = ParseDataXML(f)
             if test is None:
                 continue
 
@@ -14547,18 +15689,23 @@ def ChooseCampaign():
 # set up and start a new campaign
 def NewCampaign():
 
-    global tank, battle, campaign
+    global tank, battle, campaign, play_clock
+
+    # create the campaign consoles, since some are used while setting up the campaign
+    InitGameConsoles()
 
     TutorialMessage('welcome')
 
     # create a new campaign object and an empty battle pointer
     campaign = Campaign()
     battle = None
+    play_clock = time.time()
 
     # allow player to select from available campaigns
     campaign.campaign_file = ChooseCampaign()
 
     # write the header entries for the campaign journal
+    StartJournal()
     WriteJournal('*** Armoured Commander Campaign Journal ***')
     WriteJournal('Program Version: ' + VERSION + SUBVERSION)
     WriteJournal('')
@@ -14662,6 +15809,8 @@ def InitCampaignDay(load=False):
 
         # record the day of combat
         campaign.AddStat('Days of Combat', 1)
+        if results_sinks is not None:
+            ResetDayResults()
 
         # reset the camapaign object for a new day
         campaign.ResetForNewDay()
@@ -14730,11 +15879,10 @@ def InitCampaignDay(load=False):
         libtcod.console_set_alignment(con, libtcod.LEFT)
 
         # generate Campaign Day Map
-        # generate a new map
-        good_map = False
-        while not good_map:
-            campaign.nodes = []
-            good_map = GenerateCampaignMap()
+        # use the map generated in the background if it is finished, otherwise
+        #  build it now from the same seed
+        campaign.day_map = map_prefetcher.Take(GetMapPrefetchKey())
+        campaign.selected_node = None
         # paint the campaign map console
         PaintCampaignMap()
 
@@ -14775,6 +15923,9 @@ def InitCampaignDay(load=False):
         if campaign.day_vp > campaign.record_day_vp:
             campaign.record_day_vp = campaign.day_vp
 
+        if results_sinks is not None:
+            RecordDayResult()
+
         campaign.day_vp = 0
         campaign.day_in_progress = False
 
@@ -14819,6 +15970,8 @@ def DoCampaignDay():
 
         # check for keyboard or mouse input
         libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS|libtcod.EVENT_MOUSE, key, mouse)
+        UpdateSteam()
+        UpdateScreenshots()
 
         # do mouse stuff first
         mx, my = mouse.cx, mouse.cy
@@ -15034,37 +16187,41 @@ def GetFiringSound(gun_type):
     return None
 
 
-# try to init SDL mixer and load sound files
+# try to init SDL mixer; sound files are loaded as they are needed by PlaySound()
 def InitMixer():
 
-    global MIXER_ACTIVE
-
-    if not MIXER_ACTIVE: return
+    global MIXER_ACTIVE, sdl2, mixer
 
-    SOUND_LIST = ['20_mm_gun', '75_mm_gun', '76_mm_gun', '88_mm_gun', 'main_gun_misfire',
-        'menu_select', 'aa_mg_firing', 'armour_save',
-        'arty_firing', 'bow_mg_firing', 'coax_mg_firing', 'dice_roll',
-        'engine_noise', 'german_rifle_fire', 'german_mg_fire', 'infantry_moving',
-        'panzerfaust_firing', 'radio', 'screenshot', 'shell_move',
-        'sherman_movement', 'smoke_hit', 'tank_knocked_out',
-        'hatch_open', 'hatch_close', 'he_hit', 'ap_hit', 'main_gun_miss',
-        'new_skill'
-        ]
+    os.environ['PYSDL2_DLL_PATH'] = os.getcwd()   # set sdl2 dll path
+    try:
+        import sdl2                         # for loading sounds from the asset pack
+        import sdl2.sdlmixer as mixer       # sound effects
+    except:
+        return
 
-    global mixer_active, SOUNDS
     mixer.Mix_Init(mixer.MIX_INIT_OGG)
     if mixer.Mix_OpenAudio(44100, mixer.MIX_DEFAULT_FORMAT, 2, 1024) == -1:
         print('Unable to init sounds.')
-        MIXER_ACTIVE = False
         return
     mixer.Mix_AllocateChannels(16)
-
-    # load the sounds into memory
-    for sound_name in SOUND_LIST:
-        SOUNDS[sound_name] = mixer.Mix_LoadWAV(('sounds' + os.sep + sound_name + '.wav').encode('ascii'))
+    MIXER_ACTIVE = True
     print('Sound mixer initialized.')
 
 
+# load a sound file, from the asset pack if it has it
+def LoadSound(sound_name):
+    name = 'sounds/' + sound_name + '.wav'
+    if InAssetPack(name):
+        # the mixer decodes the sound into its own memory, so the asset only needs to
+        #  be pointed to while it loads
+        data = asset_pack.GetCArray(name)
+        rw = sdl2.SDL_RWFromConstMem(data, len(data))
+        sound = mixer.Mix_LoadWAV_RW(rw, 1)
+        del data
+        return sound
+    return mixer.Mix_LoadWAV(('sounds' + os.sep + sound_name + '.wav').encode('ascii'))
+
+
 # play a sound
 def PlaySound(sound_name):
     if not MIXER_ACTIVE: return
@@ -15072,7 +16229,9 @@ def PlaySound(sound_name):
         if not campaign.sounds:
             return
 
-    if not sound_name in SOUNDS: return
+    if not sound_name in SOUNDS:
+        if not sound_name in SOUND_LIST: return
+        SOUNDS[sound_name] = LoadSound(sound_name)
     if SOUNDS[sound_name] is None: return
     mixer.Mix_PlayChannel(-1, SOUNDS[sound_name], 0)
 
@@ -15084,6 +16243,20 @@ def PlaySound(sound_name):
 # display game credits
 def DisplayCredits():
 
+    # draw the frame, title, and commands
+    def DrawCreditsScreen(console):
+        libtcod.console_print_frame(console, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT,
+            clear=False, flag=libtcod.BKGND_DEFAULT, fmt=0)
+
+        libtcod.console_set_alignment(console, libtcod.CENTER)
+
+        libtcod.console_set_default_foreground(console, MENU_TITLE_COLOR)
+        libtcod.console_print(console, SCREEN_XM, 3, '-- Credits --')
+        libtcod.console_set_default_foreground(console, libtcod.white)
+
+        libtcod.console_print(console, SCREEN_XM, SCREEN_HEIGHT-4, '[%cP%c] to Pause'%HIGHLIGHT)
+        libtcod.console_print(console, SCREEN_XM, SCREEN_HEIGHT-3, '[%cEnter or ESC%c] to Return'%HIGHLIGHT)
+
     current_line = 0
     paused = False
 
@@ -15094,17 +16267,11 @@ def DisplayCredits():
     while not exit_menu:
 
         refresh = False
-        libtcod.console_clear(con)
-
-        libtcod.console_print_frame(con, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT,
-            clear=False, flag=libtcod.BKGND_DEFAULT, fmt=0)
-
+        screen = GetCachedScreen('credits', None, SCREEN_WIDTH, SCREEN_HEIGHT,
+            DrawCreditsScreen)
+        libtcod.console_blit(screen, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, con, 0, 0)
         libtcod.console_set_alignment(con, libtcod.CENTER)
 
-        libtcod.console_set_default_foreground(con, MENU_TITLE_COLOR)
-        libtcod.console_print(con, SCREEN_XM, 3, '-- Credits --')
-        libtcod.console_set_default_foreground(con, libtcod.white)
-
         n = 0
         for line in CREDITS_TEXT:
             y = SCREEN_HEIGHT - 10 - (current_line - n)
@@ -15114,8 +16281,6 @@ def DisplayCredits():
 
             libtcod.console_print(con, SCREEN_XM, y, line)
 
-        libtcod.console_print(con, SCREEN_XM, SCREEN_HEIGHT-4, '[%cP%c] to Pause'%HIGHLIGHT)
-        libtcod.console_print(con, SCREEN_XM, SCREEN_HEIGHT-3, '[%cEnter or ESC%c] to Return'%HIGHLIGHT)
         libtcod.console_blit(con, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, 0, 0, 0)
         libtcod.console_flush()
 
@@ -15146,11 +16311,7 @@ def DisplayCredits():
 # display a list of high scores
 def DisplayHighScores():
     try:
-        # open bones file
-        save = shelve.open('bones')
-        bones = save['bones']
-        save.close()
-    
+        score_list = bones.GetScores(MAX_HS)
     except:
         print('ERROR: Could not open bones file.')
         return
@@ -15176,7 +16337,7 @@ def DisplayHighScores():
     libtcod.console_hline(con, 10, 7, 120, flag=libtcod.BKGND_DEFAULT)
 
     y = 9
-    for (tank, commander, score, outcome, ts, cc, campaign_name) in bones.score_list:
+    for (tank, commander, score, outcome, ts, cc, campaign_name) in score_list:
         libtcod.console_print(con, 10, y, campaign_name)
         libtcod.console_print(con, 30, y, tank)
         libtcod.console_print(con, 50, y, commander)
@@ -15204,15 +16365,12 @@ def DisplayHighScores():
 # Display the main menu for the game
 def MainMenu():
 
+    global save_slot
+
     # grab a random entry from the graveyard to display in the main menu
     def GetRandomGrave():
         try:
-            save = shelve.open('bones')
-            bones = save['bones']
-            save.close()
-            if len(bones.graveyard) == 0:
-                return None
-            return random.choice(bones.graveyard)
+            return bones.GetRandomGrave()
         except:
             print('ERROR: Could not open bones file.')
             return None
@@ -15330,8 +16488,9 @@ def MainMenu():
     exit_game = False
     while not exit_game:
 
-        # flag to say that there's a good saved game that can (presumably) be loaded
-        good_saved_game = False
+        # saved games that can (presumably) be loaded, by slot
+        save_index = ReadSaveIndex()
+        good_saved_games = []
 
         # display main menu
         libtcod.console_set_default_background(con, libtcod.black)
@@ -15339,30 +16498,26 @@ def MainMenu():
         libtcod.console_set_alignment(con, libtcod.CENTER)
         libtcod.console_print(con, SCREEN_XM, 33, 'The World War II Tank Commander Roguelike')
 
-        if os.path.exists('savegame.dat'):
+        if len(save_index) > 0:
             libtcod.console_print(con, SCREEN_XM, 36, '[%cC%c]ontinue Campaign:'%
                 HIGHLIGHT)
 
-            # get info from saved game
-            save = shelve.open('savegame')
-            game_info = save['info']
-            save.close()
+            y = 38
+            for slot in sorted(save_index.keys()):
+                game_info = save_index[slot]
 
-            # check saved game version against current
-            # also checks against a list of compatible previous versions
-            if game_info.game_version != VERSION and game_info.game_version not in COMPATIBLE_VERSIONS:
-                libtcod.console_set_default_foreground(con, libtcod.light_red)
-                text = 'Saved game does not match current game version'
-                libtcod.console_print(con, SCREEN_XM, 38, text)
-                text = 'You must reload this saved game with version ' + game_info.game_version
-                libtcod.console_print(con, SCREEN_XM, 39, text)
-            else:
-                good_saved_game = True
-                libtcod.console_set_default_foreground(con, libtcod.light_grey)
-                libtcod.console_print(con, SCREEN_XM, 38, game_info.campaign_name)
-                libtcod.console_print(con, SCREEN_XM, 39, game_info.commander_name)
-                libtcod.console_print(con, SCREEN_XM, 40, game_info.tank_name)
-                libtcod.console_print(con, SCREEN_XM, 41, game_info.current_date)
+                # check saved game version against current
+                # also checks against a list of compatible previous versions
+                if not game_info.IsCompatible():
+                    libtcod.console_set_default_foreground(con, libtcod.light_red)
+                    text = ('Slot ' + str(slot) + ': You must reload this saved game with version ' +
+                        game_info.game_version)
+                else:
+                    good_saved_games.append(slot)
+                    libtcod.console_set_default_foreground(con, libtcod.light_grey)
+                    text = 'Slot ' + str(slot) + ': ' + game_info.GetDesc()
+                libtcod.console_print(con, SCREEN_XM, y, text)
+                y += 1
             libtcod.console_set_default_foreground(con, libtcod.white)
 
         libtcod.console_print(con, SCREEN_XM, 43, '[%cN%c]ew Campaign'%
@@ -15423,6 +16578,8 @@ def MainMenu():
         while not refresh_menu and not exit_game:
 
             libtcod.sys_check_for_event(libtcod.EVENT_KEY_PRESS|libtcod.EVENT_MOUSE, key, mouse)
+            UpdateSteam()
+            UpdateScreenshots()
 
             # exit right away
             if libtcod.console_is_window_closed():
@@ -15430,19 +16587,41 @@ def MainMenu():
 
             key_char = chr(key.c)
             if key_char in ['c', 'C']:
-                if os.path.exists('savegame.dat') and good_saved_game:
+                if len(good_saved_games) > 0:
                     PlaySound('menu_select')
-                    RunCalendar(True)
-                    tombstone = GetRandomGrave()
+
+                    # if more than one saved game, select which one to load
+                    if len(good_saved_games) == 1:
+                        save_slot = good_saved_games[0]
+                    else:
+                        choice_list = []
+                        for slot in good_saved_games:
+                            choice_list.append('Slot ' + str(slot) + ': ' + save_index[slot].GetDesc())
+                        choice = GetChoice('Continue which campaign?', choice_list)
+                        if choice is None:
+                            save_slot = None
+                        else:
+                            save_slot = good_saved_games[choice_list.index(choice)]
+
+                    if save_slot is not None:
+                        RunCalendar(True)
+                        tombstone = GetRandomGrave()
                     refresh_menu = True
 
             elif key_char in ['n', 'N']:
                 PlaySound('menu_select')
-                # if there's already a savegame, make sure we want to replace it
-                if os.path.exists('savegame.dat'):
-                    if PopUp('Starting a new campaign will erase the currently saved one in progress. Are you sure?', confirm=True, skip_update=True):
-                        NewCampaign()
-                else:
+                # use a free slot if any, otherwise select a saved game to replace
+                save_slot = GetFreeSaveSlot()
+                if save_slot is None:
+                    choice_list = []
+                    for slot in sorted(save_index.keys()):
+                        choice_list.append('Slot ' + str(slot) + ': ' + save_index[slot].GetDesc())
+                    choice = GetChoice('Replace which saved campaign?', choice_list)
+                    if choice is not None:
+                        save_slot = sorted(save_index.keys())[choice_list.index(choice)]
+                        if not PopUp('Starting a new campaign will erase the saved one in this slot. Are you sure?', confirm=True, skip_update=True):
+                            save_slot = None
+                if save_slot is not None:
                     NewCampaign()
                 tombstone = GetRandomGrave()
                 refresh_menu = True
@@ -15494,6 +16673,7 @@ def MainMenu():
             # blit main console to screen
             libtcod.console_blit(con, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, 0, 0, 0)
             libtcod.console_flush()
+            FinishStartup()
 
 
 ##########################################################################################
@@ -15506,8 +16686,79 @@ global c_map_con, c_overlay_con, c_action_con, c_info_con
 global tk_table
 global campaign, battle
 
-# set campaign variable to None, will be reset later on
+# nothing here opens a window or a file; that is all left to main(), so that the game
+#  can be imported by tools without starting it up
+import_time = time.perf_counter() - IMPORT_START    # time taken to load the game code
+
+# set campaign and battle variables to None, will be reset later on
 campaign = None
+battle = None
+
+save_slot = 1            # slot of the saved game in play
+save_index_cache = None        # last read saved game index, with index file timestamp
+play_clock = time.time()    # time from which to count play time for the next save
+map_prefetcher = MapPrefetcher()    # generates upcoming campaign day maps
+
+map_pool = None            # pool of campaign map layouts, opened when first needed
+map_pool_checked = False    # tried to open the map pool
+asset_pack = None        # data files and sounds in one file, if any
+bones = None            # high scores and graveyard
+
+# consoles; the root and menu consoles are created at start up, the rest when a
+#  campaign begins
+con = None
+map_con = None
+overlay_con = None
+c_map_con = None
+c_overlay_con = None
+c_frontline_con = None
+c_static_con = None
+c_area_info_con = None
+c_overlay_map = None            # day map that the cached layers were drawn for
+c_frontline_cells = None        # map locations along each border between areas
+c_overlay_control = None        # area control shown on frontline layer
+c_overlay_static = None         # map colour scheme used for static layer
+c_overlay_info = None           # area info shown on area info layer
+map_info_con = None
+msg_con = None
+tank_con = None
+date_con = None
+menu_con = None
+text_con = None
+c_action_con = None
+c_info_con = None
+
+# mouse and key event holders
+mouse = None
+key = None
+
+# steamworks start up
+steamworks = None            # steamworks object, once it has started up
+steam_result = None            # set by the background thread if start up worked
+steam_thread = None            # background thread starting up steamworks
+steam_lock = threading.Lock()        # guards steam_result and steam_cancelled
+steam_cancelled = False            # gave up waiting for steamworks to start up
+steam_start_time = 0.0            # when steamworks start up began
+steam_callback_time = 0.0        # when steamworks was last updated
+
+# startup timing
+startup_times = []            # name and time taken of each start up step
+startup_done = False            # title screen has been shown
+startup_report = False            # print startup times once the title screen is shown
+screenshot_writer = None            # saves screenshots in the background
+screenshot_text = False            # also save screenshots as text and ANSI dumps
+screenshot_burst = None            # [filename, next frame, time of next frame, frames
+                        #  skipped] for a rapid-fire screenshot burst in progress
+spectator_address = None            # address to stream the screen to spectators on, if any
+spectator_server = None            # streams the screen to spectators
+results_directory = None            # directory to write encounter and day results to, if any
+results_sinks = None            # (encounter, day) ResultsSink objects writing the results
+results_phase = None            # (phase, start time) of the encounter phase being timed
+results_times = {}            # seconds spent in each kind of phase this encounter
+results_day = None            # totals for the action day in progress
+rollback_snapshots = []            # snapshots of the latest encounter save points, in
+                        #  debug mode
+rolled_back = False            # encounter has been rolled back to the latest one
 
 # create a new console and return it
 def CreateConsole(w, h, bc, fc, a):
@@ -15518,85 +16769,200 @@ def CreateConsole(w, h, bc, fc, a):
     libtcod.console_clear(new_con)
     return new_con
 
-# set up empty bones file if doesn't exist yet
-if not os.path.exists('bones.dat'):
-    print ('No bones file found; creating a new empty bones file.')
-    bones = Bones()
-    save = shelve.open('bones', 'n')
-    save['bones'] = bones
-    save.close()
+# start streaming the screen to spectators if asked to; every frame shown by
+#  console_flush is passed on, as long as someone is watching and it is not too soon
+#  after the last one
+def StartSpectatorServer():
+    global spectator_server
+    if spectator_address is None: return
+    try:
+        spectator_server = SpectatorServer(spectator_address, libtcod)
+    except OSError as e:
+        print('ERROR: Could not start spectator server: ' + str(e))
+        return
+
+    console_flush = libtcod.console_flush
+    def FlushAndSpectate():
+        console_flush()
+        if spectator_server.FrameDue():
+            spectator_server.SubmitFrame(0)
+    libtcod.console_flush = FlushAndSpectate
+
+
+# start writing encounter and day results if the game was started with --results
+def StartResults():
+    global armcom_results, results_sinks
+    if results_directory is None: return
+    import armcom_results               # needs NumPy, so only imported if asked for
+    try:
+        results_sinks = (armcom_results.ResultsSink(results_directory, 'encounters'),
+            armcom_results.ResultsSink(results_directory, 'days'))
+    except OSError as e:
+        print('ERROR: Could not open results directory: ' + str(e))
+        return
+    # write out any records still waiting when the game exits
+    for sink in results_sinks:
+        atexit.register(sink.Close)
+
+# run one step of the start up sequence and record how long it took
+def BootStep(name, function):
+    start = time.perf_counter()
+    function()
+    startup_times.append((name, time.perf_counter() - start))
+
+# record that the title screen has been shown, and print the startup timing report if
+#  it was asked for
+def FinishStartup():
+    global startup_done
+    if startup_done: return
+    startup_done = True
+    if not startup_report: return
+    print('Startup times:')
+    print(' {:<24}{:>8.1f} ms'.format('load game code', import_time * 1000.0))
+    for (name, step_time) in startup_times:
+        print(' {:<24}{:>8.1f} ms'.format(name, step_time * 1000.0))
+    total = time.perf_counter() - IMPORT_START
+    print(' {:<24}{:>8.1f} ms'.format('title screen shown', total * 1000.0))
+
+# open the asset pack if there is one; any assets that aren't in it are loaded from
+#  their own files. fonts and .png images are always loaded from their own files since
+#  libtcod can only load them by filename
+def OpenAssetPack():
+    global asset_pack
+    if not os.path.exists(PACK_FILE): return
+    try:
+        asset_pack = AssetPack(PACK_FILE)
+    except (IOError, ValueError):
+        print('Could not read asset pack, loading assets from their own files instead')
+
+# open bones database, setting it up if it doesn't exist yet
+def OpenBones():
+    global bones
+    bones = BonesStore()
+    if bones.new:
+        # copy over entries from a bones file from an older version
+        if os.path.exists('bones.dat'):
+            print ('Importing old bones file into new bones database.')
+            save = shelve.open('bones')
+            bones.ImportBones(save['bones'])
+            save.close()
+        else:
+            print ('No bones file found; creating a new empty bones file.')
+            # tribute to David Bowie
+            bones.AddGrave(['Major', 'Jack Celliers', 'Brixton', 'January 10', ''])
+
+# set up the game window and the main display console
+def InitRootConsole():
+    global con, mouse, key
+
+    os.environ['SDL_VIDEO_CENTERED'] = '1'        # center window on screen
+    libtcod.console_set_custom_font('terminal8x12_armcom.png', libtcod.FONT_TYPE_GREYSCALE | libtcod.FONT_LAYOUT_ASCII_INROW, 0, 0)
+    libtcod.console_init_root(SCREEN_WIDTH, SCREEN_HEIGHT, NAME + ' - ' + VERSION + SUBVERSION,
+        fullscreen=False, renderer=libtcod.RENDERER_OPENGL2, vsync=True)
+    libtcod.sys_set_fps(LIMIT_FPS)
+
+    # set defaults for screen console
+    libtcod.console_set_default_background(0, libtcod.black)
+    libtcod.console_set_default_foreground(0, libtcod.white)
+
+    # set up colour control for highlighting command keys
+    libtcod.console_set_color_control(libtcod.COLCTRL_1, KEY_HIGHLIGHT_COLOR, libtcod.black)
+
+    # create the main display console
+    con = libtcod.console_new(SCREEN_WIDTH, SCREEN_HEIGHT)
+    libtcod.console_set_default_background(con, libtcod.black)
+    libtcod.console_set_default_foreground(con, libtcod.white)
+    libtcod.console_set_alignment(con, libtcod.LEFT)
+    libtcod.console_clear(con)
 
-# set up basic stuff
-os.environ['SDL_VIDEO_CENTERED'] = '1'        # center window on screen
-libtcod.console_set_custom_font('terminal8x12_armcom.png', libtcod.FONT_TYPE_GREYSCALE | libtcod.FONT_LAYOUT_ASCII_INROW, 0, 0)
-libtcod.console_init_root(SCREEN_WIDTH, SCREEN_HEIGHT, NAME + ' - ' + VERSION + SUBVERSION,
-    fullscreen=False, renderer=libtcod.RENDERER_OPENGL2, vsync=True)
-libtcod.sys_set_fps(LIMIT_FPS)
-
-# set defaults for screen console
-libtcod.console_set_default_background(0, libtcod.black)
-libtcod.console_set_default_foreground(0, libtcod.white)
-
-# create the main display console
-con = libtcod.console_new(SCREEN_WIDTH, SCREEN_HEIGHT)
-libtcod.console_set_default_background(con, libtcod.black)
-libtcod.console_set_default_foreground(con, libtcod.white)
-libtcod.console_set_alignment(con, libtcod.LEFT)
-libtcod.console_clear(con)
-
-# create game consoles
-map_con = CreateConsole(MAP_CON_WIDTH, MAP_CON_HEIGHT, libtcod.black, libtcod.black,
-    libtcod.LEFT)            # map
-overlay_con = CreateConsole(MAP_CON_WIDTH, MAP_CON_HEIGHT, KEY_COLOR, libtcod.black,
-    libtcod.LEFT)            # map overlay
-libtcod.console_set_key_color(overlay_con, KEY_COLOR)
-
-c_map_con = CreateConsole(C_MAP_CON_WIDTH, C_MAP_CON_HEIGHT, libtcod.black, libtcod.black,
-    libtcod.LEFT)            # campaign map
-c_overlay_con = CreateConsole(C_MAP_CON_WIDTH, C_MAP_CON_HEIGHT, KEY_COLOR, libtcod.white,
-    libtcod.LEFT)            # campaign map overlay
-libtcod.console_set_key_color(c_overlay_con, KEY_COLOR)
-
-map_info_con = CreateConsole(MAP_INFO_CON_WIDTH, MAP_INFO_CON_HEIGHT, libtcod.black,
-    libtcod.white, libtcod.CENTER)    # map info
-msg_con = CreateConsole(MSG_CON_WIDTH, MSG_CON_HEIGHT, libtcod.black, libtcod.white,
-    libtcod.LEFT)            # messages
-tank_con = CreateConsole(TANK_CON_WIDTH, TANK_CON_HEIGHT, libtcod.black, libtcod.white,
-    libtcod.LEFT)            # tank info
-date_con = CreateConsole(DATE_CON_WIDTH, DATE_CON_HEIGHT, libtcod.black, libtcod.white,
-    libtcod.LEFT)            # date, time, etc. info
-menu_con = CreateConsole(MENU_CON_WIDTH, MENU_CON_HEIGHT, libtcod.black, libtcod.white,
-    libtcod.LEFT)            # menu console
-text_con = CreateConsole(TEXT_CON_WIDTH, TEXT_CON_HEIGHT, libtcod.black, libtcod.white,
-    libtcod.LEFT)            # text display console console
-c_action_con = CreateConsole(C_ACTION_CON_W, C_ACTION_CON_H, libtcod.black, libtcod.white,
-    libtcod.LEFT)            # campaign action console
-c_info_con = CreateConsole(C_INFO_CON_W, C_INFO_CON_H, libtcod.black, libtcod.white,
-    libtcod.LEFT)            # campaign message console
-
-# create mouse and key event holders
-mouse = libtcod.Mouse()
-key = libtcod.Key()
-
-# try to start up steamworks; if it fails, it may just mean that Steam is offline, so do nothing
-try:
-    steamworks = STEAMWORKS()
-    steamworks.initialize()
-except:
-    pass
-
-# set up colour control for highlighting command keys
-libtcod.console_set_color_control(libtcod.COLCTRL_1, KEY_HIGHLIGHT_COLOR, libtcod.black)
-
-# display loading screen
-libtcod.console_clear(con)
-libtcod.console_set_alignment(con, libtcod.CENTER)
-libtcod.console_print(con, SCREEN_XM, 30, 'Loading...')
-libtcod.console_blit(con, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, 0, 0, 0)
-libtcod.console_flush()
-
-# init SDL mixer
-InitMixer()
-
-# start main menu
-MainMenu()
+    # create mouse and key event holders
+    mouse = libtcod.Mouse()
+    key = libtcod.Key()
+
+# create the consoles used by the main menu
+def InitMenuConsoles():
+    global menu_con, text_con
+    menu_con = CreateConsole(MENU_CON_WIDTH, MENU_CON_HEIGHT, libtcod.black, libtcod.white,
+        libtcod.LEFT)            # menu console
+    text_con = CreateConsole(TEXT_CON_WIDTH, TEXT_CON_HEIGHT, libtcod.black, libtcod.white,
+        libtcod.LEFT)            # text display console console
+
+# create the encounter and campaign consoles, if they haven't been created yet
+def InitGameConsoles():
+    global map_con, overlay_con, map_info_con, msg_con, tank_con, date_con
+    global c_map_con, c_overlay_con, c_action_con, c_info_con
+    global c_frontline_con, c_static_con, c_area_info_con
+
+    if map_con is not None: return
+
+    map_con = CreateConsole(MAP_CON_WIDTH, MAP_CON_HEIGHT, libtcod.black, libtcod.black,
+        libtcod.LEFT)            # map
+    overlay_con = CreateConsole(MAP_CON_WIDTH, MAP_CON_HEIGHT, KEY_COLOR, libtcod.black,
+        libtcod.LEFT)            # map overlay
+    libtcod.console_set_key_color(overlay_con, KEY_COLOR)
+
+    c_map_con = CreateConsole(C_MAP_CON_WIDTH, C_MAP_CON_HEIGHT, libtcod.black, libtcod.black,
+        libtcod.LEFT)            # campaign map
+    c_overlay_con = CreateConsole(C_MAP_CON_WIDTH, C_MAP_CON_HEIGHT, KEY_COLOR, libtcod.white,
+        libtcod.LEFT)            # campaign map overlay
+    libtcod.console_set_key_color(c_overlay_con, KEY_COLOR)
+    # cached campaign map overlay layers, combined into c_overlay_con
+    c_frontline_con = CreateConsole(C_MAP_CON_WIDTH, C_MAP_CON_HEIGHT, KEY_COLOR, libtcod.white,
+        libtcod.LEFT)            # frontline between areas
+    c_static_con = CreateConsole(C_MAP_CON_WIDTH, C_MAP_CON_HEIGHT, KEY_COLOR, libtcod.white,
+        libtcod.LEFT)            # start / exit areas and area centres
+    libtcod.console_set_key_color(c_static_con, KEY_COLOR)
+    c_area_info_con = CreateConsole(C_MAP_CON_WIDTH, C_MAP_CON_HEIGHT, KEY_COLOR, libtcod.white,
+        libtcod.LEFT)            # area control, resistance, strikes, and quests
+    libtcod.console_set_key_color(c_area_info_con, KEY_COLOR)
+
+    map_info_con = CreateConsole(MAP_INFO_CON_WIDTH, MAP_INFO_CON_HEIGHT, libtcod.black,
+        libtcod.white, libtcod.CENTER)    # map info
+    msg_con = CreateConsole(MSG_CON_WIDTH, MSG_CON_HEIGHT, libtcod.black, libtcod.white,
+        libtcod.LEFT)            # messages
+    tank_con = CreateConsole(TANK_CON_WIDTH, TANK_CON_HEIGHT, libtcod.black, libtcod.white,
+        libtcod.LEFT)            # tank info
+    date_con = CreateConsole(DATE_CON_WIDTH, DATE_CON_HEIGHT, libtcod.black, libtcod.white,
+        libtcod.LEFT)            # date, time, etc. info
+    c_action_con = CreateConsole(C_ACTION_CON_W, C_ACTION_CON_H, libtcod.black, libtcod.white,
+        libtcod.LEFT)            # campaign action console
+    c_info_con = CreateConsole(C_INFO_CON_W, C_INFO_CON_H, libtcod.black, libtcod.white,
+        libtcod.LEFT)            # campaign message console
+
+# start up the game and run the main menu
+# command line options:
+#  --startup-times    print how long each start up step took once the title screen is shown
+def main():
+    global startup_report, screenshot_text, spectator_address, results_directory
+
+    for arg in sys.argv[1:]:
+        if arg == '--startup-times':
+            startup_report = True
+        elif arg == '--screenshot-text':
+            screenshot_text = True
+        # --spectate for the default port, or --spectate=PORT or --spectate=SOCKET_PATH
+        elif arg == '--spectate' or arg.startswith('--spectate='):
+            spectator_address = GetAddress(arg[len('--spectate='):])
+        # --results=DIRECTORY to write a record of each encounter and action day
+        elif arg.startswith('--results='):
+            results_directory = arg[len('--results='):]
+
+    BootStep('open asset pack', OpenAssetPack)
+    BootStep('open bones database', OpenBones)
+    BootStep('create game window', InitRootConsole)
+    BootStep('create menu consoles', InitMenuConsoles)
+    BootStep('start spectator server', StartSpectatorServer)
+    BootStep('start results', StartResults)
+
+    # start up steamworks in the background
+    BootStep('start steamworks', StartSteamworks)
+
+    # init SDL mixer
+    BootStep('init sound mixer', InitMixer)
+
+    # start main menu
+    MainMenu()
+
+
+if __name__ == '__main__':
+    main()
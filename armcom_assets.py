@@ -0,0 +1,227 @@
+# -*- coding: UTF-8 -*-
+
+##########################################################################################
+#                          Asset Pack for Armoured Commander                             #
+##########################################################################################
+
+##########################################################################################
+#
+#    Copyright 2015-2017 Gregory Adam Scott (sudasana@gmail.com)
+#
+#    This file is part of Armoured Commander.
+#
+#    Armoured Commander is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Armoured Commander is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+#    You should have received a copy of the GNU General Public License
+#    along with Armoured Commander, in the form of a file named "LICENSE".
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+##########################################################################################
+
+# packs the game's data files and sounds into a single file, which the game maps into
+# memory once at start up instead of opening each file separately. assets are named by
+# their path relative to the game directory, eg. 'data/m4_a.xp' or 'sounds/radio.wav'.
+# .xp images are stored already decompressed so they can be read in place
+#
+# file format: magic, version, number of assets, and size of the index; then for each
+#  asset its name, offset, size, and SHA-256 hash; then the asset contents, each
+#  starting on an ALIGNMENT byte boundary
+#
+# to build the asset pack from the current data and sounds directories:
+#   python armcom_assets.py build
+# to check the contents of an asset pack:
+#   python armcom_assets.py verify
+
+import argparse                         # for command line options
+import ctypes                           # for passing assets to SDL
+import gzip                             # for decompressing .xp files
+import hashlib                          # for asset hashes
+import mmap                             # for mapping the pack into memory
+import os
+import struct                           # for the pack header and index
+import sys
+
+PACK_FILE = 'armcom.pak'                # default asset pack file
+PACK_MAGIC = b'ACPK'
+PACK_VERSION = 1
+ALIGNMENT = 16                          # byte alignment of asset contents
+
+# directories and file types to include in the pack
+PACK_SOURCES = [
+    ('data', ['.xp', '.xml']),
+    ('sounds', ['.wav'])
+]
+
+HEADER = struct.Struct('<4sHII')        # magic, version, number of assets, index size
+INDEX_ENTRY = struct.Struct('<QQ32s')   # offset, size, hash; follows the name
+
+
+# Asset Pack Class
+# a read-only view of an asset pack file
+class AssetPack:
+    def __init__(self, filename=PACK_FILE):
+        self.filename = filename
+        self.index = {}         # asset name: (offset, size, hash)
+        self.f = open(filename, 'rb')
+
+        # mapped copy-on-write so that ctypes can point into it; nothing is ever written
+        self.data = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        try:
+            (magic, version, count, index_size) = HEADER.unpack_from(self.data, 0)
+            if magic != PACK_MAGIC or version != PACK_VERSION:
+                raise ValueError('Not an asset pack, or from a different version')
+            offset = HEADER.size
+            for n in range(count):
+                (name_len,) = struct.unpack_from('<H', self.data, offset)
+                offset += 2
+                name = self.data[offset:offset+name_len].decode('utf-8')
+                offset += name_len
+                (asset_offset, size, digest) = INDEX_ENTRY.unpack_from(self.data, offset)
+                offset += INDEX_ENTRY.size
+                if asset_offset + size > len(self.data):
+                    raise ValueError('Asset ' + name + ' is past the end of the pack')
+                self.index[name] = (asset_offset, size, digest)
+        except (ValueError, struct.error):
+            self.Close()
+            raise
+
+    # return True if the pack has an asset
+    def Has(self, name):
+        return name in self.index
+
+    # return a sorted list of asset names, optionally only those in one directory
+    def GetNames(self, directory=None):
+        if directory is None:
+            return sorted(self.index.keys())
+        prefix = directory + '/'
+        return sorted([name for name in self.index.keys() if name.startswith(prefix)])
+
+    # return a read-only view of an asset's contents, without copying them
+    def GetView(self, name):
+        (offset, size, digest) = self.index[name]
+        return memoryview(self.data)[offset:offset+size].toreadonly()
+
+    # return a copy of an asset's contents
+    def GetBytes(self, name):
+        (offset, size, digest) = self.index[name]
+        return self.data[offset:offset+size]
+
+    # return a ctypes character array over an asset's contents, without copying them,
+    #  for passing to C libraries; the array must be discarded before the pack is closed
+    def GetCArray(self, name):
+        (offset, size, digest) = self.index[name]
+        return (ctypes.c_char * size).from_buffer(self.data, offset)
+
+    # check an asset's contents against its hash
+    def Verify(self, name):
+        (offset, size, digest) = self.index[name]
+        return hashlib.sha256(self.GetView(name)).digest() == digest
+
+    def Close(self):
+        try:
+            self.data.close()
+        except BufferError:
+            # something is still using the pack, it will be closed when released
+            pass
+        self.f.close()
+
+
+# return the name of an asset file relative to the game directory, using / separators
+def GetAssetName(path):
+    return '/'.join(os.path.normpath(path).split(os.sep))
+
+
+# read an asset file from disk as it will be stored in the pack
+def ReadAssetFile(path):
+    if path.endswith('.xp'):
+        with gzip.open(path) as f:
+            return f.read()
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+# build an asset pack from the files in the pack source directories under base_dir
+# returns the number of assets packed
+def BuildPack(filename=PACK_FILE, base_dir='.'):
+
+    assets = []
+    for (directory, extensions) in PACK_SOURCES:
+        path = os.path.join(base_dir, directory)
+        if not os.path.isdir(path): continue
+        for f in sorted(os.listdir(path)):
+            if os.path.splitext(f)[1].lower() not in extensions: continue
+            name = GetAssetName(os.path.join(directory, f))
+            assets.append((name, ReadAssetFile(os.path.join(path, f))))
+
+    # work out where each asset will go
+    index_size = 0
+    for (name, contents) in assets:
+        index_size += 2 + len(name.encode('utf-8')) + INDEX_ENTRY.size
+
+    def Align(offset):
+        return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+    offset = Align(HEADER.size + index_size)
+    index = b''
+    offsets = []
+    for (name, contents) in assets:
+        encoded_name = name.encode('utf-8')
+        index += struct.pack('<H', len(encoded_name)) + encoded_name
+        index += INDEX_ENTRY.pack(offset, len(contents), hashlib.sha256(contents).digest())
+        offsets.append(offset)
+        offset = Align(offset + len(contents))
+
+    # write to a temporary file first so a partly written pack is never used
+    temp_filename = filename + '.tmp'
+    with open(temp_filename, 'wb') as f:
+        f.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(assets), index_size))
+        f.write(index)
+        for (name, contents), asset_offset in zip(assets, offsets):
+            f.write(b'\0' * (asset_offset - f.tell()))
+            f.write(contents)
+    os.replace(temp_filename, filename)
+
+    return len(assets)
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description='Build and check the Armoured Commander asset pack.')
+    parser.add_argument('command', choices=['build', 'verify', 'list'],
+        help='build the pack from the game directories, check it, or list its contents')
+    parser.add_argument('-f', '--file', default=PACK_FILE, help='asset pack file')
+    parser.add_argument('-d', '--dir', default='.', help='game directory to pack')
+    options = parser.parse_args(args)
+
+    if options.command == 'build':
+        count = BuildPack(options.file, options.dir)
+        print('Packed ' + str(count) + ' assets into ' + options.file)
+        return 0
+
+    pack = AssetPack(options.file)
+    bad = 0
+    for name in pack.GetNames():
+        (offset, size, digest) = pack.index[name]
+        if options.command == 'list':
+            print(name + ': ' + str(size) + ' bytes')
+        elif not pack.Verify(name):
+            print(name + ': hash does not match')
+            bad += 1
+    if options.command == 'verify':
+        print(str(len(pack.index)) + ' assets checked, ' + str(bad) + ' bad')
+    pack.Close()
+    if bad > 0:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,141 @@
+# -*- coding: UTF-8 -*-
+
+##########################################################################################
+#                     High Score and Graveyard Store for Armoured Commander              #
+##########################################################################################
+
+##########################################################################################
+#
+#    Copyright 2015-2017 Gregory Adam Scott (sudasana@gmail.com)
+#
+#    This file is part of Armoured Commander.
+#
+#    Armoured Commander is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Armoured Commander is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+#    You should have received a copy of the GNU General Public License
+#    along with Armoured Commander, in the form of a file named "LICENSE".
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+##########################################################################################
+
+# records high scores, fallen crewmen, and displayed tutorial messages between play
+# sessions in a small SQLite database. every change is a single-row transaction, so
+# nothing needs to be read back and rewritten as a whole
+
+import random                           # for selecting a random graveyard entry
+import sqlite3                          # for the bones database
+
+BONES_FILE = 'bones.db'                 # default bones database file
+
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS scores (
+        id INTEGER PRIMARY KEY,
+        tank_name TEXT,
+        commander_name TEXT,
+        vp INTEGER,
+        outcome TEXT,
+        unlimited_tanks INTEGER,
+        casual_commander INTEGER,
+        campaign_name TEXT)''',
+    'CREATE INDEX IF NOT EXISTS scores_by_vp ON scores (vp DESC, id ASC)',
+    '''CREATE TABLE IF NOT EXISTS graveyard (
+        id INTEGER PRIMARY KEY,
+        rank TEXT,
+        name TEXT,
+        hometown TEXT,
+        date TEXT,
+        decoration TEXT)''',
+    '''CREATE TABLE IF NOT EXISTS tutorial_flags (
+        key TEXT PRIMARY KEY)'''
+]
+
+
+# Bones Store Class
+# holds an open connection to the bones database
+class BonesStore:
+    def __init__(self, filename=BONES_FILE):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+
+        # if the database is new, the caller will want to add initial entries
+        self.new = self.conn.execute("SELECT name FROM sqlite_master WHERE name='scores'").fetchone() is None
+
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+
+    # add a high score entry, keeping only the best max_entries scores
+    # entry is (tank name, commander name, vp, outcome, unlimited tanks, casual
+    #  commander, campaign name)
+    def AddScore(self, entry, max_entries):
+        with self.conn:
+            self.conn.execute('INSERT INTO scores (tank_name, commander_name, vp, ' +
+                'outcome, unlimited_tanks, casual_commander, campaign_name) ' +
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', tuple(entry))
+            self.conn.execute('DELETE FROM scores WHERE id NOT IN (SELECT id FROM ' +
+                'scores ORDER BY vp DESC, id ASC LIMIT ?)', (max_entries,))
+
+    # return a list of high score entries, best first; earlier entries come first
+    # when scores are tied
+    def GetScores(self, limit=-1):
+        rows = self.conn.execute('SELECT tank_name, commander_name, vp, outcome, ' +
+            'unlimited_tanks, casual_commander, campaign_name FROM scores ' +
+            'ORDER BY vp DESC, id ASC LIMIT ?', (limit,)).fetchall()
+        return [(t, c, vp, o, bool(ts), bool(cc), cn) for (t, c, vp, o, ts, cc, cn) in rows]
+
+    # add an entry to the graveyard
+    # entry is [rank, name, hometown, date, decoration]
+    def AddGrave(self, entry):
+        with self.conn:
+            self.conn.execute('INSERT INTO graveyard (rank, name, hometown, date, ' +
+                'decoration) VALUES (?, ?, ?, ?, ?)', tuple(entry))
+
+    # return a random graveyard entry, or None if graveyard is empty
+    def GetRandomGrave(self):
+        (max_id,) = self.conn.execute('SELECT MAX(id) FROM graveyard').fetchone()
+        if max_id is None:
+            return None
+        row = self.conn.execute('SELECT rank, name, hometown, date, decoration FROM ' +
+            'graveyard WHERE id >= ? ORDER BY id LIMIT 1',
+            (random.randint(1, max_id),)).fetchone()
+        if row is None:
+            return None
+        return list(row)
+
+    # return the number of entries in the graveyard
+    def GetGraveCount(self):
+        return self.conn.execute('SELECT COUNT(*) FROM graveyard').fetchone()[0]
+
+    # mark that a tutorial message has been shown; returns True if it had not been
+    # shown before
+    def SetTutorialFlag(self, key):
+        with self.conn:
+            cursor = self.conn.execute('INSERT OR IGNORE INTO tutorial_flags (key) ' +
+                'VALUES (?)', (key,))
+        return cursor.rowcount == 1
+
+    # copy all the entries from an older bones object into this store
+    def ImportBones(self, bones):
+        with self.conn:
+            for entry in bones.score_list:
+                self.conn.execute('INSERT INTO scores (tank_name, commander_name, vp, ' +
+                    'outcome, unlimited_tanks, casual_commander, campaign_name) ' +
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)', tuple(entry))
+            for entry in bones.graveyard:
+                self.conn.execute('INSERT INTO graveyard (rank, name, hometown, date, ' +
+                    'decoration) VALUES (?, ?, ?, ?, ?)', tuple(entry))
+            for key, shown in bones.tutorial_message_flags.items():
+                if shown:
+                    self.conn.execute('INSERT OR IGNORE INTO tutorial_flags (key) ' +
+                        'VALUES (?)', (key,))
+
+    def Close(self):
+        self.conn.close()
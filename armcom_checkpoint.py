@@ -0,0 +1,107 @@
+# -*- coding: UTF-8 -*-
+
+##########################################################################################
+#                     Batch Run Checkpoints for Armoured Commander                       #
+##########################################################################################
+
+##########################################################################################
+#
+#    Copyright 2015-2017 Gregory Adam Scott (sudasana@gmail.com)
+#
+#    This file is part of Armoured Commander.
+#
+#    Armoured Commander is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Armoured Commander is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+#    You should have received a copy of the GNU General Public License
+#    along with Armoured Commander, in the form of a file named "LICENSE".
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+##########################################################################################
+
+# saves the progress of a long batch run to a small JSON checkpoint file, so that a run
+# that is stopped part way through can carry on from where it got to. the file is
+# written to a temporary file first and then replaces the old one in a single step, so
+# there is always one whole checkpoint on disk, however the run was stopped
+#
+# a checkpoint holds the parameters of the run it belongs to, so that it is never used
+# to carry on a different run, and whatever progress the run wants to keep: for
+# armcom_sim.py, the encounters that are done as ranges of encounter numbers, totals of
+# each measure so far, and how many results have been written
+
+import json                             # for the checkpoint file
+import os
+
+CHECKPOINT_VERSION = 1
+
+
+# write a checkpoint for a run with the given parameters
+def SaveCheckpoint(filename, parameters, progress):
+    data = {'version' : CHECKPOINT_VERSION, 'parameters' : parameters,
+        'progress' : progress}
+    with open(filename + '.tmp', 'w') as f:
+        json.dump(data, f, separators=(',', ':'), sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(filename + '.tmp', filename)
+
+
+# return the progress saved in a checkpoint file for a run with the given parameters, or
+#  None if there is no checkpoint file; raises ValueError if the checkpoint is from a
+#  different run
+def LoadCheckpoint(filename, parameters):
+    if not os.path.exists(filename):
+        return None
+    with open(filename) as f:
+        data = json.load(f)
+    if data.get('version') != CHECKPOINT_VERSION:
+        raise ValueError('Checkpoint ' + filename + ' is from a different version')
+    # compare as saved, so that tuples and lists are the same
+    if data['parameters'] != json.loads(json.dumps(parameters)):
+        raise ValueError('Checkpoint ' + filename + ' is from a different run')
+    return data['progress']
+
+
+def DeleteCheckpoint(filename):
+    if os.path.exists(filename):
+        os.remove(filename)
+
+
+##### Ranges of Work Done #####
+# work done is kept as a sorted list of [start, end) ranges of numbers that don't overlap
+
+# return a list of ranges with a new range added to it
+def AddRange(ranges, start, end):
+    result = []
+    for (range_start, range_end) in sorted(list(ranges) + [[start, end]]):
+        if len(result) > 0 and range_start <= result[-1][1]:
+            result[-1][1] = max(result[-1][1], range_end)
+        else:
+            result.append([range_start, range_end])
+    return result
+
+
+# return the ranges from start to end that are not in a list of ranges
+def GetMissingRanges(ranges, start, end):
+    missing = []
+    for (range_start, range_end) in ranges:
+        if range_end <= start: continue
+        if range_start >= end: break
+        if range_start > start:
+            missing.append([start, range_start])
+        start = max(start, range_end)
+    if start < end:
+        missing.append([start, end])
+    return missing
+
+
+# return the total size of a list of ranges
+def GetRangeTotal(ranges):
+    return sum([range_end - range_start for (range_start, range_end) in ranges])
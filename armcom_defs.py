@@ -931,6 +931,12 @@ ENDING_DAMAGES = ['Gun Sight Broken', 'Main Gun Broken', 'Turret Traverse Broken
 
 
 HELP_TEXT = [
+    ('Screenshots', """\
+Press F6 or 6 to save a screenshot of the game window as a PNG file in the game folder.
+Holding Shift while pressing it starts a rapid-fire burst of screenshots, taken a few times
+a second while you keep playing; press Shift+F6 again to stop the burst early. Starting the
+game with --screenshot-text also saves each screenshot as plain text and ANSI colour text.
+"""),
     ('AP', """\
 AP refers to an Armour-piercing gun shell. As the shell is designed to punch through armour,
 it has a minimal explosive charge and thus will do no significant damage to infantry units,
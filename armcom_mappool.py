@@ -0,0 +1,477 @@
+# -*- coding: UTF-8 -*-
+
+##########################################################################################
+#                      Campaign Map Layouts for Armoured Commander                       #
+##########################################################################################
+
+##########################################################################################
+#
+#    Copyright 2015-2017 Gregory Adam Scott (sudasana@gmail.com)
+#
+#    This file is part of Armoured Commander.
+#
+#    Armoured Commander is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Armoured Commander is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+#    You should have received a copy of the GNU General Public License
+#    along with Armoured Commander, in the form of a file named "LICENSE".
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+##########################################################################################
+
+# generates the layout of a campaign day map: area locations, terrain types, and a
+# start and exit area that are connected by a path. layouts can be generated in
+# advance and stored in a pool file, so that the game can draw a layout that is
+# already known to be good instead of generating maps until one works
+#
+# to build a pool file:
+#   python armcom_mappool.py build -n 500
+# to show statistics for a pool file, or for the generator itself:
+#   python armcom_mappool.py stats
+#   python armcom_mappool.py test -n 1000
+
+from math import sqrt
+import argparse                         # for command line options
+import os
+import random
+import struct                           # for pool file records
+import sys
+
+MAP_WIDTH = 90                  # same size as the campaign map console
+MAP_HEIGHT = 90
+MIN_DIST = 7                    # minimum distance between node centres
+NUM_NODES = 55                  # number of nodes to try to create
+
+POOL_FILE = 'data' + os.sep + 'mappool.dat'    # default map pool file
+POOL_MAGIC = b'ACMP'
+POOL_VERSION = 1
+
+# node terrain type chances for each day terrain type: (max 2D6 roll, node type)
+TERRAIN_CHANCES = {
+    'default' : [(4,'C'), (5,'A'), (8,'B'), (9,'D'), (12,'E')],
+    'bocage' : [(4,'C'), (5,'A'), (8,'F'), (10,'B'), (11,'D'), (12,'E')],
+    'forest' : [(3,'C'), (4,'A'), (8,'D'), (10,'B'), (11,'E')]
+}
+
+BLOCKED_TYPES = ['E']           # impassible node types (marshland)
+
+
+# Map Layout Class
+# holds the parts of a campaign day map that don't change from day to day
+class MapLayout:
+    def __init__(self):
+        self.nodes = []         # list of (x, y, node type) for each map area
+        self.grid = []          # index of the area for each map location, row by row
+        self.bottom = None      # index of chosen area on the bottom edge of the map
+        self.top = None         # index of chosen area on the top edge of the map
+        self.path = []          # path of area indexes from bottom area to top area
+
+    # return the index of the area that a map location belongs to
+    def GetArea(self, x, y):
+        return self.grid[(y*MAP_WIDTH) + x]
+
+    # return the set of indexes of impassible areas
+    def GetBlocked(self):
+        return set([i for i, (x, y, node_type) in enumerate(self.nodes) if node_type in BLOCKED_TYPES])
+
+
+# same distance calculation as the game uses
+def GetDistance(x1, y1, x2, y2):
+    return int(sqrt((x1-x2)**2 + (y1-y2)**2))
+
+
+# find the edge locations of each area and the links between adjacent areas; links
+#  are sorted from top to bottom, then left to right. links with impassible areas are
+#  only included if include_blocked is True
+def GetEdgesAndLinks(layout, include_blocked=False):
+    n = len(layout.nodes)
+    edges = [set() for i in range(n)]
+    links = [set() for i in range(n)]
+    for y in range(MAP_HEIGHT):
+        for x in range(MAP_WIDTH):
+            i = layout.GetArea(x, y)
+
+            # locations on the map edge are always edge locations
+            if x-1 < 0 or x+1 >= MAP_WIDTH or y-1 < 0 or y+1 >= MAP_HEIGHT:
+                edges[i].add((x, y))
+                continue
+
+            for (x2, y2) in [(x-1,y), (x+1,y), (x,y-1), (x,y+1)]:
+                i2 = layout.GetArea(x2, y2)
+                if i2 != i:
+                    edges[i].add((x, y))
+                    links[i].add(i2)
+
+    if not include_blocked:
+        blocked = layout.GetBlocked()
+        for i in range(n):
+            if i in blocked:
+                links[i] = set()
+            else:
+                links[i] -= blocked
+
+    def SortKey(i):
+        return (layout.nodes[i][1], layout.nodes[i][0])
+    links = [sorted(l, key=SortKey) for l in links]
+    return (edges, links)
+
+
+# return a list of area indexes on the top or bottom edge of the map
+def GetEdgeAreas(layout, top):
+    if top:
+        y = 0
+    else:
+        y = MAP_HEIGHT - 1
+    areas = []
+    for x in range(MAP_WIDTH):
+        i = layout.GetArea(x, y)
+        if i not in areas:
+            areas.append(i)
+    return areas
+
+
+# find a path from one area to another, returning a list of area indexes, or an
+#  empty list if there is no path
+def FindPath(links, start, end):
+    parents = {start : None}
+    queue = [start]
+    for i in queue:
+        if i == end:
+            path = []
+            while i is not None:
+                path.append(i)
+                i = parents[i]
+            path.reverse()
+            return path
+        for i2 in links[i]:
+            if i2 not in parents:
+                parents[i2] = i
+                queue.append(i2)
+    return []
+
+
+# check that the layout's path really does link its bottom and top areas
+def CheckPath(layout, links):
+    if len(layout.path) == 0: return False
+    if layout.path[0] != layout.bottom or layout.path[-1] != layout.top:
+        return False
+    for i in range(len(layout.path) - 1):
+        if layout.path[i+1] not in links[layout.path[i]]:
+            return False
+    return True
+
+
+# generate a new map layout using the given random number generator
+# returns None if the layout can't be used; if a stats dictionary is given, the
+#  reason for the failure is counted in it
+def GenerateLayout(terrain='default', rng=random, stats=None):
+
+    def Fail(reason):
+        if stats is not None:
+            stats[reason] = stats.get(reason, 0) + 1
+        return None
+
+    layout = MapLayout()
+
+    # place the map nodes
+    for tries in range(0, 300):
+        x = rng.randint(3, MAP_WIDTH-4)
+        y = rng.randint(3, MAP_HEIGHT-4)
+
+        # check that it's not within the minimum distance away from another
+        # map node
+        too_close = False
+        for (x2, y2, node_type) in layout.nodes:
+            if GetDistance(x, y, x2, y2) <= MIN_DIST:
+                too_close = True
+                break
+        if too_close: continue
+
+        layout.nodes.append((x, y, ''))
+        if len(layout.nodes) >= NUM_NODES:
+            break
+
+    # each map location belongs to the nearest node
+    for y in range(MAP_HEIGHT):
+        for x in range(MAP_WIDTH):
+            nearest = None
+            nearest_dist = None
+            for i, (x2, y2, node_type) in enumerate(layout.nodes):
+                dist = GetDistance(x, y, x2, y2)
+                if nearest is None or dist < nearest_dist:
+                    nearest = i
+                    nearest_dist = dist
+            layout.grid.append(nearest)
+
+    (edges, links) = GetEdgesAndLinks(layout, include_blocked=True)
+
+    # set terrain types
+    terrain_chances = TERRAIN_CHANCES[terrain]
+    node_types = []
+    for i in range(len(layout.nodes)):
+        roll = rng.randint(1, 6) + rng.randint(1, 6)
+        node_type = ''
+        for (target_score, chance_type) in terrain_chances:
+            if roll <= target_score:
+                node_type = chance_type
+                break
+        node_types.append(node_type)
+
+    # prune any adjacent villages
+    for i in rng.sample(range(len(layout.nodes)), len(layout.nodes)):
+        if node_types[i] == 'C':
+            for i2 in links[i]:
+                if node_types[i2] == 'C':
+                    node_types[i] = 'A'
+
+    layout.nodes = [(x, y, node_types[i]) for i, (x, y, node_type) in enumerate(layout.nodes)]
+    blocked = layout.GetBlocked()
+
+    # choose an area on the bottom and top edges of the map
+    for top in [False, True]:
+        areas = GetEdgeAreas(layout, top)
+        for i in rng.sample(areas, len(areas)):
+            if i in blocked: continue
+            if top:
+                layout.top = i
+            else:
+                layout.bottom = i
+            break
+    if layout.bottom is None or layout.top is None:
+        return Fail('no_start_exit')
+
+    # make sure that a path is possible between them
+    (edges, links) = GetEdgesAndLinks(layout)
+    layout.path = FindPath(links, layout.bottom, layout.top)
+    if len(layout.path) == 0:
+        return Fail('no_path')
+
+    return layout
+
+
+# encode a layout as a pool file record
+def PackLayout(layout):
+    data = struct.pack('<B', len(layout.nodes))
+    for (x, y, node_type) in layout.nodes:
+        # areas with no terrain type are stored as a space
+        data += struct.pack('<BBc', x, y, (node_type or ' ').encode('ascii'))
+    data += struct.pack('<BBB', layout.bottom, layout.top, len(layout.path))
+    data += bytes(bytearray(layout.path))
+
+    # the area grid is stored as runs of the same area along each row
+    runs = []
+    for y in range(MAP_HEIGHT):
+        row = layout.grid[y*MAP_WIDTH:(y+1)*MAP_WIDTH]
+        start = 0
+        for x in range(1, MAP_WIDTH+1):
+            if x == MAP_WIDTH or row[x] != row[start]:
+                runs.append((row[start], x - start))
+                start = x
+    data += struct.pack('<H', len(runs))
+    for (i, length) in runs:
+        data += struct.pack('<BB', i, length)
+    return data
+
+
+# decode a layout from a pool file record
+def UnpackLayout(data):
+    layout = MapLayout()
+    offset = 0
+    (n,) = struct.unpack_from('<B', data, offset)
+    offset += 1
+    for i in range(n):
+        (x, y, node_type) = struct.unpack_from('<BBc', data, offset)
+        layout.nodes.append((x, y, node_type.decode('ascii').strip()))
+        offset += 3
+    (layout.bottom, layout.top, path_len) = struct.unpack_from('<BBB', data, offset)
+    offset += 3
+    layout.path = list(bytearray(data[offset:offset+path_len]))
+    offset += path_len
+    (num_runs,) = struct.unpack_from('<H', data, offset)
+    offset += 2
+    for r in range(num_runs):
+        (i, length) = struct.unpack_from('<BB', data, offset)
+        layout.grid.extend([i] * length)
+        offset += 2
+    if len(layout.grid) != MAP_WIDTH * MAP_HEIGHT:
+        raise ValueError('Map layout record has the wrong size')
+    return layout
+
+
+# Map Pool Class
+# reads layouts from a pool file; only the file header is kept in memory, and each
+#  layout is read from the file when it is drawn
+# file format: magic, version, map width and height, and number of terrain types;
+#  then for each terrain type its name, number of layouts, and offset of its table of
+#  record offsets; then the tables and the records themselves
+class MapPool:
+    def __init__(self, filename=POOL_FILE):
+        self.filename = filename
+        self.tables = {}        # terrain type: (number of layouts, table offset)
+        with open(filename, 'rb') as f:
+            (magic, version, w, h, num_terrains) = struct.unpack('<4sHBBB', f.read(9))
+            if magic != POOL_MAGIC or version != POOL_VERSION:
+                raise ValueError('Not a map pool file, or from a different version')
+            if w != MAP_WIDTH or h != MAP_HEIGHT:
+                raise ValueError('Map pool file is for a different map size')
+            for t in range(num_terrains):
+                (name, count, table_offset) = struct.unpack('<16sII', f.read(24))
+                name = name.rstrip(b'\0').decode('ascii')
+                self.tables[name] = (count, table_offset)
+
+    # return the number of layouts for a terrain type
+    def GetCount(self, terrain):
+        if terrain not in self.tables: return 0
+        return self.tables[terrain][0]
+
+    # read one layout from the file
+    def GetLayout(self, terrain, n):
+        (count, table_offset) = self.tables[terrain]
+        with open(self.filename, 'rb') as f:
+            f.seek(table_offset + (n*4))
+            (start, end) = struct.unpack('<II', f.read(8))
+            f.seek(start)
+            return UnpackLayout(f.read(end - start))
+
+    # draw a random layout for a terrain type, or return None if there are none
+    def Draw(self, terrain, rng=random):
+        count = self.GetCount(terrain)
+        if count == 0: return None
+        return self.GetLayout(terrain, rng.randrange(count))
+
+
+# write a pool file from a dictionary of terrain type: list of layouts
+def WritePool(filename, pools):
+    terrains = sorted(pools.keys())
+    header_size = 9 + (24 * len(terrains))
+
+    # each table has one extra offset for the end of the last record
+    offset = header_size
+    table_offsets = []
+    for terrain in terrains:
+        table_offsets.append(offset)
+        offset += (len(pools[terrain]) + 1) * 4
+
+    tables = b''
+    records = b''
+    for terrain in terrains:
+        for layout in pools[terrain]:
+            tables += struct.pack('<I', offset + len(records))
+            records += PackLayout(layout)
+        tables += struct.pack('<I', offset + len(records))
+
+    data = struct.pack('<4sHBBB', POOL_MAGIC, POOL_VERSION, MAP_WIDTH, MAP_HEIGHT,
+        len(terrains))
+    for terrain, table_offset in zip(terrains, table_offsets):
+        data += struct.pack('<16sII', terrain.encode('ascii'), len(pools[terrain]),
+            table_offset)
+
+    # write to a temporary file first so a partly written pool is never used
+    temp_filename = filename + '.tmp'
+    with open(temp_filename, 'wb') as f:
+        f.write(data + tables + records)
+    os.replace(temp_filename, filename)
+
+
+# return a dictionary of statistics for a list of layouts
+def GetLayoutStats(layouts):
+    stats = {}
+    if len(layouts) == 0: return stats
+    num_nodes = [len(layout.nodes) for layout in layouts]
+    path_len = [len(layout.path) for layout in layouts]
+    stats['Layouts'] = len(layouts)
+    stats['Areas (min/avg/max)'] = (min(num_nodes), float(sum(num_nodes)) / len(layouts),
+        max(num_nodes))
+    stats['Path length (min/avg/max)'] = (min(path_len), float(sum(path_len)) / len(layouts),
+        max(path_len))
+    type_counts = {}
+    for layout in layouts:
+        for (x, y, node_type) in layout.nodes:
+            type_counts[node_type] = type_counts.get(node_type, 0) + 1
+    total = sum(num_nodes)
+    for node_type in sorted(type_counts.keys()):
+        stats['Area type ' + (node_type or '(none)')] = '{:.1%}'.format(float(type_counts[node_type]) / total)
+    return stats
+
+
+# generate layouts for a terrain type until count good ones have been found
+# returns the list of layouts and a dictionary of generation results
+def GenerateLayouts(terrain, count, rng):
+    results = {'attempts' : 0}
+    layouts = []
+    while len(layouts) < count:
+        results['attempts'] += 1
+        layout = GenerateLayout(terrain, rng, results)
+        if layout is not None:
+            layouts.append(layout)
+    return (layouts, results)
+
+
+# print generation results and layout statistics
+def PrintStats(terrain, layouts, results=None):
+    print(terrain + ':')
+    if results is not None:
+        attempts = results['attempts']
+        failures = attempts - len(layouts)
+        print('  Attempts: ' + str(attempts))
+        print('  Failure rate: {:.1%}'.format(float(failures) / attempts))
+        for reason in ['no_start_exit', 'no_path']:
+            print('    ' + reason + ': ' + str(results.get(reason, 0)))
+    stats = GetLayoutStats(layouts)
+    for key in sorted(stats.keys()):
+        value = stats[key]
+        if isinstance(value, tuple):
+            value = '{} / {:.1f} / {}'.format(*value)
+        print('  ' + key + ': ' + str(value))
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description='Build and check campaign map layout pools.')
+    parser.add_argument('command', choices=['build', 'stats', 'test'],
+        help='build a pool file, show stats for a pool file, or test the generator')
+    parser.add_argument('-n', '--count', type=int, default=200,
+        help='number of layouts per terrain type')
+    parser.add_argument('-f', '--file', default=POOL_FILE, help='pool file')
+    parser.add_argument('-t', '--terrain', action='append', choices=sorted(TERRAIN_CHANCES.keys()),
+        help='terrain type (default: all)')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='random seed')
+    options = parser.parse_args(args)
+
+    terrains = options.terrain or sorted(TERRAIN_CHANCES.keys())
+    rng = random.Random(options.seed)
+
+    if options.command == 'stats':
+        pool = MapPool(options.file)
+        for terrain in sorted(pool.tables.keys()):
+            layouts = []
+            for n in range(pool.GetCount(terrain)):
+                layout = pool.GetLayout(terrain, n)
+                (edges, links) = GetEdgesAndLinks(layout)
+                if not CheckPath(layout, links):
+                    print('Layout ' + str(n) + ' for ' + terrain + ' has a bad path')
+                layouts.append(layout)
+            PrintStats(terrain, layouts)
+        return 0
+
+    pools = {}
+    for terrain in terrains:
+        (layouts, results) = GenerateLayouts(terrain, options.count, rng)
+        PrintStats(terrain, layouts, results)
+        pools[terrain] = layouts
+
+    if options.command == 'build':
+        WritePool(options.file, pools)
+        print('Wrote ' + str(sum([len(l) for l in pools.values()])) + ' layouts to ' +
+            options.file)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
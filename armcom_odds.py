@@ -0,0 +1,237 @@
+# -*- coding: UTF-8 -*-
+
+##########################################################################################
+#                       Combat Odds Calculator for Armoured Commander                    #
+##########################################################################################
+
+##########################################################################################
+#
+#    Copyright 2015-2017 Gregory Adam Scott (sudasana@gmail.com)
+#
+#    This file is part of Armoured Commander.
+#
+#    Armoured Commander is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Armoured Commander is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+#    You should have received a copy of the GNU General Public License
+#    along with Armoured Commander, in the form of a file named "LICENSE".
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+##########################################################################################
+
+# works out the exact odds of each outcome of a to-hit, to-kill, or MG attack roll from
+# the same final roll required that the game calculates with CalcTH, CalcTK, and CalcIFT,
+# without rolling any dice. the 2D6 distribution is built once by convolving two D6, and
+# every result is cached by its inputs, since the same few combinations come up over and
+# over again
+#
+# all odds are returned as dictionaries of outcome: probability from 0.0 to 1.0
+#
+# to print a table of odds for each final roll required:
+#   python armcom_odds.py
+
+import sys
+
+CACHE_MAX = 1024                        # maximum number of results to cache
+
+
+# return the distribution of the sum of two independent dice distributions
+# a distribution is a dictionary of total: number of ways to roll that total
+def Convolve(dist1, dist2):
+    result = {}
+    for (total1, ways1) in dist1.items():
+        for (total2, ways2) in dist2.items():
+            result[total1+total2] = result.get(total1+total2, 0) + ways1*ways2
+    return result
+
+
+D6 = dict([(n, 1) for n in range(1, 7)])
+TWO_D6 = Convolve(D6, D6)
+TWO_D6_WAYS = sum(TWO_D6.values())      # 36
+
+# hit location roll on 1D10, see GetHitLocation()
+HIT_LOCATIONS = {
+    False : [('Turret', 4), ('Hull', 5), ('Track', 1)],
+    True : [('Turret', 5), ('Miss', 5)]
+}
+
+cache = {}                              # results by function name and inputs
+
+
+# return the chance of rolling exactly a given total on 2D6
+def Chance(total):
+    return float(TWO_D6.get(total, 0)) / TWO_D6_WAYS
+
+
+# return the chance of rolling a given total or less on 2D6
+def ChanceAtMost(total):
+    ways = 0
+    for (n, n_ways) in TWO_D6.items():
+        if n <= total:
+            ways += n_ways
+    return float(ways) / TWO_D6_WAYS
+
+
+# return the cached result of a function for a set of inputs, calling it if required
+def GetCached(name, function, inputs):
+    key = (name,) + inputs
+    if key in cache:
+        return cache[key]
+    if len(cache) >= CACHE_MAX:
+        cache.clear()
+    result = function(*inputs)
+    cache[key] = result
+    return result
+
+
+# odds of a to-hit roll
+# critical: a roll of 2 is a critical hit if the roll required is 2 or more (player main
+#  gun, but not smoke rounds)
+# malfunction: a roll of 12 is a malfunction and always misses (player main gun, panzerfaust)
+def ToHitOdds(roll_req, critical=True, malfunction=True):
+    return GetCached('ToHitOdds', CalcToHitOdds, (roll_req, critical, malfunction))
+
+def CalcToHitOdds(roll_req, critical, malfunction):
+    odds = {'Critical' : 0.0, 'Hit' : 0.0, 'Malfunction' : 0.0, 'Miss' : 0.0}
+    for roll in TWO_D6:
+        if critical and roll_req >= 2 and roll == 2:
+            result = 'Critical'
+        elif malfunction and roll == 12:
+            result = 'Malfunction'
+        elif roll <= roll_req:
+            result = 'Hit'
+        else:
+            result = 'Miss'
+        odds[result] += Chance(roll)
+    return odds
+
+
+# odds of a to-kill roll from a gun hit, see EnemyUnit.ResolveHits()
+# final rolls required of 2 or less can never kill, more than 12 always kill, otherwise
+#  the roll must be less than the roll required; a roll equal to it stuns a vehicle or
+#  pins infantry, as does one more than it for infantry
+def ToKillOdds(roll_req, infantry=False):
+    return GetCached('ToKillOdds', CalcToKillOdds, (roll_req, infantry))
+
+def CalcToKillOdds(roll_req, infantry):
+    if infantry:
+        effect = 'Pin'
+    else:
+        effect = 'Stun'
+    odds = {'Kill' : 0.0, effect : 0.0, 'No Effect' : 0.0}
+    if roll_req <= 2:
+        odds['No Effect'] = 1.0
+        return odds
+    if roll_req > 12:
+        odds['Kill'] = 1.0
+        return odds
+    for roll in TWO_D6:
+        if roll < roll_req:
+            result = 'Kill'
+        elif roll == roll_req or (infantry and roll == roll_req + 1):
+            result = effect
+        else:
+            result = 'No Effect'
+        odds[result] += Chance(roll)
+    return odds
+
+
+# odds of an MG attack roll, see FireMG(); the roll is made even if no kill is possible,
+#  since a double six is always a malfunction
+def MGOdds(roll_req, infantry=True):
+    return GetCached('MGOdds', CalcMGOdds, (roll_req, infantry))
+
+def CalcMGOdds(roll_req, infantry):
+    odds = {'Malfunction' : 0.0, 'Kill' : 0.0, 'Pin' : 0.0, 'No Effect' : 0.0}
+    for roll in TWO_D6:
+        if roll == 12:
+            result = 'Malfunction'
+        elif roll < roll_req:
+            result = 'Kill'
+        elif infantry and (roll == roll_req or roll == roll_req + 1):
+            result = 'Pin'
+        else:
+            result = 'No Effect'
+        odds[result] += Chance(roll)
+    return odds
+
+
+# odds of each hit location on a vehicle
+def HitLocationOdds(hull_down=False):
+    odds = {}
+    for (location, chances) in HIT_LOCATIONS[hull_down]:
+        odds[location] = chances / 10.0
+    return odds
+
+
+# odds of a main gun shot knocking out a vehicle, by hit location
+# tk_reqs are the final to-kill rolls required for ((turret, hull), (critical turret,
+#  critical hull)) hits
+# returns the chance of a kill through each location, the total chance of a kill, and
+#  the chance of immobilizing it instead
+def VehicleKillOdds(to_hit_req, tk_reqs, hull_down=False):
+    return GetCached('VehicleKillOdds', CalcVehicleKillOdds, (to_hit_req, tk_reqs, hull_down))
+
+def CalcVehicleKillOdds(to_hit_req, tk_reqs, hull_down):
+    to_hit = ToHitOdds(to_hit_req)
+    locations = HitLocationOdds(hull_down)
+    odds = {'Turret' : 0.0, 'Hull' : 0.0, 'Kill' : 0.0, 'Immobilized' : 0.0}
+    for (hit_chance, (turret_req, hull_req)) in [(to_hit['Hit'], tk_reqs[0]),
+        (to_hit['Critical'], tk_reqs[1])]:
+        for (location, roll_req) in [('Turret', turret_req), ('Hull', hull_req)]:
+            if location not in locations: continue
+            chance = hit_chance * locations[location] * ToKillOdds(roll_req)['Kill']
+            odds[location] += chance
+            odds['Kill'] += chance
+        odds['Immobilized'] += hit_chance * locations.get('Track', 0.0)
+    return odds
+
+
+# odds of a main gun HE shot destroying an infantry unit
+# tk_reqs are the final IFT rolls required for (normal, critical) hits
+def InfantryKillOdds(to_hit_req, tk_reqs):
+    return GetCached('InfantryKillOdds', CalcInfantryKillOdds, (to_hit_req, tk_reqs))
+
+def CalcInfantryKillOdds(to_hit_req, tk_reqs):
+    to_hit = ToHitOdds(to_hit_req)
+    return (to_hit['Hit'] * ToKillOdds(tk_reqs[0], infantry=True)['Kill'] +
+        to_hit['Critical'] * ToKillOdds(tk_reqs[1], infantry=True)['Kill'])
+
+
+# expected number of kills from a series of MG attacks on the same target, given the
+#  final roll required for each attack; a target can only be destroyed once, and units
+#  broken by a failed pin test are not counted
+def ExpectedMGKills(roll_reqs, infantry=True):
+    survive = 1.0
+    for roll_req in roll_reqs:
+        survive *= 1.0 - MGOdds(roll_req, infantry)['Kill']
+    return 1.0 - survive
+
+
+# return a probability as a percentage string
+def FormatOdds(chance):
+    return str(int(round(chance * 100.0))) + '%'
+
+
+def main(args):
+    print('Roll  To Hit  Critical  To Kill  Stun  MG Kill  MG Pin')
+    for roll_req in range(2, 14):
+        to_hit = ToHitOdds(roll_req)
+        to_kill = ToKillOdds(roll_req)
+        mg = MGOdds(roll_req)
+        print('{:>4}  {:>6}  {:>8}  {:>7}  {:>4}  {:>7}  {:>6}'.format(roll_req,
+            FormatOdds(to_hit['Hit'] + to_hit['Critical']),
+            FormatOdds(to_hit['Critical']), FormatOdds(to_kill['Kill']),
+            FormatOdds(to_kill['Stun']), FormatOdds(mg['Kill']), FormatOdds(mg['Pin'])))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
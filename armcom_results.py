@@ -0,0 +1,396 @@
+# -*- coding: UTF-8 -*-
+
+##########################################################################################
+#                          Results Sink for Armoured Commander                           #
+##########################################################################################
+
+##########################################################################################
+#
+#    Copyright 2015-2017 Gregory Adam Scott (sudasana@gmail.com)
+#
+#    This file is part of Armoured Commander.
+#
+#    Armoured Commander is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Armoured Commander is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+#    You should have received a copy of the GNU General Public License
+#    along with Armoured Commander, in the form of a file named "LICENSE".
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+##########################################################################################
+
+# writes the outcome of each encounter and each action day to a results directory, for
+# reading by tools instead of by players. records are collected a column at a time and
+# written out every CHUNK_ROWS records as one chunk file, so a run of any length only ever
+# holds one chunk of records in memory; each chunk is a NumPy .npz file with one array
+# per field, named after the kind of record, its tag if any, and its number:
+#   encounters-000000.npz, encounters-000001.npz, days-000000.npz, ...
+#
+# the game writes records when started with --results=DIRECTORY, and armcom_sim.py does
+# with -o DIRECTORY
+#
+# a ResultsReader goes through the chunk files one at a time to count, total and average
+# fields, optionally grouped by other fields. to summarise a results directory:
+#   python armcom_results.py DIRECTORY
+# or grouped by fields:
+#   python armcom_results.py DIRECTORY -k encounters -g tank -f kos vp
+
+import argparse                         # for command line options
+import glob                             # for finding chunk files
+import os
+import sys
+
+import numpy
+
+CHUNK_ROWS = 65536                      # records written to each chunk file
+
+# phases of an encounter that time is recorded for, and the game phases in each one
+PHASE_TIMES = ['spotting', 'orders', 'movement', 'fire', 'enemy', 'friendly', 'other']
+PHASE_GROUPS = {
+    'Set Spot Sectors' : 'spotting', 'Spotting' : 'spotting',
+    'Orders' : 'orders', 'Issue Order' : 'orders',
+    'Pivot Tank' : 'movement', 'Tank Movement' : 'movement',
+    'Rotate Turret' : 'fire', 'Fire Main Gun' : 'fire', 'Fire MGs' : 'fire',
+    'Smoke Grenades' : 'fire', 'Smoke Mortar' : 'fire',
+    'Enemy Action' : 'enemy', 'Friendly Action' : 'friendly'
+}
+
+# fields of each kind of record, and their array types; text fields are as wide as their
+#  longest value in each chunk
+TIME_FIELDS = [('time_' + phase, numpy.float32) for phase in PHASE_TIMES]    # seconds
+                                        #  spent in each phase
+ENCOUNTER_FIELDS = [
+    ('seed', numpy.int64),              # random seed of the run or of the action day map
+    ('index', numpy.int64),             # number of the encounter in its run or day
+    ('date', str),                      # date of the encounter, YYYY-MM-DD
+    ('tank', str),                      # player tank model
+    ('enemies', str),                   # enemy units that took part, see GetComposition()
+    ('enemy_count', numpy.int16),       # number of enemy units that took part
+    ('kos', numpy.int16),               # enemy units knocked out by the player
+    ('friendly_kos', numpy.int16),      # " by friendly units
+    ('player_ko', bool),                # player tank knocked out
+    ('crew_losses', numpy.int16),       # crewmen killed or sent home
+    ('tanks_lost', numpy.int16),        # friendly tanks lost
+    ('inf_lost', numpy.int16),          # friendly infantry squads lost
+    ('vp', numpy.int32),                # encounter VP total
+    ('minutes', numpy.int32),           # game time spent
+    ('rounds', numpy.int16),            # encounter rounds played
+    ('result', str)                     # encounter result
+] + TIME_FIELDS
+DAY_FIELDS = [
+    ('seed', numpy.int64),              # random seed of the run or of the action day map
+    ('index', numpy.int64),             # number of the day in its run or campaign
+    ('date', str),
+    ('tank', str),
+    ('encounters', numpy.int16),        # encounters fought
+    ('kos', numpy.int16),               # enemy units knocked out by the player
+    ('crew_losses', numpy.int16),
+    ('vp', numpy.int32),                # VP earned during the day
+    ('minutes', numpy.int32),           # game time from sunrise to the end of the day
+    ('result', str)                     # how the day ended
+] + TIME_FIELDS
+FIELDS = {'encounters' : ENCOUNTER_FIELDS, 'days' : DAY_FIELDS}
+
+
+# return a date as a YYYY-MM-DD string from a [year, month, day] list
+def GetDateText(date):
+    return str(date[0]) + '-' + str(date[1]).zfill(2) + '-' + str(date[2]).zfill(2)
+
+
+# return the enemy composition of an encounter as a string from a list of unit types,
+#  eg. 'LW;PzKw IV H*2'; the same units in any order give the same string
+def GetComposition(unit_types):
+    counts = {}
+    for unit_type in unit_types:
+        counts[unit_type] = counts.get(unit_type, 0) + 1
+    parts = []
+    for unit_type in sorted(counts):
+        if counts[unit_type] == 1:
+            parts.append(unit_type)
+        else:
+            parts.append(unit_type + '*' + str(counts[unit_type]))
+    return ';'.join(parts)
+
+
+# return the field a game phase's time is recorded under
+def GetPhaseField(phase):
+    return 'time_' + PHASE_GROUPS.get(phase, 'other')
+
+
+# Results Sink Class
+# collects records of one kind and writes them out to chunk files in a directory; tag
+#  keeps the chunks of several processes writing to the same directory apart
+class ResultsSink:
+    def __init__(self, directory, kind, tag=None, chunk_rows=CHUNK_ROWS):
+        self.directory = directory
+        self.kind = kind
+        self.fields = FIELDS[kind]
+        self.chunk_rows = chunk_rows
+        self.prefix = kind + '-'
+        if tag is not None:
+            self.prefix += str(tag) + '-'
+        self.rows = []                  # records added one at a time since the last flush
+        self.blocks = []                # dictionaries of columns added since the last flush
+        self.pending = 0                # number of records not yet written
+        self.written = 0                # number of records written
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        # carry on after any chunks already in the directory
+        self.chunk_number = 0
+        for filename in GetChunkFiles(directory, self.prefix):
+            number = GetChunkNumber(filename, self.prefix)
+            if number is not None:
+                self.chunk_number = max(self.chunk_number, number + 1)
+
+    # add one record, as a dictionary of field: value; missing fields are left as 0 or ''
+    def Add(self, record):
+        self.rows.append(record)
+        self.pending += 1
+        if self.pending >= self.chunk_rows:
+            self.Flush()
+
+    # add a number of records at once, as a dictionary of field: array of values
+    def AddColumns(self, columns):
+        count = len(next(iter(columns.values())))
+        start = 0
+        while start < count:
+            end = min(count, start + self.chunk_rows - self.pending)
+            block = {}
+            for (name, values) in columns.items():
+                block[name] = values[start:end]
+            self.MoveRows()
+            self.blocks.append((end - start, block))
+            self.pending += end - start
+            if self.pending >= self.chunk_rows:
+                self.Flush()
+            start = end
+
+    # move records added one at a time into a block, so that records stay in order
+    def MoveRows(self):
+        if len(self.rows) == 0: return
+        block = {}
+        for (name, dtype) in self.fields:
+            block[name] = [GetFieldValue(row, name, dtype) for row in self.rows]
+        self.blocks.append((len(self.rows), block))
+        self.rows = []
+
+    # write any records not yet written as a new chunk file
+    def Flush(self):
+        self.MoveRows()
+        if self.pending == 0: return
+        columns = {}
+        for (name, dtype) in self.fields:
+            parts = []
+            for (count, block) in self.blocks:
+                if name in block:
+                    parts.append(numpy.asarray(block[name], dtype=dtype))
+                elif dtype == str:
+                    parts.append(numpy.full(count, '', dtype=str))
+                else:
+                    parts.append(numpy.zeros(count, dtype=dtype))
+            columns[name] = numpy.concatenate(parts)
+
+        # write to a temporary file first, so that a reader never sees part of a chunk
+        filename = os.path.join(self.directory, self.prefix + str(self.chunk_number).zfill(6) +
+            '.npz')
+        with open(filename + '.tmp', 'wb') as f:
+            numpy.savez_compressed(f, **columns)
+        os.replace(filename + '.tmp', filename)
+
+        self.chunk_number += 1
+        self.written += self.pending
+        self.blocks = []
+        self.pending = 0
+
+    def Close(self):
+        self.Flush()
+
+    # go back to where the sink was when chunk_number chunks and written records had been
+    #  written, as recorded in a checkpoint: later chunks are deleted and records not yet
+    #  written are dropped
+    def Rewind(self, chunk_number, written):
+        for filename in GetChunkFiles(self.directory, self.prefix):
+            number = GetChunkNumber(filename, self.prefix)
+            if number is not None and number >= chunk_number:
+                os.remove(filename)
+        self.chunk_number = chunk_number
+        self.written = written
+        self.rows = []
+        self.blocks = []
+        self.pending = 0
+
+
+# return a field's value from a record, or an empty value if it is missing
+def GetFieldValue(record, name, dtype):
+    if name in record:
+        return record[name]
+    if dtype == str:
+        return ''
+    return 0
+
+
+# return the number of a chunk file written with a prefix, or None if it is another
+#  sink's chunk
+def GetChunkNumber(filename, prefix):
+    number = os.path.basename(filename)[len(prefix):-len('.npz')]
+    if not number.isdigit():
+        return None
+    return int(number)
+
+
+# return the sorted chunk files in a directory whose names start with prefix
+def GetChunkFiles(directory, prefix):
+    return sorted(glob.glob(os.path.join(glob.escape(directory), glob.escape(prefix) + '*.npz')))
+
+
+# Summary Class
+# count, totals and extremes of some fields over a group of records
+class Summary:
+    def __init__(self, fields):
+        self.count = 0
+        self.sums = dict([(name, 0.0) for name in fields])
+        self.squares = dict([(name, 0.0) for name in fields])   # sums of squares
+        self.minimums = dict([(name, None) for name in fields])
+        self.maximums = dict([(name, None) for name in fields])
+
+    # add the records of a chunk picked out by rows
+    def Add(self, columns, rows):
+        self.count += len(rows)
+        for name in self.sums:
+            values = columns[name][rows].astype(float)
+            self.sums[name] += values.sum()
+            self.squares[name] += (values * values).sum()
+            for (extremes, function) in [(self.minimums, min), (self.maximums, max)]:
+                value = function(values)
+                if extremes[name] is None:
+                    extremes[name] = value
+                else:
+                    extremes[name] = function(extremes[name], value)
+
+    def GetMean(self, name):
+        if self.count == 0: return 0.0
+        return self.sums[name] / self.count
+
+    def GetStdDev(self, name):
+        if self.count == 0: return 0.0
+        mean = self.GetMean(name)
+        return max(0.0, self.squares[name] / self.count - mean * mean) ** 0.5
+
+
+# Results Reader Class
+# reads the records of one kind from a results directory, one chunk at a time
+class ResultsReader:
+    def __init__(self, directory, kind):
+        self.directory = directory
+        self.kind = kind
+        self.fields = [name for (name, dtype) in FIELDS[kind]]
+
+    def GetChunkFiles(self):
+        return GetChunkFiles(self.directory, self.kind + '-')
+
+    # yield the columns of each chunk as a dictionary of field: array, only reading the
+    #  fields asked for
+    def Chunks(self, fields=None):
+        if fields is None:
+            fields = self.fields
+        for filename in self.GetChunkFiles():
+            with numpy.load(filename, allow_pickle=False) as data:
+                yield dict([(name, data[name]) for name in fields])
+
+    # return the number of records, or of those for which where(columns) is True
+    def Count(self, where=None, where_fields=None):
+        return sum([summary.count for summary in
+            self.Aggregate([], where=where, where_fields=where_fields).values()])
+
+    # return a dictionary of Summary objects of the given fields, by a tuple of the values
+    #  of the group_by fields; without group_by, every record is in the group ()
+    # where is an optional function taking a chunk's columns and returning an array of
+    #  True for the records to include; where_fields are the fields it needs
+    def Aggregate(self, fields, group_by=None, where=None, where_fields=None):
+        if group_by is None:
+            group_by = []
+        needed = list(fields) + list(group_by)
+        if where_fields is not None:
+            needed += list(where_fields)
+        elif where is not None:
+            needed = self.fields
+        needed = list(dict.fromkeys(needed))
+        if len(needed) == 0:
+            needed = self.fields[:1]
+
+        summaries = {}
+        for columns in self.Chunks(needed):
+            count = len(columns[needed[0]])
+            if where is None:
+                rows = numpy.arange(count)
+            else:
+                rows = numpy.flatnonzero(where(columns))
+            if len(rows) == 0: continue
+
+            # number each combination of group_by values in this chunk
+            codes = numpy.zeros(len(rows), dtype=numpy.int64)
+            for name in group_by:
+                (values, inverse) = numpy.unique(columns[name][rows], return_inverse=True)
+                codes = codes * len(values) + inverse.reshape(-1)
+            (groups, inverse) = numpy.unique(codes, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            order = numpy.argsort(inverse, kind='stable')
+            bounds = numpy.searchsorted(inverse[order], numpy.arange(len(groups) + 1))
+
+            for g in range(len(groups)):
+                group_rows = rows[order[bounds[g]:bounds[g+1]]]
+                key = tuple([columns[name][group_rows[0]].item() for name in group_by])
+                if key not in summaries:
+                    summaries[key] = Summary(fields)
+                summaries[key].Add(columns, group_rows)
+        return summaries
+
+
+# print summaries of fields by group
+def PrintSummaries(summaries, fields, group_by):
+    for key in sorted(summaries):
+        summary = summaries[key]
+        if len(group_by) > 0:
+            print(', '.join([name + '=' + str(value) for (name, value) in zip(group_by, key)]))
+        print('  {:<16} {:>10}'.format('records', summary.count))
+        for name in fields:
+            print('  {:<16} {:>10.4g} {:>10.4g} {:>10} {:>10}'.format(name,
+                summary.GetMean(name), summary.GetStdDev(name),
+                '{:g}'.format(summary.minimums[name]), '{:g}'.format(summary.maximums[name])))
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description='Summarise an Armoured Commander results directory.')
+    parser.add_argument('directory', help='results directory')
+    parser.add_argument('-k', '--kind', default='encounters', choices=sorted(FIELDS),
+        help='kind of record')
+    parser.add_argument('-g', '--group-by', nargs='*', default=[], help='fields to group by')
+    parser.add_argument('-f', '--fields', nargs='*', default=None,
+        help='fields to summarise (default all number fields)')
+    options = parser.parse_args(args)
+
+    fields = options.fields
+    if fields is None:
+        fields = [name for (name, dtype) in FIELDS[options.kind] if dtype != str and
+            name not in ['seed', 'index']]
+    reader = ResultsReader(options.directory, options.kind)
+    if len(reader.GetChunkFiles()) == 0:
+        print('No ' + options.kind + ' records in ' + options.directory)
+        return 1
+    summaries = reader.Aggregate(fields, options.group_by)
+    print('{:<18} {:>10} {:>10} {:>10} {:>10}'.format('', 'Mean', 'Std Dev', 'Min', 'Max'))
+    PrintSummaries(summaries, fields, options.group_by)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
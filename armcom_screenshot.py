@@ -0,0 +1,191 @@
+# -*- coding: UTF-8 -*-
+
+##########################################################################################
+#                        Screenshot Writer for Armoured Commander                        #
+##########################################################################################
+
+##########################################################################################
+#
+#    Copyright 2015-2017 Gregory Adam Scott (sudasana@gmail.com)
+#
+#    This file is part of Armoured Commander.
+#
+#    Armoured Commander is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Armoured Commander is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+#    You should have received a copy of the GNU General Public License
+#    along with Armoured Commander, in the form of a file named "LICENSE".
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+##########################################################################################
+
+# saves screenshots on a background thread, so that the game never waits for an image to
+# be compressed and written to disk. the game only copies the screen on the main thread,
+# with GrabScreen(), and hands the copy to a ScreenshotWriter, which saves it as a PNG
+# file and, if asked to, as a plain text and an ANSI colour dump of the screen cells.
+# the offscreen console backend has no images, so there only the dumps are saved
+
+import queue                            # for passing screenshots to the writer thread
+import threading                        # for the writer thread
+
+QUEUE_MAX = 64                          # maximum number of screenshots waiting to be saved
+
+
+# Screen Grab Class
+# a copy of the root console: its image, and optionally its cells as lists of rows of
+#  character codes and (r, g, b) foreground and background colours; image is None if
+#  there is only the cells
+class ScreenGrab:
+    def __init__(self, image, chars=None, fore=None, back=None):
+        self.image = image
+        self.chars = chars
+        self.fore = fore
+        self.back = back
+
+
+# copy the root console, including its cells if cells is True; the offscreen backend
+#  has no images, so only its cells are copied
+def GrabScreen(libtcod, cells=False):
+    if hasattr(libtcod, 'console_get_arrays'):
+        return ScreenGrab(None, *GetConsoleCells(libtcod, 0))
+    image = libtcod.image_from_console(0)
+    if not cells:
+        return ScreenGrab(image)
+    (chars, fore, back) = GetConsoleCells(libtcod, 0)
+    return ScreenGrab(image, chars, fore, back)
+
+
+# return the cells of a console as lists of rows of character codes, and of (r, g, b)
+#  foreground and background colours
+def GetConsoleCells(libtcod, con):
+
+    # the offscreen backend can hand over its cell arrays directly
+    if hasattr(libtcod, 'console_get_arrays'):
+        (ch, fg, bg) = libtcod.console_get_arrays(con)
+        return (ch.tolist(), [[tuple(c) for c in row] for row in fg.tolist()],
+            [[tuple(c) for c in row] for row in bg.tolist()])
+
+    w = libtcod.console_get_width(con)
+    h = libtcod.console_get_height(con)
+    chars = []
+    fore = []
+    back = []
+    for y in range(h):
+        chars.append([libtcod.console_get_char(con, x, y) for x in range(w)])
+        fore.append([tuple(libtcod.console_get_char_foreground(con, x, y)) for x in range(w)])
+        back.append([tuple(libtcod.console_get_char_background(con, x, y)) for x in range(w)])
+    return (chars, fore, back)
+
+
+# return the text of a screen grab, one line per row; the game font follows code page 437
+def GetText(grab):
+    lines = []
+    for row in grab.chars:
+        lines.append(''.join([GetCharText(c) for c in row]).rstrip())
+    return '\n'.join(lines) + '\n'
+
+
+# return the text of a screen grab with ANSI 24-bit colour codes
+def GetANSIText(grab):
+    lines = []
+    for (row, fore_row, back_row) in zip(grab.chars, grab.fore, grab.back):
+        line = ''
+        last = None
+        for (c, fore, back) in zip(row, fore_row, back_row):
+            # only add colour codes when the colours change
+            if (fore, back) != last:
+                line += '\x1b[38;2;%d;%d;%dm\x1b[48;2;%d;%d;%dm' % (fore + back)
+                last = (fore, back)
+            line += GetCharText(c)
+        lines.append(line + '\x1b[0m')
+    return '\n'.join(lines) + '\n'
+
+
+# return the unicode character for a character code in the game font
+def GetCharText(c):
+    if c < 32:
+        return ' '
+    if c < 256:
+        return bytes([c]).decode('cp437')
+    return chr(c)
+
+
+# Screenshot Writer Class
+# saves queued screen grabs on a background thread
+class ScreenshotWriter:
+    def __init__(self, libtcod):
+        self.libtcod = libtcod
+        self.queue = queue.Queue(QUEUE_MAX)
+        self.thread = None
+        self.errors = []                # (filename, error) for screenshots that failed
+        self.errors_lock = threading.Lock()
+
+    # queue a screen grab to be saved as filename + '.png', and as filename + '.txt'
+    #  and '.ans' if it includes its cells
+    # returns False if too many screenshots are already waiting to be saved
+    def Save(self, grab, filename):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.Run)
+            self.thread.daemon = True
+            self.thread.start()
+        try:
+            self.queue.put_nowait((grab, filename))
+        except queue.Full:
+            self.DeleteImage(grab)
+            return False
+        return True
+
+    # return the number of screenshots waiting to be saved
+    def GetPending(self):
+        return self.queue.unfinished_tasks
+
+    # return and clear the list of (filename, error) for screenshots that have failed
+    #  since this was last called
+    def GetErrors(self):
+        with self.errors_lock:
+            errors = self.errors
+            self.errors = []
+        return errors
+
+    # wait until all queued screenshots have been saved, and report any that failed
+    #  and have not already been reported
+    def Finish(self):
+        if self.thread is not None:
+            self.queue.join()
+        for (filename, error) in self.GetErrors():
+            print('ERROR: Could not save screenshot ' + filename + ': ' + str(error))
+
+    # run on the writer thread
+    def Run(self):
+        while True:
+            (grab, filename) = self.queue.get()
+            try:
+                self.Write(grab, filename)
+            except Exception as e:
+                with self.errors_lock:
+                    self.errors.append((filename, e))
+            finally:
+                self.DeleteImage(grab)
+                self.queue.task_done()
+
+    def DeleteImage(self, grab):
+        if grab.image is not None:
+            self.libtcod.image_delete(grab.image)
+
+    def Write(self, grab, filename):
+        # libtcod compresses the image as it writes it, picking the format from the
+        #  file extension
+        if grab.image is not None:
+            self.libtcod.image_save(grab.image, filename + '.png')
+        if grab.chars is None: return
+        with open(filename + '.txt', 'w', encoding='utf-8') as f:
+            f.write(GetText(grab))
+        with open(filename + '.ans', 'w', encoding='utf-8') as f:
+            f.write(GetANSIText(grab))
@@ -0,0 +1,1405 @@
+# -*- coding: UTF-8 -*-
+
+##########################################################################################
+#                       Encounter Simulator for Armoured Commander                       #
+##########################################################################################
+
+##########################################################################################
+#
+#    Copyright 2015-2017 Gregory Adam Scott (sudasana@gmail.com)
+#
+#    This file is part of Armoured Commander.
+#
+#    Armoured Commander is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Armoured Commander is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+#    You should have received a copy of the GNU General Public License
+#    along with Armoured Commander, in the form of a file named "LICENSE".
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+##########################################################################################
+
+# plays out encounters without the game interface, for balance testing. there are two
+# ways of doing it, which must give the same results:
+#
+# the reference path, RunEncounter(), plays one encounter at a time with the game's own
+#  PlayerTank, Battle, and EnemyUnit objects, using the game's rules functions where they
+#  have no interface (CalcTH, CalcTK, CalcIFT, GetHitLocation, MoraleTest, PinTest,
+#  SetFacing, SetTerrain) and following the game's code for the rest (DoSpotting,
+#  FireMainGun, ResolveHits, and EnemyUnit.DoAction and the attacks and moves it leads to)
+#
+# the batch path, EncounterBatch, plays many encounters at once in lockstep: the state of
+#  every unit in every encounter is held in NumPy arrays, one row per encounter and one
+#  column per enemy unit, and each rule is applied to all of them at once. the final
+#  rolls required are looked up in tables that are built by calling CalcTH, CalcTK, and
+#  CalcIFT for every combination of inputs that can come up, so the batch path uses the
+#  game's own numbers
+#
+# the encounter is simplified: the player tank stays where it is with its commander's
+#  hatch open, fires one AP or HE shot each round at the first spotted enemy unit, and is
+#  knocked out if its armour is penetrated. enemy units act as in DoAction(), but there
+#  are no panzerfausts, carried infantry, smoke, friendly units acting, or reinforcements,
+#  and light weapons attacks on the player tank are only counted
+#
+# to play a batch of encounters and show the results:
+#   python armcom_sim.py run -n 100000
+# to check that the two paths give the same results:
+#   python armcom_sim.py check
+# to write a record of each encounter to a results directory, see armcom_results.py:
+#   python armcom_sim.py run -n 1000000 -o results
+# to save progress to a checkpoint file as it goes, and carry on from it if the same
+#  command is run again after being stopped:
+#   python armcom_sim.py run -n 100000000 -o results -c run.checkpoint
+
+import argparse                         # for command line options
+import os
+import random                           # for seeding the game's random choices
+import sys
+import time                             # for timing runs
+
+import numpy
+
+# the game draws to libtcod consoles as it is imported; run it with the offscreen console
+#  backend of the bundled libtcod wrapper so that no window or libtcod library is needed
+os.environ.setdefault('LIBTCOD_BACKEND', 'offscreen')
+import libtcodpy_local
+sys.modules.setdefault('libtcodpy', libtcodpy_local)
+
+import armcom                           # the game itself
+from armcom import libtcod
+from armcom import INFANTRY_TERRAIN, VEHICLE_TERRAIN, FACING_ROLLS, ATTACK_INFANTRY_TK, ATTACK_TANK_TK    # the game's own rule tables
+import armcom_results                   # for writing a record of each encounter
+from armcom_vehicle_defs import VEHICLE_TYPES
+from armcom_checkpoint import SaveCheckpoint, LoadCheckpoint, AddRange, GetMissingRanges    # for carrying on stopped runs
+
+MAX_ROUNDS = 10                         # rounds played before an encounter is called off
+BATCH_SIZE = 16384                      # encounters played at once by RunBatches()
+CHECKPOINT_BATCHES = 8                  # batches played between checkpoints
+CHECK_ENCOUNTERS = 2000                 # encounters played on the reference path by check
+CHECK_BATCH_ENCOUNTERS = 20000          # " batch path by check
+CHECK_Z = 4.5                           # largest difference allowed between the two paths,
+                                        #  in standard errors
+
+# enemy units in the default scenario: unit class and unit type
+DEFAULT_ENEMIES = [
+    ('TANK', 'PzKw IV H'), ('SPG', 'STuG III G'), ('AT_GUN', '75L'),
+    ('LW', 'Light Weapons Infantry'), ('MG', 'MG Team'), ('APC', 'SPW 251'),
+    ('AC', 'PSW 232'), ('TRUCK', 'Opel')
+]
+
+INFANTRY_CLASSES = ['LW', 'MG', 'AT_GUN']
+GUN_CLASSES = ['TANK', 'SPG', 'AT_GUN']
+FACINGS = ['Front', 'Side', 'Rear']
+TERRAIN_TYPES = ['Hull Down', 'Woods', 'Building', 'Open', 'Fortification']
+CONCEALING_TERRAIN = ['Woods', 'Building', 'Fortification', 'Hull Down']
+HIT_LOCATIONS = ['Turret', 'Hull']
+
+# phases of an encounter round that are timed for the results
+SIM_PHASES = ['spotting', 'fire', 'enemy']
+
+# game functions that draw, play sounds, or wait for input, which do nothing while an
+#  encounter is played on the reference path
+UI_FUNCTIONS = ['ShowLabel', 'PlaySound', 'Message', 'StartMessageBatch', 'EndMessageBatch',
+    'UpdateMapOverlay', 'RenderEncounter', 'UpdateTankCon', 'DisplayRoll', 'MainGunAnimation',
+    'MGAnimation', 'HitAnimation', 'CrewTalk', 'PopUp', 'WriteJournal']
+
+# measures compared between the two paths by check
+METRICS = ['rounds', 'player_ko', 'destroyed', 'left', 'inf_lost', 'tanks_lost', 'shots',
+    'hits', 'immobilized', 'lw_attacks']
+
+
+# Scenario Class
+# the set-up of an encounter: player tank, enemy units, and conditions
+class Scenario:
+    def __init__(self, tank_type='M4 Turret A', enemies=None, scen_type='Advance',
+        area_type='B', date=(1944, 9, 1), fog=False, precip='None', ground='Dry',
+        max_rounds=MAX_ROUNDS, lead_tank=False):
+        self.tank_type = tank_type          # player tank model
+        self.lead_tank = lead_tank          # player tank leads the column
+        if enemies is None:
+            enemies = DEFAULT_ENEMIES
+        self.enemies = list(enemies)        # (unit class, unit type) of each enemy unit
+        self.scen_type = scen_type          # mission type
+        self.area_type = area_type          # campaign map area type
+        self.date = list(date)              # year, month, date
+        self.fog = fog
+        self.precip = precip
+        self.ground = ground
+        self.max_rounds = max_rounds
+
+
+# Encounter Result Class
+# the outcome of one encounter on the reference path
+class EncounterResult:
+    def __init__(self, unit_count):
+        self.rounds = 0                     # rounds played
+        self.player_ko = False              # player tank knocked out
+        self.destroyed = [False] * unit_count    # each enemy unit destroyed by the player
+        self.left = [False] * unit_count    # " left the area
+        self.inf_lost = 0                   # friendly infantry squads lost
+        self.tanks_lost = 0                 # friendly tanks lost
+        self.shots = 0                      # main gun shots fired by the player
+        self.hits = 0                       # " that hit
+        self.immobilized = False            # player tank immobilized by a track hit
+        self.lw_attacks = 0                 # light weapons attacks on the player tank
+        self.phase_times = dict.fromkeys(SIM_PHASES, 0.0)   # seconds spent in each phase
+
+
+##########################################################################################
+#                                    Reference Path                                      #
+##########################################################################################
+
+# set up the game's campaign, player tank and crew, and battle for a scenario
+def SetupGame(scenario):
+    campaign = armcom.Campaign()
+    campaign.current_date = list(scenario.date)
+    campaign.scen_type = scenario.scen_type
+    campaign.player_nation = 'USA'
+    campaign.animations = False
+    campaign.weather.fog = scenario.fog
+    campaign.weather.precip = scenario.precip
+    campaign.weather.ground = scenario.ground
+    campaign.day_map = armcom.CampaignDayMap()
+    campaign.day_map.player_node = armcom.MapNode(0, 0)
+    campaign.day_map.player_node.node_type = scenario.area_type
+    armcom.campaign = campaign
+
+    tank = armcom.PlayerTank(scenario.tank_type)
+    armcom.tank = tank
+    armcom.SetVehicleStats(tank)
+    tank.lead_tank = scenario.lead_tank
+
+    # crew have no skills, so no skill checks are ever passed, and no orders
+    for position in ['Commander', 'Gunner', 'Loader', 'Driver', 'Asst. Driver']:
+        crewman = armcom.Crewman()
+        crewman.position = position
+        crewman.order = crewman.default_order = 'None'
+        if position in ['Commander', 'Driver']:
+            crewman.hatch = 'Open'
+        tank.crew.append(crewman)
+
+    # only the commander spots, all around from the open hatch
+    commander = tank.crew[0]
+    commander.spot = 'All'
+    commander.SetSpotMask()
+
+    armcom.battle = armcom.Battle()
+
+
+# seed the game's random number generators
+def SeedGame(seed):
+    libtcod.random_restore(0, libtcod.random_save(libtcod.random_new_from_seed(seed)))
+    random.seed(seed)
+
+
+# spawn an enemy unit of a given class and type with the game's SpawnEnemy(); the unit
+#  carries no panzerfaust and no infantry
+def SpawnUnit(unit_class, unit_type):
+    campaign = armcom.campaign
+    battle = armcom.battle
+
+    # SpawnEnemy() takes the type from the encounter or the campaign's activation chances
+    battle.tank_type = battle.spg_type = battle.at_gun_type = None
+    if unit_class == 'TANK':
+        battle.tank_type = unit_type
+    elif unit_class == 'SPG':
+        battle.spg_type = unit_type
+    elif unit_class == 'AT_GUN':
+        battle.at_gun_type = unit_type
+    campaign.class_activations = [[unit_class, (unit_type, 1000)]]
+
+    unit = armcom.SpawnEnemy(unit_class)
+    unit.pf = False
+    unit.full_apc = False
+    return unit
+
+
+# play one encounter of a scenario on the reference path
+def RunEncounter(scenario, seed):
+    functions = StubInterface()
+    try:
+        return PlayEncounter(scenario, seed)
+    finally:
+        RestoreInterface(functions)
+
+
+def PlayEncounter(scenario, seed):
+    SetupGame(scenario)
+    SeedGame(seed)
+    tank = armcom.tank
+    battle = armcom.battle
+
+    units = []
+    for (unit_class, unit_type) in scenario.enemies:
+        units.append(SpawnUnit(unit_class, unit_type))
+    result = EncounterResult(len(units))
+
+    # light weapons attacks on the player tank are only counted, and any penetration
+    #  knocks it out
+    def LWAttack():
+        result.lw_attacks += 1
+    def Penetrate(hit_location, sector, gun_type, critical=False):
+        result.player_ko = True
+    tank.LWAttack = LWAttack
+    tank.Penetrate = Penetrate
+
+    times = result.phase_times
+    for battle.rounds_passed in range(1, scenario.max_rounds+1):
+        result.rounds = battle.rounds_passed
+        tank.Reset()
+        for unit in units:
+            unit.Reset()
+
+        start_time = time.perf_counter()
+        armcom.DoSpotting()
+        spotting_time = time.perf_counter()
+        FireMainGun(result)
+        fire_time = time.perf_counter()
+        times['spotting'] += spotting_time - start_time
+        times['fire'] += fire_time - spotting_time
+        if not AnyAlive(units): break
+
+        for unit in units:
+            if not unit.alive: continue
+            unit.DoAction()
+            # the only way a unit's own action takes it out is by leaving the area
+            if not unit.alive:
+                result.left[unit.spawn_num] = True
+            if result.player_ko: break
+        times['enemy'] += time.perf_counter() - fire_time
+        if result.player_ko or not AnyAlive(units): break
+
+    for n, unit in enumerate(units):
+        if not unit.alive and not result.left[n]:
+            result.destroyed[n] = True
+    result.inf_lost = battle.inf_lost
+    result.tanks_lost = battle.tanks_lost
+    result.immobilized = tank.immobilized
+    return result
+
+
+def AnyAlive(units):
+    for unit in units:
+        if unit.alive: return True
+    return False
+
+
+# replace the game's interface functions with ones that do nothing, returning the
+#  originals so that they can be put back
+def StubInterface():
+    functions = {}
+    for name in UI_FUNCTIONS:
+        functions[name] = getattr(armcom, name)
+        setattr(armcom, name, DoNothing)
+    return functions
+
+
+def RestoreInterface(functions):
+    for (name, function) in functions.items():
+        setattr(armcom, name, function)
+
+
+def DoNothing(*args, **kwargs):
+    return None
+
+
+# pick the first spotted enemy unit as the target, turn the turret to it, load an AP or
+#  HE shell, and fire with the game's FireMainGun(); then resolve any hit
+def FireMainGun(result):
+    tank = armcom.tank
+    battle = armcom.battle
+    if 'Main Gun Malfunction' in tank.damage_list: return
+
+    battle.target = None
+    for unit in battle.enemy_units:
+        if unit.alive and unit.spotted:
+            battle.target = unit
+            break
+    if battle.target is None: return
+
+    tank.turret_facing = battle.target.map_hex.sector
+    if battle.target.unit_class in INFANTRY_CLASSES:
+        tank.ammo_load = 'HE'
+    else:
+        tank.ammo_load = 'AP'
+    armcom.FireMainGun()
+    result.shots += 1
+    result.hits += len(battle.target.hit_record)
+    battle.target.ResolveHits()
+
+##########################################################################################
+#                                      Batch Path                                        #
+##########################################################################################
+
+# Rule Tables Class
+# the rules for the units of a scenario as arrays indexed by unit number, built from the
+#  game's own rules functions
+class RuleTables:
+    def __init__(self, scenario):
+        SetupGame(scenario)
+        campaign = armcom.campaign
+        tank = armcom.tank
+        battle = armcom.battle
+        unit_count = len(scenario.enemies)
+
+        self.scen_type = scenario.scen_type
+        self.max_rounds = scenario.max_rounds
+        self.weather_blocks = scenario.fog or scenario.precip == 'Snow'
+        self.mud = scenario.ground in ['Mud', 'Deep Snow']
+        self.firefly = tank.stats['vehicle_type'] == 'Sherman VC'
+        self.lead_tank = scenario.lead_tank
+
+        # map hexes, in the order of battle.maphexes
+        hexes = [map_hex for map_hex in battle.maphexes if map_hex.rng >= 0]
+        self.hex_rng = numpy.array([map_hex.rng for map_hex in hexes], dtype=numpy.int8)
+        self.hex_sector = numpy.array([map_hex.sector for map_hex in hexes], dtype=numpy.int8)
+
+        # spawn hexes by range and sector, and move destinations by hex and move type
+        self.spawn_hexes = numpy.zeros((3, 6, len(hexes)), dtype=numpy.int16)
+        self.spawn_count = numpy.zeros((3, 6), dtype=numpy.int16)
+        for n, map_hex in enumerate(hexes):
+            (rng, sector) = (map_hex.rng, map_hex.sector)
+            self.spawn_hexes[rng, sector, self.spawn_count[rng, sector]] = n
+            self.spawn_count[rng, sector] += 1
+        self.move_hexes = numpy.zeros((len(hexes), 3, len(hexes)), dtype=numpy.int16)
+        self.move_count = numpy.zeros((len(hexes), 3), dtype=numpy.int16)
+        for n, map_hex in enumerate(hexes):
+            for dist in [-1, 0, 1]:
+                move_hexes = [hexes.index(h) for h in GetMoveHexes(map_hex, dist)]
+                self.move_count[n, dist+1] = len(move_hexes)
+                self.move_hexes[n, dist+1, :len(move_hexes)] = move_hexes
+
+        self.sector_distance = numpy.array([[armcom.GetSectorDistance(a, b) for b in range(6)]
+            for a in range(6)], dtype=numpy.int8)
+
+        # spawn range by modified D10 roll, from -5 to 13
+        self.spawn_range = numpy.zeros((unit_count, 19), dtype=numpy.int8)
+        self.spawn_range_modifier = GetSpawnRangeModifier()
+
+        # facing by D10 roll, and whether the unit has a facing at all
+        self.facing_roll = numpy.zeros((unit_count, 11), dtype=numpy.int8)
+        self.has_facing = numpy.zeros(unit_count, dtype=bool)
+
+        # terrain and moving flag by D10 roll
+        self.terrain_roll = numpy.zeros((unit_count, 11), dtype=numpy.int8)
+        self.moving_roll = numpy.zeros((unit_count, 11), dtype=bool)
+
+        self.infantry = numpy.zeros(unit_count, dtype=bool)
+        self.gun = numpy.zeros(unit_count, dtype=bool)
+        self.at_gun = numpy.zeros(unit_count, dtype=bool)
+        self.turns = numpy.zeros(unit_count, dtype=bool)      # turns to face before attacking
+        self.size_modifier = numpy.zeros(unit_count, dtype=numpy.int8)
+        self.morale_bonus = numpy.zeros(unit_count, dtype=numpy.int8)
+        self.action_ranges = numpy.zeros((unit_count, 7), dtype=numpy.int16)
+        self.infantry_tk = numpy.zeros((unit_count, 3), dtype=numpy.int16)
+        self.tank_tk = numpy.zeros((unit_count, 3), dtype=numpy.int16)
+        self.tank_tk_known = numpy.zeros(unit_count, dtype=bool)
+
+        # final rolls required
+        # player to-hit: unit, range, acquired level, moving, terrain, turret rotation
+        self.player_th = numpy.zeros((unit_count, 3, 3, 2, len(TERRAIN_TYPES), 4),
+            dtype=numpy.int8)
+        # player to-kill: unit, range, facing, hit location, critical, terrain, moving
+        self.player_tk = numpy.zeros((unit_count, 3, 3, 2, 2, len(TERRAIN_TYPES), 2),
+            dtype=numpy.int8)
+        # enemy to-hit: unit, range, acquired level, facing
+        self.enemy_th = numpy.zeros((unit_count, 3, 3, 3), dtype=numpy.int8)
+        # enemy to-kill: unit, range, player tank facing, hit location
+        self.enemy_tk = numpy.zeros((unit_count, 3, 3, 2), dtype=numpy.int8)
+
+        rng_hexes = {}
+        for map_hex in hexes:
+            rng_hexes.setdefault(map_hex.rng, map_hex)
+
+        for u, (unit_class, unit_type) in enumerate(scenario.enemies):
+            unit = armcom.EnemyUnit()
+            unit.unit_class = unit_class
+            unit.unit_type = unit_type
+            unit.spotting_player = False
+            if unit_class == 'AT_GUN':
+                unit.stats = {'main_gun' : unit_type}
+            elif unit_class not in INFANTRY_CLASSES:
+                armcom.SetVehicleStats(unit)
+
+            self.infantry[u] = unit_class in INFANTRY_CLASSES
+            self.gun[u] = unit_class in GUN_CLASSES
+            self.at_gun[u] = unit_class == 'AT_GUN'
+            self.turns[u] = unit_class not in ['LW', 'MG']
+            if not self.infantry[u]:
+                self.size_modifier[u] = GetSizeModifier(unit.stats['target_size'])
+            if unit_type in ['PzKw V G', 'PzKw VI E', 'PzKw VI B']:
+                self.morale_bonus[u] = 1
+            self.action_ranges[u] = armcom.ENEMY_ACTION_TABLE[(unit_class, scenario.scen_type, False)]
+            self.infantry_tk[u] = ATTACK_INFANTRY_TK[unit_class]
+            if self.gun[u] and unit.stats['main_gun'] in ATTACK_TANK_TK:
+                self.tank_tk[u] = ATTACK_TANK_TK[unit.stats['main_gun']]
+                self.tank_tk_known[u] = True
+
+            for result in range(-5, 14):
+                self.spawn_range[u, result+5] = GetSpawnRange(unit_class, result)
+
+            if unit_class in FACING_ROLLS:
+                self.has_facing[u] = True
+                (front, side) = FACING_ROLLS[unit_class]
+                for result in range(1, 11):
+                    if result <= front:
+                        self.facing_roll[u, result] = 0
+                    elif result <= side:
+                        self.facing_roll[u, result] = 1
+                    else:
+                        self.facing_roll[u, result] = 2
+
+            for result in range(1, 11):
+                (terrain, moving) = GetTerrain(unit_class, result, scenario)
+                self.terrain_roll[u, result] = TERRAIN_TYPES.index(terrain)
+                self.moving_roll[u, result] = moving
+
+            # player attacks
+            ammo_type = 'HE' if self.infantry[u] else 'AP'
+            for rng in range(3):
+                unit.map_hex = rng_hexes[rng]
+                for t, terrain in enumerate(TERRAIN_TYPES):
+                    unit.terrain = terrain
+                    for moving in range(2):
+                        unit.moving = bool(moving)
+                        for acquired in range(3):
+                            unit.acquired = acquired
+                            for rotation in range(4):
+                                tank.old_t_facing = 4
+                                tank.turret_facing = [4, 5, 0, 1][rotation]
+                                (base_th, roll_req, drm) = armcom.CalcTH(tank, unit, False,
+                                    ammo_type, preview=True)
+                                self.player_th[u, rng, acquired, moving, t, rotation] = ClipRoll(roll_req)
+                        for f, facing in enumerate(FACINGS):
+                            for l, hit_location in enumerate(HIT_LOCATIONS):
+                                for critical in range(2):
+                                    if self.infantry[u]:
+                                        (base_tk, roll_req, drm) = armcom.CalcIFT(tank, unit,
+                                            tank.stats['main_gun'], bool(critical), False,
+                                            preview=True)
+                                    else:
+                                        (base_tk, roll_req, drm) = armcom.CalcTK(tank, unit,
+                                            facing, ammo_type, bool(critical), False, hit_location)
+                                    self.player_tk[u, rng, f, l, critical, t, moving] = ClipRoll(roll_req)
+            unit.terrain = 'Open'
+            unit.moving = False
+            unit.acquired = 0
+            tank.turret_facing = tank.old_t_facing = 4
+
+            # enemy attacks on the player
+            if not self.gun[u]: continue
+            for rng in range(3):
+                unit.map_hex = rng_hexes[rng]
+                for acquired in range(3):
+                    unit.acquired_player = acquired
+                    for f, facing in enumerate(FACINGS):
+                        unit.facing = facing
+                        (base_th, roll_req, drm) = armcom.CalcTH(unit, tank, False, 'AP',
+                            preview=True)
+                        self.enemy_th[u, rng, acquired, f] = ClipRoll(roll_req)
+                for f, facing in enumerate(FACINGS):
+                    for l, hit_location in enumerate(HIT_LOCATIONS):
+                        (base_tk, roll_req, drm) = armcom.CalcTK(unit, tank, facing, 'AP',
+                            False, False, hit_location)
+                        self.enemy_tk[u, rng, f, l] = ClipRoll(roll_req)
+
+
+# return the modifier to the spawn range roll for the area and player tank, as in
+#  SpawnEnemy()
+def GetSpawnRangeModifier():
+    modifier = 0
+    node_type = armcom.campaign.day_map.player_node.node_type
+    if node_type == 'C':
+        modifier -= 3
+    elif node_type == 'D':
+        modifier -= 2
+    elif node_type == 'F':
+        modifier -= 5
+    if armcom.tank.stats['vehicle_type'] == 'Sherman VC':
+        modifier += 3
+    return modifier
+
+
+# return the spawn range for a unit class from a modified D10 roll, as in SpawnEnemy();
+#  AT Guns use the default table there too
+def GetSpawnRange(unit_class, result):
+    if unit_class == 'LW':
+        if result <= 6: return 0
+        return 1
+    elif unit_class == 'MG':
+        if result <= 3: return 0
+        elif result <= 8: return 1
+        return 2
+    elif unit_class == 'SPG':
+        if result <= 2: return 0
+        elif result <= 6: return 1
+        return 2
+    if result <= 3: return 0
+    elif result <= 7: return 1
+    return 2
+
+
+# spotting modifier for a vehicle's target size, as in DoSpotting()
+def GetSizeModifier(target_size):
+    if target_size == 'Small':
+        return 1
+    elif target_size == 'Large':
+        return -1
+    elif target_size == 'Very Large':
+        return -2
+    return 0
+
+
+# return the hexes a unit can move to from a hex: closer if dist is -1, further away if
+#  it is 1, or around the player if it is 0; as in EnemyUnit.DistMove() and LateralMove()
+def GetMoveHexes(from_hex, dist):
+    move_hexes = []
+    for map_hex in armcom.battle.maphexes:
+        if from_hex.rng == 0 and dist == -1:
+            if from_hex.rng == map_hex.rng and not armcom.IsAdjacent(from_hex, map_hex) and from_hex != map_hex:
+                move_hexes.append(map_hex)
+        elif from_hex.rng + dist == map_hex.rng and armcom.IsAdjacent(from_hex, map_hex):
+            move_hexes.append(map_hex)
+    return move_hexes
+
+
+# keep a final roll required within the range of the table arrays; anything under 0 or
+#  over 13 has the same effect as 0 or 13
+def ClipRoll(roll_req):
+    return max(0, min(13, roll_req))
+
+
+# return the terrain and moving flag for a unit class from a D10 roll, as in
+#  EnemyUnit.SetTerrain()
+def GetTerrain(unit_class, result, scenario):
+    if scenario.scen_type == 'Counterattack':
+        result = min(result + 2, 10)
+    moving = False
+    if unit_class in INFANTRY_CLASSES:
+        table = INFANTRY_TERRAIN[scenario.area_type]
+    else:
+        table = VEHICLE_TERRAIN[scenario.area_type]
+    for n, value in enumerate(table):
+        if result <= value:
+            terrain = TERRAIN_TYPES[n]
+            break
+    if unit_class in INFANTRY_CLASSES:
+        if scenario.scen_type == 'Battle' and scenario.area_type in ['B', 'D']:
+            if n == 2:
+                terrain = 'Fortification'
+        elif unit_class == 'LW' and result == 10:
+            moving = True
+    elif 9 <= result <= 10:
+        moving = True
+    return (terrain, moving)
+
+
+# Encounter Batch Class
+# plays a batch of encounters of one scenario in lockstep; rows of the state arrays are
+#  encounters, columns are enemy units in spawn order
+class EncounterBatch:
+    def __init__(self, scenario, size, seed=None, tables=None):
+        if tables is None:
+            tables = RuleTables(scenario)
+        self.tables = tables
+        self.size = size
+        self.unit_count = len(scenario.enemies)
+        self.random = numpy.random.default_rng(seed)
+        shape = (size, self.unit_count)
+
+        # enemy units
+        self.hex = numpy.zeros(shape, dtype=numpy.int16)
+        self.facing = numpy.zeros(shape, dtype=numpy.int8)
+        self.terrain = numpy.zeros(shape, dtype=numpy.int8)
+        self.morale = numpy.zeros(shape, dtype=numpy.int8)
+        self.acquired = numpy.zeros(shape, dtype=numpy.int8)
+        self.acquired_player = numpy.zeros(shape, dtype=numpy.int8)
+        self.moving = numpy.zeros(shape, dtype=bool)
+        self.pinned = numpy.zeros(shape, dtype=bool)
+        self.stunned = numpy.zeros(shape, dtype=bool)
+        self.spotted = numpy.zeros(shape, dtype=bool)
+        self.identified = numpy.zeros(shape, dtype=bool)
+        self.hidden = numpy.zeros(shape, dtype=bool)
+        self.spotted_lr = numpy.zeros(shape, dtype=bool)
+        self.fired = numpy.zeros(shape, dtype=bool)
+        self.shot_at = numpy.zeros(shape, dtype=bool)
+        self.immobile = numpy.zeros(shape, dtype=bool)
+        self.alive = numpy.ones(shape, dtype=bool)
+        self.destroyed = numpy.zeros(shape, dtype=bool)
+        self.left = numpy.zeros(shape, dtype=bool)
+
+        # player tank and encounter
+        self.turret_facing = numpy.full(size, 4, dtype=numpy.int8)
+        self.gun_ok = numpy.ones(size, dtype=bool)
+        self.player_ko = numpy.zeros(size, dtype=bool)
+        self.immobilized = numpy.zeros(size, dtype=bool)
+        self.done = numpy.zeros(size, dtype=bool)
+        self.rounds = numpy.zeros(size, dtype=numpy.int16)
+        self.inf_lost = numpy.zeros(size, dtype=numpy.int16)
+        self.tanks_lost = numpy.zeros(size, dtype=numpy.int16)
+        self.shots = numpy.zeros(size, dtype=numpy.int16)
+        self.hits = numpy.zeros(size, dtype=numpy.int16)
+        self.lw_attacks = numpy.zeros(size, dtype=numpy.int16)
+        self.phase_times = dict.fromkeys(SIM_PHASES, 0.0)   # seconds spent in each phase,
+                                            #  by the whole batch
+
+        self.Spawn()
+
+    ##### Dice #####
+
+    def Roll(self, n, sides):
+        return self.random.integers(1, sides+1, size=n)
+
+    def Roll2D6(self, n):
+        return self.Roll(n, 6) + self.Roll(n, 6)
+
+    # return a random index below each count
+    def Choose(self, counts):
+        return (self.random.random(len(counts)) * counts).astype(numpy.int16)
+
+    ##### Set-up #####
+
+    def Spawn(self):
+        t = self.tables
+        (size, unit_count) = self.hex.shape
+        for u in range(unit_count):
+            b = numpy.arange(size)
+            morale = GetMorale(self.Roll2D6(size))
+            self.morale[:,u] = morale + t.morale_bonus[u] * (morale < 10)
+
+            roll = self.Roll2D6(size)
+            if t.scen_type == 'Counterattack':
+                roll += 1
+            sector = numpy.full(size, 1, dtype=numpy.int8)
+            sector[roll <= 11] = numpy.where(self.Roll(size, 2) == 1, 2, 0)[roll <= 11]
+            sector[roll <= 9] = numpy.where(self.Roll(size, 2) == 1, 3, 5)[roll <= 9]
+            sector[roll <= 6] = 4
+            rng = t.spawn_range[u, self.Roll(size, 10) + t.spawn_range_modifier + 5]
+            choice = self.Choose(t.spawn_count[rng, sector])
+            self.hex[:,u] = t.spawn_hexes[rng, sector, choice]
+
+            self.SetFacing(b, u)
+            self.SetTerrain(b, u)
+
+    def SetFacing(self, b, u):
+        t = self.tables
+        u = numpy.broadcast_to(u, b.shape)
+        roll = self.Roll(len(b), 10)
+        has = t.has_facing[u]
+        self.facing[b[has], u[has]] = t.facing_roll[u[has], roll[has]]
+
+    def SetTerrain(self, b, u):
+        t = self.tables
+        u = numpy.broadcast_to(u, b.shape)
+        roll = self.Roll(len(b), 10)
+        self.terrain[b, u] = t.terrain_roll[u, roll]
+        self.moving[b, u] |= t.moving_roll[u, roll]
+
+    ##### Playing #####
+
+    # play until every encounter is over
+    def Run(self):
+        t = self.tables
+        times = self.phase_times
+        for round_number in range(1, t.max_rounds+1):
+            active = ~self.done
+            if not active.any(): break
+            self.rounds[active] = round_number
+            self.shot_at[active] = False
+
+            start_time = time.perf_counter()
+            self.DoSpotting(active)
+            spotting_time = time.perf_counter()
+            self.FireMainGun(active)
+            fire_time = time.perf_counter()
+            times['spotting'] += spotting_time - start_time
+            times['fire'] += fire_time - spotting_time
+            self.done |= ~self.alive.any(axis=1)
+
+            for u in range(self.unit_count):
+                b = numpy.flatnonzero(self.alive[:,u] & ~self.done)
+                if len(b) == 0: continue
+                self.DoAction(b, u)
+                self.done |= self.player_ko
+            self.done |= ~self.alive.any(axis=1)
+            times['enemy'] += time.perf_counter() - fire_time
+        self.destroyed = ~self.alive & ~self.left
+        return self
+
+    def GetRange(self, b, u):
+        return self.tables.hex_rng[self.hex[b, u]]
+
+    def WeatherBlocks(self, b, u):
+        if not self.tables.weather_blocks:
+            return numpy.zeros(len(b), dtype=bool)
+        return self.GetRange(b, u) > 0
+
+    def DoSpotting(self, active):
+        t = self.tables
+        rng = t.hex_rng[self.hex]
+        needs = ~self.spotted | (t.gun[None,:] & ~self.identified)
+        candidate = active[:,None] & self.alive & ~self.hidden & needs
+        if t.weather_blocks:
+            candidate &= rng == 0
+
+        roll = self.Roll2D6(self.hex.shape).reshape(self.hex.shape)
+        mod_roll = roll.copy()
+        concealed = numpy.isin(self.terrain, [TERRAIN_TYPES.index(terrain) for terrain in
+            CONCEALING_TERRAIN])
+        mod_roll += 2 * concealed
+        mod_roll += t.size_modifier[None,:]
+        mod_roll -= numpy.where(rng == 0, 2, numpy.where(rng == 1, 1, 0))
+        mod_roll -= 2 * self.fired
+        mod_roll -= 2 * self.moving
+        mod_roll -= self.spotted_lr
+
+        hide_result = (roll == 12) | (mod_roll >= 12)
+        identify_result = ~hide_result & ((roll == 2) | (mod_roll <= 4))
+        spot_result = ~hide_result & ~identify_result & (mod_roll <= 8)
+
+        self.hidden |= candidate & hide_result & ~self.spotted
+        self.spotted |= candidate & (identify_result | spot_result)
+        self.identified |= candidate & identify_result & t.gun[None,:]
+        self.spotted_lr[active] = (candidate & spot_result)[active]
+        self.fired[active] = False
+
+    def FireMainGun(self, active):
+        t = self.tables
+        targets = self.alive & self.spotted
+        b = numpy.flatnonzero(active & self.gun_ok & targets.any(axis=1))
+        if len(b) == 0: return
+        u = numpy.argmax(targets[b], axis=1)
+
+        sector = t.hex_sector[self.hex[b, u]]
+        rotation = t.sector_distance[sector, self.turret_facing[b]]
+        self.turret_facing[b] = sector
+        acquired = self.acquired[b, u]
+        self.acquired[b] = 0
+        roll_req = t.player_th[u, self.GetRange(b, u), acquired, self.moving[b, u].astype(int),
+            self.terrain[b, u], rotation]
+        self.acquired[b, u] = numpy.minimum(acquired + 1, 2)
+        self.shot_at[b, u] = True
+        self.shots[b] += 1
+
+        roll = self.Roll2D6(len(b))
+        critical = (roll_req >= 2) & (roll == 2)
+        malfunction = ~critical & (roll == 12)
+        hit = critical | (~malfunction & (roll <= roll_req))
+        self.gun_ok[b[malfunction]] = False
+        self.hits[b[hit]] += 1
+        self.ResolveHit(b[hit], u[hit], critical[hit])
+
+    def ResolveHit(self, b, u, critical):
+        t = self.tables
+        vehicle = ~t.infantry[u]
+        location = numpy.zeros(len(b), dtype=numpy.int8)
+        resolve = numpy.ones(len(b), dtype=bool)
+
+        # hit location on vehicles
+        roll = self.Roll(len(b), 10)
+        hull_down = self.terrain[b, u] == TERRAIN_TYPES.index('Hull Down')
+        miss = vehicle & hull_down & (roll > 5)
+        track = vehicle & ~hull_down & (roll == 10)
+        location[vehicle & ~hull_down & (roll > 4)] = 1
+        self.immobile[b[track], u[track]] = True
+        self.moving[b[track], u[track]] = False
+        resolve &= ~miss & ~track
+        (b, u, critical, vehicle, location) = (b[resolve], u[resolve], critical[resolve],
+            vehicle[resolve], location[resolve])
+
+        roll_req = t.player_tk[u, self.GetRange(b, u), self.facing[b, u], location,
+            critical.astype(int), self.terrain[b, u], self.moving[b, u].astype(int)].astype(int)
+        roll = self.Roll2D6(len(b))
+        no_effect = roll_req <= 2
+        kill = ~no_effect & ((roll_req > 12) | (roll < roll_req))
+        effect = ~no_effect & ~kill & ((roll == roll_req) | (~vehicle & (roll == roll_req + 1)))
+        unharmed = ~no_effect & ~kill & ~effect
+
+        self.Destroy(b[kill], u[kill])
+
+        # pin infantry, stun vehicles; a stunned vehicle stunned again may be abandoned
+        pin = effect & ~vehicle
+        self.PinTest(b[pin], u[pin], auto=True)
+        stun = effect & vehicle
+        (bs, us) = (b[stun], u[stun])
+        again = self.stunned[bs, us]
+        abandoned = numpy.zeros(len(bs), dtype=bool)
+        abandoned[again] = ~self.MoraleTest(bs[again], us[again], break_test=True)
+        self.Destroy(bs[abandoned], us[abandoned])
+        self.stunned[bs[~again], us[~again]] = True
+        self.moving[bs[~again], us[~again]] = False
+
+        pin = unharmed & ~vehicle
+        self.PinTest(b[pin], u[pin], modifier=(roll - roll_req)[pin])
+
+    def Destroy(self, b, u):
+        self.alive[b, u] = False
+
+    # as in EnemyUnit.MoraleTest()
+    def MoraleTest(self, b, u, modifier=0, break_test=False):
+        t = self.tables
+        u = numpy.broadcast_to(u, b.shape)
+        roll = self.Roll2D6(len(b))
+        if break_test:
+            terrain = self.terrain[b, u]
+            fortification = terrain == TERRAIN_TYPES.index('Fortification')
+            roll -= numpy.where(t.at_gun[u] & ~fortification, 2,
+                numpy.where(terrain == TERRAIN_TYPES.index('Woods'), 1,
+                numpy.where(terrain == TERRAIN_TYPES.index('Building'), 2,
+                numpy.where(fortification, 3, 0))))
+        return (roll != 12) & (roll <= self.morale[b, u] + modifier)
+
+    # as in EnemyUnit.PinTest()
+    def PinTest(self, b, u, auto=False, modifier=0):
+        u = numpy.broadcast_to(u, b.shape)
+        passed = self.MoraleTest(b, u, modifier)
+        if not auto:
+            (b, u) = (b[~passed], u[~passed])
+        already = self.pinned[b, u]
+        broken = numpy.zeros(len(b), dtype=bool)
+        broken[already] = ~self.MoraleTest(b[already], u[already], break_test=True)
+        self.Destroy(b[broken], u[broken])
+        self.pinned[b, u] = True
+        self.moving[b, u] = False
+
+    # as in EnemyUnit.DoAction(), for one unit in each of a set of encounters
+    def DoAction(self, b, u):
+        t = self.tables
+
+        # pinned or stunned units can only try to recover
+        for flag in [self.pinned, self.stunned]:
+            waiting = flag[b, u]
+            bw = b[waiting]
+            recovered = bw[self.MoraleTest(bw, u)]
+            flag[recovered, u] = False
+            self.morale[recovered, u] -= (self.morale[recovered, u] > 2).astype(numpy.int8)
+            b = b[~waiting]
+
+        ranges = t.action_ranges[u]
+        for i in range(300):
+            if len(b) == 0: break
+            roll = self.Roll(len(b), 100)
+            over = roll[:,None] <= ranges[None,:]
+            result = numpy.where(over.any(axis=1), numpy.argmax(over, axis=1), 7)
+            done = numpy.zeros(len(b), dtype=bool)
+            for action in range(8):
+                selected = result == action
+                if not selected.any(): continue
+                done[selected] = self.DoActionResult(b[selected], u, action)
+            b = b[~done]
+
+    # carry out an action result, returning which units managed to do it
+    def DoActionResult(self, b, u, action):
+        t = self.tables
+        if action == 0:
+            self.moving[b, u] = False
+            return numpy.ones(len(b), dtype=bool)
+        elif action == 1:
+            return self.DistMove(b, u, -1)
+        elif action == 2:
+            return self.DistMove(b, u, 0)
+        elif action == 3:
+            return self.DistMove(b, u, 1)
+        elif action == 4:
+            return self.AttackInfantry(b, u)
+        elif action == 5:
+            done = numpy.zeros(len(b), dtype=bool)
+            shot_at = self.shot_at[b, u]
+            front = self.facing[b, u] == 0
+            selected = shot_at & front
+            done[selected] = self.AttackPlayer(b[selected], u)
+            selected = shot_at & ~front
+            done[selected] = self.DistMove(b[selected], u, 1)
+            done[~done] = self.AttackTank(b[~done], u)
+            return done
+        elif action == 6:
+            return self.AttackPlayer(b, u)
+        done = numpy.zeros(len(b), dtype=bool)
+        if t.firefly:
+            selected = self.Roll(len(b), 6) <= 2
+            done[selected] = self.AttackPlayer(b[selected], u)
+        if t.lead_tank:
+            done[~done] = self.AttackPlayer(b[~done], u)
+        else:
+            done[~done] = self.AttackTank(b[~done], u)
+        return done
+
+    # of the units able to attack, those that turn to face the player instead, and those
+    #  that need to turn but cannot; as at the start of each enemy attack
+    def TurnToFace(self, b, u, able):
+        if not self.tables.turns[u]:
+            none = numpy.zeros(len(b), dtype=bool)
+            return (none, none)
+        needs_turn = able & (self.facing[b, u] != 0)
+        stuck = needs_turn & self.immobile[b, u]
+        turned = needs_turn & ~stuck
+        self.facing[b[turned], u] = 0
+        return (turned, stuck)
+
+    def AttackPlayer(self, b, u):
+        t = self.tables
+        done = numpy.zeros(len(b), dtype=bool)
+        able = ~self.hidden[b, u] & ~self.WeatherBlocks(b, u)
+        (turned, stuck) = self.TurnToFace(b, u, able)
+        done |= turned
+        attack = able & ~turned & ~stuck
+
+        ba = b[attack]
+        self.moving[ba, u] = False
+        self.fired[ba, u] = True
+        if not t.gun[u]:
+            self.lw_attacks[ba] += 1
+            done |= attack
+            return done
+
+        rng = self.GetRange(ba, u)
+        acquired = self.acquired_player[ba, u]
+        roll_req = t.enemy_th[u, rng, acquired, self.facing[ba, u]]
+        self.acquired_player[ba, u] = numpy.minimum(acquired + 1, 2)
+        if t.at_gun[u]:
+            self.facing[ba, u] = 0
+        roll = self.Roll2D6(len(ba))
+        hit = (roll_req >= 2) & (roll <= roll_req)
+
+        # hit location on the player tank, which is never hull down
+        roll = self.Roll(len(ba), 10)
+        track = hit & (roll == 10)
+        self.immobilized[ba[track]] = True
+        hit &= ~track
+        location = (roll > 4).astype(numpy.int8)
+
+        sector = t.hex_sector[self.hex[ba, u]]
+        turret_facing = self.turret_facing[ba]
+        facing = numpy.where(sector == turret_facing, 0,
+            numpy.where(t.sector_distance[sector, turret_facing] == 3, 2, 1))
+        hull_facing = numpy.where(sector == 4, 0, numpy.where(sector == 1, 2, 1))
+        facing = numpy.where(location == 0, facing, hull_facing)
+        roll_req = t.enemy_tk[u, rng, facing, location]
+        no_chance = hit & (roll_req < 2)
+        roll = self.Roll2D6(len(ba))
+        penetrated = hit & ~no_chance & (roll < roll_req)
+        self.player_ko[ba[penetrated]] = True
+
+        done[attack] = ~no_chance
+        return done
+
+    def AttackInfantry(self, b, u):
+        t = self.tables
+        done = numpy.zeros(len(b), dtype=bool)
+        able = ~self.hidden[b, u] & ~self.WeatherBlocks(b, u)
+        (turned, stuck) = self.TurnToFace(b, u, able)
+        done |= turned
+        attack = able & ~turned & ~stuck
+
+        ba = b[attack]
+        self.moving[ba, u] = False
+        self.acquired_player[ba, u] = 0
+        self.fired[ba, u] = True
+        roll = self.Roll(len(ba), 100)
+        automatic = roll <= 3
+        kill = automatic | (roll <= t.infantry_tk[u, self.GetRange(ba, u)])
+        self.inf_lost[ba[kill]] += 1
+        done[attack] = ~automatic
+        return done
+
+    def AttackTank(self, b, u):
+        t = self.tables
+        done = numpy.zeros(len(b), dtype=bool)
+        if not t.gun[u]: return done
+        able = ~self.hidden[b, u] & ~self.WeatherBlocks(b, u)
+        (turned, stuck) = self.TurnToFace(b, u, able)
+        done |= turned
+        attack = able & ~turned & ~stuck
+
+        ba = b[attack]
+        self.moving[ba, u] = False
+        self.acquired_player[ba, u] = 0
+        self.fired[ba, u] = True
+        if not t.tank_tk_known[u]: return done
+        roll = self.Roll(len(ba), 100)
+        kill = roll <= t.tank_tk[u, self.GetRange(ba, u)]
+        self.tanks_lost[ba[kill]] += 1
+        done |= attack
+        return done
+
+    # move closer if dist is -1, further away if it is 1, or around the player if it is 0
+    def DistMove(self, b, u, dist):
+        t = self.tables
+        done = numpy.zeros(len(b), dtype=bool)
+        able = ~self.immobile[b, u]
+        if t.mud:
+            able &= self.Roll(len(b), 6) > 3
+
+        # moving off the map
+        leaving = able & (self.GetRange(b, u) + dist == 3)
+        left = leaving & (self.Roll(len(b), 6) > 3)
+        self.alive[b[left], u] = False
+        self.left[b[left], u] = True
+        done |= left
+
+        moving = able & ~leaving
+        bm = b[moving]
+        counts = t.move_count[self.hex[bm, u], dist+1]
+        can_move = counts > 0
+        bm = bm[can_move]
+        choice = self.Choose(counts[can_move])
+        self.hex[bm, u] = t.move_hexes[self.hex[bm, u], dist+1, choice]
+        self.MoveEffects(bm, u)
+        moved = numpy.zeros(len(moving), dtype=bool)
+        moved[numpy.flatnonzero(moving)[can_move]] = True
+        return done | moved
+
+    def MoveEffects(self, b, u):
+        self.moving[b, u] = True
+        self.spotted[b, u] = False
+        self.hidden[b, u] = False
+        self.acquired[b, u] = 0
+        self.acquired_player[b, u] = 0
+        self.SetFacing(b, u)
+        self.SetTerrain(b, u)
+
+
+# return morale levels for 2D6 rolls, as in EnemyUnit.SetMorale()
+def GetMorale(roll):
+    return numpy.where(roll <= 3, 10, numpy.where(roll <= 5, 9, numpy.where(roll <= 8, 8, 7)))
+
+
+# play encounters of a scenario on the batch path, in batches of at most batch_size;
+#  returns a list of the finished EncounterBatch objects, or if sink is a ResultsSink,
+#  writes a record of each encounter to it instead so that batches are not kept
+def RunBatches(scenario, count, seed=None, batch_size=BATCH_SIZE, sink=None):
+    tables = RuleTables(scenario)
+    seeds = numpy.random.SeedSequence(seed).spawn((count + batch_size - 1) // batch_size)
+    batches = []
+    index = 0
+    for batch_seed in seeds:
+        size = min(batch_size, count)
+        batch = EncounterBatch(scenario, size, batch_seed, tables).Run()
+        if sink is None:
+            batches.append(batch)
+        else:
+            sink.AddColumns(GetBatchColumns(scenario, batch, seed, index))
+        index += size
+        count -= size
+    return batches
+
+
+##########################################################################################
+#                                        Results                                         #
+##########################################################################################
+
+# return the VP for destroying each enemy unit of a scenario, as in EncounterMenu()
+def GetUnitVP(scenario):
+    return numpy.array([armcom.VP_SCORES[armcom.GetKORecordIndex(unit_class, unit_type)]
+        for (unit_class, unit_type) in scenario.enemies])
+
+
+# return the fields that are the same for every encounter of a scenario
+def GetScenarioFields(scenario):
+    return {
+        'date' : armcom_results.GetDateText(scenario.date),
+        'tank' : scenario.tank_type,
+        'enemies' : armcom_results.GetComposition([unit_type for (unit_class, unit_type)
+            in scenario.enemies]),
+        'enemy_count' : len(scenario.enemies)
+    }
+
+
+# return the result of an encounter as the game would record it
+def GetResultText(player_ko, any_alive):
+    if player_ko:
+        return 'Tank Lost'
+    if not any_alive:
+        return 'Victory'
+    return 'Undetermined'
+
+
+# return a record of an encounter played on the reference path, for a ResultsSink; no
+#  game time passes and the crew are never hurt, so those fields are left as 0
+def GetEncounterRecord(scenario, result, seed, index):
+    record = GetScenarioFields(scenario)
+    destroyed = numpy.array(result.destroyed)
+    record.update({
+        'seed' : seed,
+        'index' : index,
+        'kos' : destroyed.sum(),
+        'player_ko' : result.player_ko,
+        'tanks_lost' : result.tanks_lost,
+        'inf_lost' : result.inf_lost,
+        'vp' : (destroyed * GetUnitVP(scenario)).sum() - result.tanks_lost * 5 -
+            result.inf_lost * 3,
+        'rounds' : result.rounds,
+        'result' : GetResultText(result.player_ko, not all(numpy.array(result.left) |
+            destroyed))
+    })
+    for (phase, seconds) in result.phase_times.items():
+        record['time_' + phase] = seconds
+    return record
+
+
+# return the records of a finished batch as columns for a ResultsSink; seed is the
+#  seed of the whole run and index the number of the batch's first encounter in it.
+#  phase times are the batch's times shared out evenly between its encounters
+def GetBatchColumns(scenario, batch, seed, index):
+    size = batch.size
+    columns = {}
+    for (name, value) in GetScenarioFields(scenario).items():
+        columns[name] = numpy.full(size, value)
+    columns.update({
+        'seed' : numpy.full(size, 0 if seed is None else seed, dtype=numpy.int64),
+        'index' : numpy.arange(index, index + size, dtype=numpy.int64),
+        'kos' : batch.destroyed.sum(axis=1),
+        'player_ko' : batch.player_ko,
+        'tanks_lost' : batch.tanks_lost,
+        'inf_lost' : batch.inf_lost,
+        'vp' : (batch.destroyed * GetUnitVP(scenario)).sum(axis=1) - batch.tanks_lost * 5 -
+            batch.inf_lost * 3,
+        'rounds' : batch.rounds,
+        'result' : numpy.where(batch.player_ko, 'Tank Lost', numpy.where(batch.alive.any(axis=1),
+            'Undetermined', 'Victory'))
+    })
+    for (phase, seconds) in batch.phase_times.items():
+        columns['time_' + phase] = numpy.full(size, seconds / size, dtype=numpy.float32)
+    return columns
+
+
+# Run Totals Class
+# running totals of each measure over the encounters of a run, so that a run of any
+#  length can be summed up without keeping its results; every measure is a count, so
+#  the totals are exact however they are added up
+class RunTotals:
+    def __init__(self, sums=None, count=0):
+        self.count = count                  # encounters added
+        if sums is None:
+            sums = {}
+        self.sums = dict(sums)              # total of each measure
+
+    # add a list of finished EncounterBatch objects or EncounterResult objects
+    def Add(self, results):
+        for (name, values) in GetMetrics(results).items():
+            self.sums[name] = self.sums.get(name, 0) + int(round(values.sum()))
+        self.count += len(values)
+
+    # return the mean of each measure, in the order GetMetrics() gives them whatever order
+    #  the totals were added or loaded in
+    def GetMeans(self):
+        return dict([(name, float(self.sums[name]) / self.count) for name in
+            sorted(self.sums, key=GetMetricOrder)])
+
+
+# return a sort key that puts measure names in the order GetMetrics() gives them: by
+#  their place in METRICS, each followed by its values for each enemy unit
+def GetMetricOrder(name):
+    if name in METRICS:
+        return (METRICS.index(name), -1)
+    (base, unit) = name.rsplit(' ', 1)
+    return (METRICS.index(base), int(unit))
+
+
+# play encounters of a scenario a batch at a time, on the batch path or on the reference
+#  path, keeping only running totals and writing a record of each encounter to sink if
+#  given; returns a RunTotals object
+# if checkpoint_file is given, progress is saved to it every checkpoint_batches batches,
+#  and at the end; a run that finds a checkpoint for the same run carries on from it,
+#  skipping the encounters that are done and dropping any results written after it, and
+#  comes out the same as if it had never been stopped. the random numbers don't need
+#  saving, since each batch has its own generator made from the seed and its batch
+#  number, and each encounter on the reference path seeds the game's own
+def RunWithCheckpoints(scenario, count, seed=0, batch_size=BATCH_SIZE, reference=False,
+    sink=None, checkpoint_file=None, checkpoint_batches=CHECKPOINT_BATCHES):
+    parameters = {'scenario' : vars(scenario), 'count' : count, 'seed' : seed,
+        'batch_size' : batch_size, 'reference' : reference, 'results' : sink is not None}
+    totals = RunTotals()
+    done = []                               # [start, end) ranges of encounters done
+    if checkpoint_file is not None:
+        progress = LoadCheckpoint(checkpoint_file, parameters)
+        if progress is not None:
+            done = progress['done']
+            totals = RunTotals(progress['sums'], progress['count'])
+            if sink is not None:
+                sink.Rewind(progress['chunks'], progress['written'])
+
+    # save progress, writing out any results first so the checkpoint matches them
+    def Checkpoint():
+        progress = {'done' : done, 'sums' : totals.sums, 'count' : totals.count,
+            'chunks' : 0, 'written' : 0}
+        if sink is not None:
+            sink.Flush()
+            progress['chunks'] = sink.chunk_number
+            progress['written'] = sink.written
+        SaveCheckpoint(checkpoint_file, parameters, progress)
+
+    tables = None
+    if not reference:
+        tables = RuleTables(scenario)
+    batch_count = (count + batch_size - 1) // batch_size
+    seeds = numpy.random.SeedSequence(seed).spawn(batch_count)
+    for n in range(batch_count):
+        start = n * batch_size
+        end = min(count, start + batch_size)
+        if len(GetMissingRanges(done, start, end)) == 0: continue
+
+        if reference:
+            results = []
+            for index in range(start, end):
+                encounter_seed = seed * count + index
+                result = RunEncounter(scenario, encounter_seed)
+                results.append(result)
+                if sink is not None:
+                    sink.Add(GetEncounterRecord(scenario, result, encounter_seed, index))
+        else:
+            batch = EncounterBatch(scenario, end - start, seeds[n], tables).Run()
+            results = [batch]
+            if sink is not None:
+                sink.AddColumns(GetBatchColumns(scenario, batch, seed, start))
+        totals.Add(results)
+        done = AddRange(done, start, end)
+
+        # checkpoints are made after the same batches however often the run is stopped,
+        #  so that results are written out in the same chunks
+        if checkpoint_file is not None and (n + 1) % checkpoint_batches == 0:
+            Checkpoint()
+
+    if checkpoint_file is not None:
+        Checkpoint()
+    return totals
+
+
+# return the measures of a list of finished EncounterBatch objects or EncounterResult
+#  objects, as a dictionary of arrays of one value for each encounter; measures that are
+#  kept for each enemy unit are totalled, and also given for each unit
+def GetMetrics(results):
+    metrics = {}
+    for name in METRICS:
+        parts = []
+        for result in results:
+            if isinstance(result, EncounterBatch):
+                parts.append(numpy.asarray(getattr(result, name), dtype=float))
+            else:
+                parts.append(numpy.asarray([getattr(result, name)], dtype=float))
+        values = numpy.concatenate(parts)
+        if values.ndim == 1:
+            metrics[name] = values
+            continue
+        metrics[name] = values.sum(axis=1)
+        for u in range(values.shape[1]):
+            metrics[name + ' ' + str(u)] = values[:,u]
+    return metrics
+
+
+# play encounters of a scenario on both paths, and return for each measure its mean on
+#  the reference path and the batch path, and how far apart they are in standard errors
+def CheckConformance(scenario, count=CHECK_ENCOUNTERS, batch_count=CHECK_BATCH_ENCOUNTERS,
+    seed=0):
+    reference = GetMetrics([RunEncounter(scenario, seed * count + n) for n in range(count)])
+    batch = GetMetrics(RunBatches(scenario, batch_count, seed))
+    rows = []
+    for name in reference:
+        (a, b) = (reference[name], batch[name])
+        error = numpy.sqrt(a.var() / len(a) + b.var() / len(b))
+        if error > 0:
+            z = (a.mean() - b.mean()) / error
+        elif a.mean() == b.mean():
+            z = 0.0
+        else:
+            z = float('inf')
+        rows.append((name, a.mean(), b.mean(), z))
+    return rows
+
+
+# return the names of the vehicle types that can be the player tank: those with a ready
+#  rack
+def GetPlayerTankTypes():
+    return [vehicle_type[0] for vehicle_type in VEHICLE_TYPES if 'rr_size' in
+        [stat[0] for stat in vehicle_type[1:]]]
+
+
+# return a scenario from command line options
+def GetScenario(options):
+    return Scenario(tank_type=options.tank, scen_type=options.mission,
+        area_type=options.area, max_rounds=options.rounds, lead_tank=options.lead_tank)
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description='Play Armoured Commander encounters without the game interface.')
+    parser.add_argument('command', choices=['run', 'check'],
+        help='play encounters and show the results, or check the batch path against the reference path')
+    parser.add_argument('-n', '--count', type=int, default=None,
+        help='number of encounters to play (on the reference path for check)')
+    parser.add_argument('-m', '--batch-count', type=int, default=CHECK_BATCH_ENCOUNTERS,
+        help='number of encounters to play on the batch path for check')
+    parser.add_argument('-b', '--batch-size', type=int, default=BATCH_SIZE,
+        help='encounters played at once')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='random seed')
+    parser.add_argument('-r', '--reference', action='store_true',
+        help='play on the reference path instead of the batch path')
+    parser.add_argument('--tank', default='M4 Turret A', choices=GetPlayerTankTypes(),
+        metavar='MODEL', help='player tank model')
+    parser.add_argument('--mission', default='Advance', choices=['Advance', 'Battle'],
+        help='mission type')
+    parser.add_argument('--area', default='B', choices=['A', 'B', 'C', 'D', 'F'],
+        help='campaign map area type')
+    parser.add_argument('--rounds', type=int, default=MAX_ROUNDS, help='maximum rounds')
+    parser.add_argument('--lead-tank', action='store_true',
+        help='the player tank leads the column')
+    parser.add_argument('-o', '--output', default=None,
+        help='write a record of each encounter to this results directory')
+    parser.add_argument('-c', '--checkpoint', default=None,
+        help='save progress to this checkpoint file, and carry on from it if it exists')
+    parser.add_argument('--checkpoint-every', type=int, default=CHECKPOINT_BATCHES,
+        help='batches played between checkpoints')
+    options = parser.parse_args(args)
+    scenario = GetScenario(options)
+
+    if options.command == 'check':
+        if options.count is None:
+            options.count = CHECK_ENCOUNTERS
+        rows = CheckConformance(scenario, options.count, options.batch_count, options.seed)
+        print('{:<14} {:>10} {:>10} {:>7}'.format('Measure', 'Reference', 'Batch', 'Z'))
+        failed = 0
+        for (name, reference_mean, batch_mean, z) in rows:
+            text = '{:<14} {:>10.4f} {:>10.4f} {:>7.2f}'.format(name, reference_mean,
+                batch_mean, z)
+            if abs(z) > CHECK_Z:
+                text += '  DIFFERENT'
+                failed += 1
+            print(text)
+        if failed > 0:
+            print(str(failed) + ' measures differ between the two paths')
+            return 1
+        print('The two paths agree')
+        return 0
+
+    if options.count is None:
+        options.count = 100000
+    sink = None
+    if options.output is not None:
+        sink = armcom_results.ResultsSink(options.output, 'encounters')
+    start = time.time()
+    try:
+        totals = RunWithCheckpoints(scenario, options.count, options.seed, options.batch_size,
+            options.reference, sink, options.checkpoint, options.checkpoint_every)
+    except ValueError as e:
+        print('ERROR: ' + str(e))
+        return 1
+    if sink is not None:
+        sink.Close()
+    elapsed = time.time() - start
+    for (name, mean) in totals.GetMeans().items():
+        print('{:<14} {:>10.4f}'.format(name, mean))
+    if sink is not None:
+        print(str(sink.written) + ' records written to ' + options.output)
+    print(str(options.count) + ' encounters in ' + '{:.2f}'.format(elapsed) + ' seconds, ' +
+        '{:.0f}'.format(options.count / elapsed) + ' a second')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
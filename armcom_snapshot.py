@@ -0,0 +1,240 @@
+# -*- coding: UTF-8 -*-
+
+##########################################################################################
+#                       Encounter Snapshots for Armoured Commander                       #
+##########################################################################################
+
+##########################################################################################
+#
+#    Copyright 2015-2017 Gregory Adam Scott (sudasana@gmail.com)
+#
+#    This file is part of Armoured Commander.
+#
+#    Armoured Commander is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Armoured Commander is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+#    You should have received a copy of the GNU General Public License
+#    along with Armoured Commander, in the form of a file named "LICENSE".
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+##########################################################################################
+
+# takes snapshots of an encounter in progress, and puts the game back the way it was in
+# one, without saving or loading the game. a snapshot holds the attributes of the battle,
+# the player tank, its crew, the enemy units, the map hexes and smoke factors, the
+# weather, the campaign time, stats and quest flag, the quests on the campaign day map
+# and their deadlines, and optionally the state of the random number generators
+#
+# objects are put back in place rather than replaced, so anything that points to them,
+# such as the selected crewman or the target, still does. each object's attributes are
+# copied once, with any lists, dictionaries and deques in them copied as well, and are
+# never changed afterwards, so snapshots can share them: a snapshot taken with a parent
+# snapshot reuses the parent's copy of every object that has not changed since, and
+# restoring a snapshot only writes back the objects that have changed. since most of an
+# encounter, such as the map hexes, stays the same from one phase to the next, most
+# objects are only compared, not copied
+#
+# for example, to try something out and then undo it:
+#   with Fork(armcom):
+#       ...
+# or to see the outcomes of something several times over:
+#   results = Lookahead(armcom, function, 10)
+
+import random                           # for saving the state of the random choices
+from collections import deque
+
+CONTAINER_TYPES = (list, dict, deque, set)
+
+# campaign attributes that can change during an encounter
+CAMPAIGN_ATTRIBUTES = ['hour', 'minute', 'stats', 'quest_active']
+
+# day map node attributes that can change during an encounter, when a quest runs out of
+#  time; the rest of each node stays the same for the whole day
+QUEST_ATTRIBUTES = ['quest_type', 'quest_time_limit', 'quest_vp_bonus']
+
+
+# return a copy of a value in which every list, dictionary, deque or set is a new one
+#  and anything else is shared
+def CopyValue(value):
+    value_type = type(value)
+    if value_type is list:
+        return [CopyValue(item) if type(item) in CONTAINER_TYPES else item for item in value]
+    if value_type is dict:
+        return dict([(key, CopyValue(item) if type(item) in CONTAINER_TYPES else item)
+            for (key, item) in value.items()])
+    if value_type is deque:
+        return deque([CopyValue(item) if type(item) in CONTAINER_TYPES else item
+            for item in value], value.maxlen)
+    if value_type is set:
+        return set(value)
+    return value
+
+
+# return a copy of a dictionary of attributes
+def CopyState(attributes):
+    state = attributes.copy()
+    for (name, value) in attributes.items():
+        if type(value) in CONTAINER_TYPES:
+            state[name] = CopyValue(value)
+    return state
+
+
+# Encounter Snapshot Class
+# the state of an encounter in progress in a game module, such as armcom
+class EncounterSnapshot:
+    def __init__(self, game, parent=None, rng=True):
+        self.game = game
+        self.battle = game.battle
+        self.tank = game.tank
+        self.campaign = game.campaign
+
+        # attributes of each object, by object id
+        if parent is None:
+            previous = {}
+        else:
+            previous = parent.states
+        self.states = {}
+        for obj in self.GetObjects():
+            old = previous.get(id(obj))
+            # share the parent's copy if the object has not changed since
+            if old is not None and old[0] is obj and obj.__dict__ == old[1]:
+                self.states[id(obj)] = old
+            else:
+                self.states[id(obj)] = (obj, CopyState(obj.__dict__))
+
+        campaign_state = dict([(name, getattr(self.campaign, name)) for name in
+            CAMPAIGN_ATTRIBUTES if hasattr(self.campaign, name)])
+        if parent is not None and parent.campaign is self.campaign and campaign_state == parent.campaign_state:
+            self.campaign_state = parent.campaign_state
+        else:
+            self.campaign_state = CopyState(campaign_state)
+
+        self.day_map = getattr(self.campaign, 'day_map', None)
+        quest_state = self.GetQuestState()
+        if parent is not None and parent.day_map is self.day_map and quest_state == parent.quest_state:
+            self.quest_state = parent.quest_state
+        else:
+            self.quest_state = quest_state
+
+        self.python_random = None
+        self.libtcod_random = None
+        if rng:
+            self.python_random = random.getstate()
+            self.libtcod_random = game.libtcod.random_save(0)
+
+    # return the objects whose attributes are kept in a snapshot
+    def GetObjects(self):
+        objects = [self.battle, self.tank, self.campaign.weather]
+        objects.extend(self.tank.crew)
+        objects.extend(self.battle.enemy_units)
+        objects.extend(self.battle.maphexes)
+        objects.extend(self.battle.smoke_factors)
+        return objects
+
+    # return the quest deadlines of the day map, and the quest attributes of each of its
+    #  nodes, or None if there is no day map
+    def GetQuestState(self):
+        if self.day_map is None:
+            return None
+        nodes = [tuple([getattr(node, name) for name in QUEST_ATTRIBUTES]) for node in
+            self.day_map.nodes]
+        return (list(self.day_map.quest_deadlines), nodes)
+
+    # return True if the game is still just as it was when the snapshot was taken
+    def IsCurrent(self):
+        game = self.game
+        if game.battle is not self.battle or game.tank is not self.tank:
+            return False
+        for (obj, state) in self.states.values():
+            if obj.__dict__ != state:
+                return False
+        for (name, value) in self.campaign_state.items():
+            if getattr(self.campaign, name) != value:
+                return False
+        if self.GetQuestState() != self.quest_state:
+            return False
+        return True
+
+    # put the game back as it was when the snapshot was taken; if rng is False, the
+    #  random number generators carry on from where they are
+    def Restore(self, rng=True):
+        game = self.game
+        game.battle = self.battle
+        game.tank = self.tank
+        game.campaign = self.campaign
+
+        for (obj, state) in self.states.values():
+            attributes = obj.__dict__
+            if attributes == state: continue
+            attributes.clear()
+            attributes.update(CopyState(state))
+
+        for (name, value) in self.campaign_state.items():
+            if getattr(self.campaign, name) != value:
+                setattr(self.campaign, name, CopyValue(value))
+
+        if self.quest_state is not None:
+            self.campaign.day_map = self.day_map
+            (deadlines, nodes) = self.quest_state
+            if self.day_map.quest_deadlines != deadlines:
+                self.day_map.quest_deadlines = list(deadlines)
+            for (node, values) in zip(self.day_map.nodes, nodes):
+                for (name, value) in zip(QUEST_ATTRIBUTES, values):
+                    if getattr(node, name) != value:
+                        setattr(node, name, value)
+
+        if rng and self.python_random is not None:
+            random.setstate(self.python_random)
+            game.libtcod.random_restore(0, self.libtcod_random)
+
+    # free the saved random number generator state; the snapshot can still be restored,
+    #  but without it
+    def Discard(self):
+        if self.libtcod_random is not None:
+            self.game.libtcod.random_delete(self.libtcod_random)
+        self.python_random = None
+        self.libtcod_random = None
+
+
+# Fork Class
+# for use in a with statement: everything done inside the with block, including the
+#  dice rolled, is undone at the end of it
+class Fork:
+    def __init__(self, game, parent=None, rng=True):
+        self.game = game
+        self.parent = parent
+        self.rng = rng
+        self.snapshot = None
+
+    def __enter__(self):
+        self.snapshot = EncounterSnapshot(self.game, self.parent, self.rng)
+        return self.snapshot
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.snapshot.Restore()
+        self.snapshot.Discard()
+        return False
+
+
+# call function a number of times, each time from the encounter as it is now, and
+#  return a list of what it returned each time; the dice carry on from one time to the
+#  next so each outcome can be different, and the game, dice included, is put back
+#  afterwards
+def Lookahead(game, function, times, parent=None):
+    snapshot = EncounterSnapshot(game, parent)
+    results = []
+    try:
+        for n in range(times):
+            results.append(function())
+            snapshot.Restore(rng=False)
+    finally:
+        snapshot.Restore()
+        snapshot.Discard()
+    return results
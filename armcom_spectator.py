@@ -0,0 +1,387 @@
+# -*- coding: UTF-8 -*-
+
+##########################################################################################
+#                        Spectator Stream for Armoured Commander                         #
+##########################################################################################
+
+##########################################################################################
+#
+#    Copyright 2015-2017 Gregory Adam Scott (sudasana@gmail.com)
+#
+#    This file is part of Armoured Commander.
+#
+#    Armoured Commander is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Armoured Commander is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+#    You should have received a copy of the GNU General Public License
+#    along with Armoured Commander, in the form of a file named "LICENSE".
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+##########################################################################################
+
+# streams the game screen to spectators over a local TCP or Unix socket. the game hands
+# each shown frame of the root console to a SpectatorServer, at most MAX_FPS times a
+# second, which copies it to a spare console with a single blit. the server's own thread
+# reads the cells of the copy, works out what has changed since the last frame each
+# spectator was sent and sends only that, so a slow spectator just gets fewer frames and
+# the game never waits for one
+#
+# stream format: a header of magic and version; then for each frame its size, frame
+#  number, width, height and number of runs, then the runs. a run is a row, column, and
+#  length, and the character, foreground and background colour of every cell in it. the
+#  first frame sent to a spectator, and the first after the screen changes size, covers
+#  the whole screen
+#
+# to watch a game started with --spectate, in a terminal with 24-bit colour:
+#   python armcom_spectator.py
+# or for a game started with --spectate=/path/to/socket:
+#   python armcom_spectator.py --unix /path/to/socket
+
+import argparse                         # for command line options
+import os
+import selectors                        # for serving all spectators from one thread
+import socket
+import struct                           # for the stream header, frames and runs
+import sys
+import threading                        # for the server thread
+import time                             # for limiting the frame rate
+
+from armcom_screenshot import GetCharText, GetConsoleCells   # for reading and showing cells
+
+SPECTATOR_HOST = '127.0.0.1'            # only local spectators can connect
+SPECTATOR_PORT = 7770                   # default port
+MAX_FPS = 10                            # maximum frames a second sent to spectators
+STREAM_MAGIC = b'ACSV'
+STREAM_VERSION = 2
+FRAME_CONSOLES = 2                      # spare consoles that frames are copied to
+
+HEADER = struct.Struct('<4sB')          # magic, version
+FRAME = struct.Struct('<IIHHH')         # size of rest of frame, frame number, width,
+                                        #  height, number of runs
+RUN = struct.Struct('<HHHH6B')          # row, column, length, character, fore r, g, b,
+                                        #  back r, g, b
+
+
+# return a spectator address from a command line value: a port number for a local TCP
+#  socket, or the path of a Unix socket
+def GetAddress(text):
+    if text is None or text == '':
+        return (SPECTATOR_HOST, SPECTATOR_PORT)
+    if text.isdigit():
+        return (SPECTATOR_HOST, int(text))
+    return text
+
+
+# return a frame as a list of (character, foreground, background) for each cell, row by row
+def FlattenCells(chars, fore, back):
+    cells = []
+    for (row, fore_row, back_row) in zip(chars, fore, back):
+        cells.extend(zip(row, fore_row, back_row))
+    return cells
+
+
+# encode the changes from one frame to another as runs of identical cells, with no run
+#  going past the end of a row; if old_cells is None every cell is included
+def EncodeFrame(frame_number, old_cells, cells, w, h):
+    runs = []
+    n = len(cells)
+    i = 0
+    while i < n:
+        cell = cells[i]
+        if old_cells is not None and old_cells[i] == cell:
+            i += 1
+            continue
+        start = i
+        row_end = (start // w + 1) * w
+        i += 1
+        while i < row_end and cells[i] == cell:
+            i += 1
+        (c, fore, back) = cell
+        runs.append(RUN.pack(start // w, start % w, i - start, c, *(fore + back)))
+    data = b''.join(runs)
+    return FRAME.pack(FRAME.size - 4 + len(data), frame_number, w, h, len(runs)) + data
+
+
+# Spectator Class
+# one connected spectator, and the last frame it was sent
+class Spectator:
+    def __init__(self, sock):
+        self.sock = sock
+        self.frame_number = None    # number of last frame sent
+        self.cells = None           # cells of last frame sent
+        self.size = None            # (width, height) of last frame sent
+        self.out = HEADER.pack(STREAM_MAGIC, STREAM_VERSION)
+
+
+# Spectator Server Class
+# accepts spectators and sends them frames on a background thread
+class SpectatorServer:
+    def __init__(self, address, libtcod, max_fps=MAX_FPS):
+        self.address = address
+        self.libtcod = libtcod
+        self.min_interval = 1.0 / max_fps
+        self.last_frame_time = 0.0
+        self.lock = threading.Lock()        # guards frame and free_consoles
+        self.frame = None                   # (frame number, console) of latest frame, until
+                                            #  the server thread takes it
+        self.free_consoles = []             # spare consoles not holding a frame
+        self.console_count = 0
+        self.frame_number = 0
+        self.spectator_count = 0
+        self.spectators = {}                # spectators by socket
+        self.running = True
+
+        if type(address) == str:
+            if os.path.exists(address):
+                os.remove(address)
+            self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(address)
+        self.listener.listen(8)
+        self.listener.setblocking(False)
+
+        # written to by the game to wake up the server thread when there is a new frame
+        (self.wake_receiver, self.wake_sender) = socket.socketpair()
+        self.wake_receiver.setblocking(False)
+        self.wake_sender.setblocking(False)
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.selector.register(self.wake_receiver, selectors.EVENT_READ)
+
+        self.thread = threading.Thread(target=self.Run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    # return True if anyone is watching and enough time has passed since the last frame;
+    #  checked by the game before copying the screen
+    def FrameDue(self):
+        if self.spectator_count == 0:
+            return False
+        return time.time() - self.last_frame_time >= self.min_interval
+
+    # pass on a new frame of a console by copying it to a spare console; if the server
+    #  thread is still reading both spare consoles, the frame is skipped
+    def SubmitFrame(self, con):
+        libtcod = self.libtcod
+        self.last_frame_time = time.time()
+        with self.lock:
+            # a frame the server thread has not taken yet is replaced
+            if self.frame is not None:
+                copy = self.frame[1]
+                self.frame = None
+            elif len(self.free_consoles) > 0:
+                copy = self.free_consoles.pop()
+            elif self.console_count < FRAME_CONSOLES:
+                copy = None
+                self.console_count += 1
+            else:
+                return
+
+        w = libtcod.console_get_width(con)
+        h = libtcod.console_get_height(con)
+        if copy is not None and (libtcod.console_get_width(copy) != w or
+            libtcod.console_get_height(copy) != h):
+            libtcod.console_delete(copy)
+            copy = None
+        if copy is None:
+            copy = libtcod.console_new(w, h)
+        libtcod.console_blit(con, 0, 0, w, h, copy, 0, 0)
+
+        with self.lock:
+            self.frame_number += 1
+            self.frame = (self.frame_number, copy)
+        try:
+            self.wake_sender.send(b'\0')
+        except (BlockingIOError, OSError):
+            # server thread has already been woken up
+            pass
+
+    def Close(self):
+        self.running = False
+        try:
+            self.wake_sender.send(b'\0')
+        except OSError:
+            pass
+        self.thread.join(1.0)
+
+    # read the cells of the latest frame if there is a new one, and hand its console back;
+    #  returns the new (frame number, width, height, cells), or latest if there is none
+    def TakeFrame(self, latest):
+        with self.lock:
+            frame = self.frame
+            self.frame = None
+        if frame is None:
+            return latest
+        (frame_number, copy) = frame
+        (chars, fore, back) = GetConsoleCells(self.libtcod, copy)
+        cells = FlattenCells(chars, fore, back)
+        with self.lock:
+            self.free_consoles.append(copy)
+        return (frame_number, len(chars[0]), len(chars), cells)
+
+    # run on the server thread
+    def Run(self):
+        latest = None
+        while self.running:
+            for (selector_key, events) in self.selector.select(1.0):
+                sock = selector_key.fileobj
+                if sock is self.listener:
+                    self.Accept()
+                elif sock is self.wake_receiver:
+                    try:
+                        while self.wake_receiver.recv(256): pass
+                    except BlockingIOError:
+                        pass
+                else:
+                    spectator = self.spectators[sock]
+                    if events & selectors.EVENT_READ:
+                        # spectators never send anything, so this is a disconnect
+                        try:
+                            data = sock.recv(256)
+                        except OSError:
+                            data = b''
+                        if not data:
+                            self.Drop(spectator)
+                            continue
+                    if events & selectors.EVENT_WRITE:
+                        self.Send(spectator)
+
+            # send the latest frame to any spectators who have finished receiving the
+            #  last one they were sent
+            latest = self.TakeFrame(latest)
+            if latest is None: continue
+            (frame_number, w, h, cells) = latest
+            for spectator in list(self.spectators.values()):
+                if spectator.out or spectator.frame_number == frame_number:
+                    continue
+                if spectator.size != (w, h):
+                    spectator.cells = None
+                    spectator.size = (w, h)
+                spectator.out += EncodeFrame(frame_number, spectator.cells, cells, w, h)
+                spectator.cells = cells
+                spectator.frame_number = frame_number
+                self.Send(spectator)
+
+        for spectator in list(self.spectators.values()):
+            self.Drop(spectator)
+        self.selector.close()
+        self.listener.close()
+        if type(self.address) == str and os.path.exists(self.address):
+            os.remove(self.address)
+
+    def Accept(self):
+        try:
+            (sock, address) = self.listener.accept()
+        except (BlockingIOError, OSError):
+            return
+        sock.setblocking(False)
+        spectator = Spectator(sock)
+        self.spectators[sock] = spectator
+        self.spectator_count = len(self.spectators)
+        self.selector.register(sock, selectors.EVENT_READ)
+        self.Send(spectator)
+
+    def Drop(self, spectator):
+        self.selector.unregister(spectator.sock)
+        del self.spectators[spectator.sock]
+        self.spectator_count = len(self.spectators)
+        spectator.sock.close()
+
+    # send as much waiting data as the spectator's socket will take, and only watch for
+    #  it becoming writable again while there is some left
+    def Send(self, spectator):
+        try:
+            sent = spectator.sock.send(spectator.out)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self.Drop(spectator)
+            return
+        spectator.out = spectator.out[sent:]
+        events = selectors.EVENT_READ
+        if spectator.out:
+            events |= selectors.EVENT_WRITE
+        self.selector.modify(spectator.sock, events)
+
+
+# read exactly size bytes from a stream, or return None if it has ended
+def ReadExactly(f, size):
+    data = f.read(size)
+    if len(data) < size:
+        return None
+    return data
+
+
+# connect to a spectator server and show its frames in the terminal until it stops
+def View(address):
+    if type(address) == str:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.connect(address)
+    f = sock.makefile('rb')
+    out = sys.stdout
+
+    data = ReadExactly(f, HEADER.size)
+    if data is None:
+        return 1
+    (magic, version) = HEADER.unpack(data)
+    if magic != STREAM_MAGIC or version != STREAM_VERSION:
+        print('Not an Armoured Commander spectator stream, or from a different version')
+        return 1
+
+    # hide the cursor
+    out.write('\x1b[?25l')
+    h = 0
+    size = None
+    try:
+        while True:
+            data = ReadExactly(f, FRAME.size)
+            if data is None: break
+            (frame_size, frame_number, w, h, run_count) = FRAME.unpack(data)
+            data = ReadExactly(f, frame_size - (FRAME.size - 4))
+            if data is None: break
+            text = ''
+            # clear the terminal for the first frame, and whenever the screen changes size
+            if (w, h) != size:
+                text = '\x1b[0m\x1b[2J'
+                size = (w, h)
+            for n in range(run_count):
+                (y, x, length, c, fr, fg, fb, br, bg, bb) = RUN.unpack_from(data, n * RUN.size)
+                text += '\x1b[%d;%dH\x1b[38;2;%d;%d;%dm\x1b[48;2;%d;%d;%dm' % (y+1, x+1,
+                    fr, fg, fb, br, bg, bb)
+                text += GetCharText(c) * length
+            out.write(text + '\x1b[0m\x1b[%d;1H' % (h+1))
+            out.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        out.write('\x1b[0m\x1b[?25h\n')
+        out.flush()
+        sock.close()
+    return 0
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description='Watch an Armoured Commander game in the terminal.')
+    parser.add_argument('-p', '--port', type=int, default=SPECTATOR_PORT,
+        help='port of a game started with --spectate')
+    parser.add_argument('-u', '--unix', help='Unix socket of a game started with --spectate=PATH')
+    options = parser.parse_args(args)
+    if options.unix is not None:
+        return View(options.unix)
+    return View((SPECTATOR_HOST, options.port))
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,598 @@
+# -*- coding: UTF-8 -*-
+
+##########################################################################################
+#                    Simulation Work Queue for Armoured Commander                        #
+##########################################################################################
+
+##########################################################################################
+#
+#    Copyright 2015-2017 Gregory Adam Scott (sudasana@gmail.com)
+#
+#    This file is part of Armoured Commander.
+#
+#    Armoured Commander is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Armoured Commander is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+#    You should have received a copy of the GNU General Public License
+#    along with Armoured Commander, in the form of a file named "LICENSE".
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+##########################################################################################
+
+# shares out a sweep of simulated encounters, see armcom_sim.py, between worker
+# processes on any number of machines. a coordinator builds the sweep: one parameter set
+# for each combat day of each campaign file, in each player tank model in VEHICLE_TYPES
+# that the campaign allows, with the enemy units the campaign is most likely to field
+# on that day's mission. each parameter set is played out in numbered batches of
+# encounters, and each batch has its own random seed made from the sweep seed, the
+# parameter set and the batch number, so the results are the same however the work is
+# shared out
+#
+# the batches are handed out as tasks, each a range of batches of one parameter set.
+# workers connect to the coordinator over TCP, ask for a task, play its batches and send
+# back the totals, and the records too if the coordinator is writing results, after each
+# batch. a task is leased to its worker for LEASE_SECONDS from the last batch it sent
+# back; if a worker goes quiet or disconnects, the rest of its task goes back in the
+# queue, and is given up on after MAX_ATTEMPTS tries. once the queue is empty, a worker
+# asking for work takes the second half of the biggest task still being played instead,
+# and the worker playing it finds out it has less to do with its next reply
+#
+# messages are a header giving the size of a JSON message and of a binary payload, then
+# both; the only payload is a batch's records, as the columns of a NumPy .npz file
+#
+# to run a sweep on one machine with 4 worker processes:
+#   python armcom_workqueue.py local -w 4
+# or across several machines, start a coordinator on one:
+#   python armcom_workqueue.py coordinator --host 0.0.0.0 -o results
+# and workers on the others:
+#   python armcom_workqueue.py worker --host COORDINATOR_ADDRESS
+
+import argparse                         # for command line options
+from collections import deque           # for the task queue
+import io                               # for batch records sent as .npz data
+import json                             # for messages
+import os
+import socket
+import socketserver                     # for serving each worker on its own thread
+import struct                           # for message headers
+import subprocess                       # for starting local worker processes
+import sys
+import threading
+import time
+
+import numpy
+
+import armcom_sim                       # plays the encounters, and starts the game up
+import armcom_results                   # for writing a record of each encounter
+from armcom_spectator import ReadExactly
+from armcom_vehicle_defs import VEHICLE_TYPES
+
+WORKQUEUE_HOST = '127.0.0.1'            # coordinator only takes local workers by default
+WORKQUEUE_PORT = 7780                   # default port
+PROTOCOL_VERSION = 1
+LEASE_SECONDS = 60.0                    # a task goes back in the queue if its worker sends
+                                        #  nothing back for this long
+MAX_ATTEMPTS = 3                        # times a task is handed out before giving up on it
+BATCHES_PER_TASK = 4                    # batches in each task when the sweep is shared out
+WAIT_SECONDS = 0.5                      # time an idle worker waits before asking again
+CONNECT_SECONDS = 30.0                  # time a worker keeps trying to connect
+TABLES_CACHE_MAX = 8                    # rule tables kept by a worker, by parameter set
+SWEEP_ENCOUNTERS = 65536                # encounters played for each parameter set
+SWEEP_BATCH_SIZE = 8192                 # encounters in each batch
+
+MESSAGE = struct.Struct('<II')          # size of JSON message, size of binary payload
+
+# mission type of each mission code in a campaign calendar; counterattack days are left
+#  out, since the simulated encounter doesn't play them
+MISSIONS = {'A' : 'Advance', 'B' : 'Battle'}
+
+# enemy unit classes in the order they are spawned in each parameter set, and the unit
+#  types for classes that only have one
+ENEMY_CLASSES = ['TANK', 'SPG', 'AT_GUN', 'LW', 'MG', 'APC', 'AC', 'TRUCK']
+INFANTRY_TYPES = {'LW' : 'Light Weapons Infantry', 'MG' : 'MG Team'}
+
+
+##########################################################################################
+#                                       The Sweep                                        #
+##########################################################################################
+
+# Parameter Set Class
+# one scenario of a sweep, and where it came from
+class ParameterSet:
+    def __init__(self, campaign_file, comment, scenario):
+        self.campaign_file = campaign_file
+        self.comment = comment              # comment on the calendar day
+        self.scenario = scenario
+
+    def GetName(self):
+        s = self.scenario
+        return (os.path.splitext(self.campaign_file)[0] + ' ' +
+            armcom_results.GetDateText(s.date) + ' ' + s.scen_type + ' ' + s.tank_type)
+
+
+# return the parameter sets for a list of campaign files in the data folder; tank_types
+#  limits the player tank models if given, and max_days the number of combat days
+#  taken from each campaign
+def GetParameterSets(campaign_files, tank_types=None, max_days=None,
+    max_rounds=armcom_sim.MAX_ROUNDS):
+    vehicle_types = [vehicle_type[0] for vehicle_type in VEHICLE_TYPES]
+    parameter_sets = []
+    for campaign_file in campaign_files:
+        root = armcom_sim.armcom.ParseDataXML(campaign_file).getroot()
+
+        tanks = []
+        for item in root.find('player_tanks').findall('player_tank_type'):
+            if item.text not in vehicle_types: continue
+            if tank_types is not None and item.text not in tank_types: continue
+            tanks.append(item.text)
+
+        # most likely unit type of each class
+        unit_types = dict(INFANTRY_TYPES)
+        chances = {}
+        for item in root.find('unit_class_activations'):
+            (unit_type, chance) = [text.strip() for text in item.text.split(';')[:2]]
+            if int(chance) > chances.get(item.tag, -1):
+                unit_types[item.tag] = unit_type
+                chances[item.tag] = int(chance)
+
+        days = []
+        for item in root.find('calendar').findall('day'):
+            if item.find('mission') is None: continue
+            if item.find('mission').text not in MISSIONS: continue
+            days.append(item)
+        if max_days is not None:
+            days = days[:max_days]
+
+        for item in days:
+            scen_type = MISSIONS[item.find('mission').text]
+            date = (int(item.find('year').text), int(item.find('month').text),
+                int(item.find('date').text))
+
+            # enemy classes that can turn up on this mission
+            activations = root.find('activation_table').find(scen_type.lower())
+            enemies = []
+            for class_name in ENEMY_CLASSES:
+                if int(activations.find(class_name).text) <= 0: continue
+                if class_name not in unit_types: continue
+                enemies.append((class_name, unit_types[class_name]))
+
+            for tank_type in tanks:
+                scenario = armcom_sim.Scenario(tank_type=tank_type, enemies=enemies,
+                    scen_type=scen_type, date=date, max_rounds=max_rounds)
+                parameter_sets.append(ParameterSet(campaign_file, item.findtext('comment', ''),
+                    scenario))
+    return parameter_sets
+
+
+# return the names of the campaign files in the data folder
+def GetCampaignFiles():
+    return sorted([filename for filename in armcom_sim.armcom.GetDataFiles() if
+        filename.endswith('.xml')])
+
+
+# return the random seed of a batch of a parameter set
+def GetBatchSeed(seed, set_index, batch):
+    return numpy.random.SeedSequence([seed, set_index, batch])
+
+
+##### Messages #####
+
+def SendMessage(f, message, payload=b''):
+    data = json.dumps(message).encode('utf-8')
+    f.write(MESSAGE.pack(len(data), len(payload)) + data + payload)
+    f.flush()
+
+
+# return the next message and its payload, or (None, None) if the connection has closed
+def ReceiveMessage(f):
+    data = ReadExactly(f, MESSAGE.size)
+    if data is None:
+        return (None, None)
+    (size, payload_size) = MESSAGE.unpack(data)
+    data = ReadExactly(f, size)
+    payload = ReadExactly(f, payload_size)
+    if data is None or payload is None:
+        return (None, None)
+    return (json.loads(data.decode('utf-8')), payload)
+
+
+##########################################################################################
+#                                      Coordinator                                       #
+##########################################################################################
+
+# Task Class
+# a range of batches of one parameter set, from the next one not yet sent back up to
+#  but not including end
+class Task:
+    def __init__(self, task_id, set_index, start, end):
+        self.task_id = task_id
+        self.set_index = set_index
+        self.start = start
+        self.end = end
+        self.worker = None                  # name of the worker it is leased to
+        self.lease_end = 0.0                # time the lease runs out
+        self.attempts = 0                   # times it has been handed out
+
+
+# Coordinator Class
+# hands out the tasks of a sweep and collects the results; all methods are called with
+#  lock held
+class Coordinator:
+    def __init__(self, parameter_sets, count, batch_size, seed, sink=None):
+        self.parameter_sets = parameter_sets
+        self.batch_size = batch_size
+        self.seed = seed
+        self.sink = sink
+        self.lock = threading.Lock()
+        self.finished = threading.Event()   # set once every task is done or given up on
+
+        self.count = count                  # encounters played for each parameter set
+        self.totals = []                    # armcom_sim.RunTotals of each parameter set
+        self.done = set()                   # (parameter set, batch) of batches sent back
+        self.pending = deque()              # tasks waiting to be handed out
+        self.leased = {}                    # tasks being played, by task id
+        self.failed = []                    # tasks given up on
+        self.next_task_id = 0
+        self.workers = set()                # names of connected workers
+        self.stolen = 0                     # number of tasks split by work stealing
+        self.retried = 0                    # number of tasks put back in the queue
+
+        batch_count = (count + batch_size - 1) // batch_size
+        for set_index in range(len(parameter_sets)):
+            self.totals.append(armcom_sim.RunTotals())
+            for start in range(0, batch_count, BATCHES_PER_TASK):
+                self.pending.append(self.NewTask(set_index, start,
+                    min(batch_count, start + BATCHES_PER_TASK)))
+        self.CheckFinished()
+
+    def NewTask(self, set_index, start, end):
+        task = Task(self.next_task_id, set_index, start, end)
+        self.next_task_id += 1
+        return task
+
+    # return the reply to a message from a worker
+    def Handle(self, worker, message, payload):
+        self.CheckLeases()
+        if message['type'] == 'hello':
+            if message.get('version') != PROTOCOL_VERSION:
+                return {'type' : 'error', 'text' : 'Different work queue version'}
+            self.workers.add(worker)
+            return {'type' : 'welcome', 'seed' : self.seed, 'count' : self.count,
+                'batch_size' : self.batch_size, 'records' : self.sink is not None}
+        elif message['type'] == 'get':
+            return self.GetTask(worker)
+        elif message['type'] == 'batch':
+            return self.AddBatch(worker, message, payload)
+        return {'type' : 'error', 'text' : 'Unknown message type ' + str(message['type'])}
+
+    # lease a task to a worker, taking half of the biggest task still being played if
+    #  there are none waiting
+    def GetTask(self, worker):
+        if self.finished.is_set():
+            return {'type' : 'done'}
+        if len(self.pending) > 0:
+            task = self.pending.popleft()
+        else:
+            biggest = None
+            for task in self.leased.values():
+                # a task's worker is always playing its first batch, so it can only be
+                #  split if it has two or more left
+                if task.end - task.start < 2: continue
+                if biggest is None or task.end - task.start > biggest.end - biggest.start:
+                    biggest = task
+            if biggest is None:
+                return {'type' : 'wait', 'seconds' : WAIT_SECONDS}
+            middle = biggest.end - (biggest.end - biggest.start) // 2
+            task = self.NewTask(biggest.set_index, middle, biggest.end)
+            biggest.end = middle
+            self.stolen += 1
+
+        task.worker = worker
+        task.lease_end = time.time() + LEASE_SECONDS
+        task.attempts += 1
+        self.leased[task.task_id] = task
+        return {'type' : 'task', 'task_id' : task.task_id, 'set_index' : task.set_index,
+            'scenario' : vars(self.parameter_sets[task.set_index].scenario),
+            'start' : task.start, 'end' : task.end}
+
+    # add the results of a batch sent back by a worker, and renew its lease; a batch
+    #  that has already been sent back by another worker is ignored
+    def AddBatch(self, worker, message, payload):
+        set_index = message['set_index']
+        batch = message['batch']
+        if (set_index, batch) not in self.done:
+            self.done.add((set_index, batch))
+            totals = self.totals[set_index]
+            for (name, value) in message['sums'].items():
+                totals.sums[name] = totals.sums.get(name, 0) + value
+            totals.count += message['count']
+            if self.sink is not None and len(payload) > 0:
+                with numpy.load(io.BytesIO(payload), allow_pickle=False) as data:
+                    self.sink.AddColumns(dict([(name, data[name]) for name in data.files]))
+
+        task = self.leased.get(message['task_id'])
+        if task is None or task.worker != worker:
+            # the task was taken away from this worker
+            return {'type' : 'cancel'}
+        task.start = batch + 1
+        task.lease_end = time.time() + LEASE_SECONDS
+        if task.start >= task.end:
+            del self.leased[task.task_id]
+            self.CheckFinished()
+        return {'type' : 'ok', 'end' : task.end}
+
+    # put the rest of a task back in the queue, or give up on it if it has been tried
+    #  too many times
+    def Release(self, task):
+        del self.leased[task.task_id]
+        task.worker = None
+        if task.attempts >= MAX_ATTEMPTS:
+            self.failed.append(task)
+            self.CheckFinished()
+        else:
+            self.pending.appendleft(task)
+            self.retried += 1
+
+    # put back the tasks of workers that have gone quiet
+    def CheckLeases(self):
+        now = time.time()
+        for task in list(self.leased.values()):
+            if now > task.lease_end:
+                self.Release(task)
+
+    # put back the task of a worker that has disconnected
+    def Drop(self, worker):
+        self.workers.discard(worker)
+        for task in list(self.leased.values()):
+            if task.worker == worker:
+                self.Release(task)
+
+    def CheckFinished(self):
+        if len(self.pending) == 0 and len(self.leased) == 0:
+            self.finished.set()
+
+
+# Worker Connection Class
+# serves one worker connected to the coordinator, on its own thread
+class WorkerConnection(socketserver.StreamRequestHandler):
+    def handle(self):
+        coordinator = self.server.coordinator
+        worker = None
+        try:
+            while True:
+                (message, payload) = ReceiveMessage(self.rfile)
+                if message is None: break
+                if worker is None:
+                    worker = message.get('name', '') + '@' + str(self.client_address)
+                with coordinator.lock:
+                    reply = coordinator.Handle(worker, message, payload)
+                SendMessage(self.wfile, reply)
+        except (OSError, ValueError):
+            pass
+        finally:
+            if worker is not None:
+                with coordinator.lock:
+                    coordinator.Drop(worker)
+
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+# start serving a coordinator on a background thread, and return the server
+def StartCoordinator(coordinator, host=WORKQUEUE_HOST, port=WORKQUEUE_PORT):
+    server = CoordinatorServer((host, port), WorkerConnection)
+    server.coordinator = coordinator
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+# wait for a coordinator to finish, checking leases while no worker is asking for work
+def WaitForCoordinator(coordinator, report=False):
+    last_count = -1
+    while not coordinator.finished.wait(1.0):
+        with coordinator.lock:
+            coordinator.CheckLeases()
+            count = len(coordinator.done)
+        if report and count != last_count:
+            print(str(count) + ' batches done')
+            last_count = count
+
+
+# print the means of some measures for each parameter set of a finished sweep
+def PrintSweep(coordinator):
+    print('{:<56} {:>8} {:>8} {:>8} {:>8}'.format('Parameter set', 'Played', 'Tank KO',
+        'KOs', 'Rounds'))
+    for (parameter_set, totals) in zip(coordinator.parameter_sets, coordinator.totals):
+        if totals.count == 0:
+            print('{:<56} {:>8}'.format(parameter_set.GetName(), 0))
+            continue
+        means = totals.GetMeans()
+        print('{:<56} {:>8} {:>8.4f} {:>8.4f} {:>8.4f}'.format(parameter_set.GetName(),
+            totals.count, means['player_ko'], means['destroyed'], means['rounds']))
+    print(str(coordinator.stolen) + ' tasks split, ' + str(coordinator.retried) +
+        ' put back in the queue, ' + str(len(coordinator.failed)) + ' given up on')
+
+
+##########################################################################################
+#                                         Worker                                         #
+##########################################################################################
+
+# connect to a coordinator and play tasks until it has none left; die_after is the number
+#  of batches to play before stopping suddenly, for testing
+def RunWorker(host, port, name, die_after=None):
+    deadline = time.time() + CONNECT_SECONDS
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            if time.time() > deadline: raise
+            time.sleep(WAIT_SECONDS)
+    rfile = sock.makefile('rb')
+    wfile = sock.makefile('wb')
+
+    def Ask(message, payload=b''):
+        SendMessage(wfile, message, payload)
+        (reply, reply_payload) = ReceiveMessage(rfile)
+        if reply is None:
+            raise OSError('Coordinator closed the connection')
+        if reply['type'] == 'error':
+            raise ValueError(reply['text'])
+        return reply
+
+    settings = Ask({'type' : 'hello', 'name' : name, 'version' : PROTOCOL_VERSION})
+    tables = {}                             # rule tables by parameter set
+    played = 0
+    try:
+        while True:
+            reply = Ask({'type' : 'get'})
+            if reply['type'] == 'done':
+                break
+            elif reply['type'] == 'wait':
+                time.sleep(reply['seconds'])
+                continue
+
+            set_index = reply['set_index']
+            scenario = armcom_sim.Scenario(**reply['scenario'])
+            if set_index not in tables:
+                if len(tables) >= TABLES_CACHE_MAX:
+                    tables.clear()
+                tables[set_index] = armcom_sim.RuleTables(scenario)
+            batch = reply['start']
+            end = reply['end']
+            while batch < end:
+                size = min(settings['batch_size'], settings['count'] - batch *
+                    settings['batch_size'])
+                result = armcom_sim.EncounterBatch(scenario, size,
+                    GetBatchSeed(settings['seed'], set_index, batch), tables[set_index]).Run()
+                totals = armcom_sim.RunTotals()
+                totals.Add([result])
+                payload = b''
+                if settings['records']:
+                    f = io.BytesIO()
+                    numpy.savez(f, **armcom_sim.GetBatchColumns(scenario, result,
+                        settings['seed'], batch * settings['batch_size']))
+                    payload = f.getvalue()
+
+                played += 1
+                if die_after is not None and played >= die_after:
+                    os._exit(1)
+
+                answer = Ask({'type' : 'batch', 'task_id' : reply['task_id'],
+                    'set_index' : set_index, 'batch' : batch, 'count' : totals.count,
+                    'sums' : totals.sums}, payload)
+                if answer['type'] == 'cancel': break
+                end = answer['end']
+                batch += 1
+    finally:
+        sock.close()
+    return played
+
+
+##########################################################################################
+#                                     Command Line                                       #
+##########################################################################################
+
+def main(args):
+    parser = argparse.ArgumentParser(description='Share out Armoured Commander simulations between worker processes.')
+    parser.add_argument('command', choices=['coordinator', 'worker', 'local'],
+        help='hand out a sweep to workers, play tasks for a coordinator, or run a sweep with local workers')
+    parser.add_argument('--host', default=WORKQUEUE_HOST,
+        help='address the coordinator listens on, or that a worker connects to')
+    parser.add_argument('--port', type=int, default=WORKQUEUE_PORT, help='coordinator port')
+    parser.add_argument('--name', default=socket.gethostname(), help='name of a worker')
+    parser.add_argument('--die-after', type=int, default=None,
+        help='stop a worker suddenly after this many batches, for testing')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+        help='number of worker processes started by local')
+    parser.add_argument('--campaign', action='append', default=None,
+        help='campaign file in the data folder; may be given more than once, default all')
+    parser.add_argument('--tank', action='append', default=None,
+        choices=armcom_sim.GetPlayerTankTypes(), metavar='MODEL', help='player tank model; may be given more than once, default all')
+    parser.add_argument('--days', type=int, default=None,
+        help='number of combat days taken from each campaign')
+    parser.add_argument('--rounds', type=int, default=armcom_sim.MAX_ROUNDS,
+        help='maximum rounds')
+    parser.add_argument('-n', '--count', type=int, default=SWEEP_ENCOUNTERS,
+        help='encounters played for each parameter set')
+    parser.add_argument('-b', '--batch-size', type=int, default=SWEEP_BATCH_SIZE,
+        help='encounters in each batch')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='random seed')
+    parser.add_argument('-o', '--output', default=None,
+        help='write a record of each encounter to this results directory')
+    options = parser.parse_args(args)
+
+    if options.command == 'worker':
+        try:
+            played = RunWorker(options.host, options.port, options.name, options.die_after)
+        except (OSError, ValueError) as e:
+            print('ERROR: ' + str(e))
+            return 1
+        print(options.name + ' played ' + str(played) + ' batches')
+        return 0
+
+    campaign_files = options.campaign
+    if campaign_files is None:
+        campaign_files = GetCampaignFiles()
+    parameter_sets = GetParameterSets(campaign_files, options.tank, options.days,
+        options.rounds)
+    if len(parameter_sets) == 0:
+        print('ERROR: No parameter sets in the sweep')
+        return 1
+    sink = None
+    if options.output is not None:
+        sink = armcom_results.ResultsSink(options.output, 'encounters')
+    coordinator = Coordinator(parameter_sets, options.count, options.batch_size,
+        options.seed, sink)
+
+    port = options.port
+    if options.command == 'local':
+        port = 0                            # any free port
+    server = StartCoordinator(coordinator, options.host, port)
+    port = server.server_address[1]
+    print(str(len(parameter_sets)) + ' parameter sets, ' + str(len(coordinator.pending)) +
+        ' tasks, listening on ' + options.host + ':' + str(port))
+
+    processes = []
+    if options.command == 'local':
+        for n in range(options.workers):
+            command = [sys.executable, os.path.abspath(__file__), 'worker', '--host',
+                options.host, '--port', str(port), '--name', 'worker' + str(n)]
+            processes.append(subprocess.Popen(command))
+
+    start = time.time()
+    try:
+        WaitForCoordinator(coordinator, report=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+        for process in processes:
+            process.wait()
+    elapsed = time.time() - start
+
+    if sink is not None:
+        sink.Close()
+    PrintSweep(coordinator)
+    if sink is not None:
+        print(str(sink.written) + ' records written to ' + options.output)
+    played = sum([totals.count for totals in coordinator.totals])
+    print(str(played) + ' encounters in ' + '{:.2f}'.format(elapsed) + ' seconds, ' +
+        '{:.0f}'.format(played / elapsed) + ' a second')
+    if len(coordinator.failed) > 0:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
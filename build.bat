@@ -3,6 +3,8 @@ copy /y .\*.dll .\dist\armcom
 copy /y .\*.lib .\dist\armcom
 copy /y .\*.png .\dist\armcom
 copy /y .\steam_appid.txt .\dist\armcom
+python armcom_assets.py build
+copy /y .\armcom.pak .\dist\armcom
 mkdir .\dist\armcom\data
 copy /y .\data\*.* .\dist\armcom\data
 mkdir .\dist\armcom\sounds
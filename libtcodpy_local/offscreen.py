@@ -0,0 +1,569 @@
+#
+# Offscreen console backend for the libtcod Python wrapper
+#
+# Implements the part of the libtcod console API used by Armoured Commander in pure
+# Python, storing the character, foreground and background of every cell in NumPy
+# arrays instead of going through libtcod. Nothing needs a display: the root console is
+# just another array, console_flush does nothing, and no input events ever arrive.
+#
+# Select it by setting the environment variable LIBTCOD_BACKEND=offscreen before
+# libtcodpy_local is first imported; the functions here then replace the libtcod ones.
+#
+# Consoles are Console objects instead of libtcod console pointers. As with libtcod,
+# 0 or None is the root console, created by console_init_root.
+#
+# Random number generators are Python random.Random objects, so that the game's dice
+# rolls work without libtcod too. As with libtcod, 0 or None is the default generator,
+# and it can be reseeded by restoring a saved copy of a seeded generator into it.
+#
+
+import ctypes
+import random
+
+import numpy
+
+from . import Color, Key, Mouse
+from . import BKGND_NONE, BKGND_SET, BKGND_MULTIPLY, BKGND_LIGHTEN, BKGND_DARKEN
+from . import BKGND_SCREEN, BKGND_COLOR_DODGE, BKGND_COLOR_BURN, BKGND_ADD, BKGND_ADDA
+from . import BKGND_BURN, BKGND_OVERLAY, BKGND_ALPH, BKGND_DEFAULT
+from . import LEFT, RIGHT, CENTER, KEY_RELEASED, EVENT_NONE, RENDERER_SDL
+from . import COLCTRL_1, COLCTRL_NUMBER, COLCTRL_FORE_RGB, COLCTRL_BACK_RGB, COLCTRL_STOP
+from . import CHAR_HLINE, CHAR_VLINE, CHAR_NE, CHAR_NW, CHAR_SE, CHAR_SW
+
+__all__ = [
+    'Console', 'console_init_root', 'console_set_custom_font', 'console_flush',
+    'console_is_window_closed', 'console_set_fullscreen', 'console_is_fullscreen',
+    'console_set_window_title', 'console_new', 'console_delete', 'console_get_width',
+    'console_get_height', 'console_set_default_background',
+    'console_set_default_foreground', 'console_get_default_background',
+    'console_get_default_foreground', 'console_set_background_flag',
+    'console_get_background_flag', 'console_set_alignment', 'console_get_alignment',
+    'console_clear', 'console_put_char', 'console_put_char_ex', 'console_set_char',
+    'console_set_char_background', 'console_set_char_foreground', 'console_get_char',
+    'console_get_char_background', 'console_get_char_foreground', 'console_print',
+    'console_print_ex', 'console_print_frame', 'console_rect', 'console_hline',
+    'console_vline', 'console_blit', 'console_set_key_color', 'console_set_color_control',
+    'console_set_fade', 'console_get_fade', 'console_get_fading_color',
+    'console_check_for_keypress', 'console_wait_for_keypress', 'console_is_key_pressed',
+    'sys_check_for_event', 'sys_wait_for_event', 'sys_set_fps', 'sys_get_fps',
+    'sys_sleep_milli', 'sys_get_renderer', 'sys_set_renderer',
+    'sys_force_fullscreen_resolution', 'color_lerp', 'console_get_arrays',
+    'console_to_text', 'random_get_instance', 'random_new', 'random_new_from_seed',
+    'random_set_distribution', 'random_get_int', 'random_get_float', 'random_get_double',
+    'random_save', 'random_restore', 'random_delete',
+]
+
+_root = None                # root console
+_fullscreen = False
+_renderer = RENDERER_SDL
+_fps = 0
+_fade = 255
+_fading_color = (0, 0, 0)
+_color_control = [((255, 255, 255), (0, 0, 0))] * COLCTRL_NUMBER    # (fore, back)
+_random = random.Random()   # default random number generator
+
+
+class Console(object):
+    def __init__(self, w, h):
+        self.w = w
+        self.h = h
+        self.ch = numpy.empty((h, w), dtype=numpy.int32)
+        self.fg = numpy.empty((h, w, 3), dtype=numpy.uint8)
+        self.bg = numpy.empty((h, w, 3), dtype=numpy.uint8)
+        self.fore = (255, 255, 255)
+        self.back = (0, 0, 0)
+        self.bkgnd_flag = BKGND_NONE
+        self.alignment = LEFT
+        self.key_color = None
+        self.clear()
+
+    def clear(self):
+        self.ch[...] = ord(' ')
+        self.fg[...] = self.fore
+        self.bg[...] = self.back
+
+
+def _get(con):
+    if con is None or con == 0:
+        return _root
+    return con
+
+def _rgb(col):
+    return (col[0], col[1], col[2])
+
+def _char_code(c):
+    if type(c) == str or type(c) == bytes:
+        return ord(c)
+    return c
+
+# clip a rectangle to a console, returning row and column slices or None if nothing is left
+def _clip(con, x, y, w, h):
+    x0 = max(x, 0)
+    y0 = max(y, 0)
+    x1 = min(x + w, con.w)
+    y1 = min(y + h, con.h)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return (slice(y0, y1), slice(x0, x1))
+
+# linear interpolation between two arrays of colours, as TCOD_color_lerp
+def _lerp(c1, c2, coef):
+    c1 = c1.astype(numpy.float32)
+    return (c1 + (numpy.asarray(c2, dtype=numpy.float32) - c1) * coef).astype(numpy.uint8)
+
+# set the background of a block of cells using a background flag, as
+#  TCOD_console_set_char_background; col may be one colour or an array of colours
+def _set_background(con, rows, cols, col, flag):
+    if flag == BKGND_DEFAULT:
+        flag = con.bkgnd_flag
+    mode = flag & 0xff
+    if mode == BKGND_NONE:
+        return
+    if mode == BKGND_SET:
+        con.bg[rows, cols] = col
+        return
+    old = con.bg[rows, cols].astype(numpy.int32)
+    new = numpy.asarray(col, dtype=numpy.int32)
+    alpha = (flag >> 8) / 255.0
+    if mode == BKGND_MULTIPLY:
+        result = old * new // 255
+    elif mode == BKGND_LIGHTEN:
+        result = numpy.maximum(old, new)
+    elif mode == BKGND_DARKEN:
+        result = numpy.minimum(old, new)
+    elif mode == BKGND_SCREEN:
+        result = 255 - (255 - old) * (255 - new) // 255
+    elif mode == BKGND_COLOR_DODGE:
+        result = numpy.where(old != 255, 255 * new // numpy.maximum(255 - old, 1), 255)
+    elif mode == BKGND_COLOR_BURN:
+        result = numpy.where(new != 0, 255 - 255 * (255 - old) // numpy.maximum(new, 1), 0)
+    elif mode == BKGND_ADD:
+        result = old + new
+    elif mode == BKGND_ADDA:
+        result = old + alpha * new
+    elif mode == BKGND_BURN:
+        result = old + new - 255
+    elif mode == BKGND_OVERLAY:
+        result = numpy.where(new <= 128, 2 * new * old // 255,
+            255 - 2 * (255 - new) * (255 - old) // 255)
+    elif mode == BKGND_ALPH:
+        result = old + (new - old) * alpha
+    else:
+        result = new + old * 0
+    con.bg[rows, cols] = numpy.clip(result, 0, 255).astype(numpy.uint8)
+
+
+# root console and window
+
+def console_init_root(w, h, title='', fullscreen=False, renderer=RENDERER_SDL, vsync=False):
+    global _root, _fullscreen, _renderer
+    _root = Console(w, h)
+    _fullscreen = fullscreen
+    _renderer = renderer
+
+def console_set_custom_font(fontFile, flags=0, nb_char_horiz=0, nb_char_vertic=0):
+    pass
+
+def console_flush():
+    pass
+
+def console_is_window_closed():
+    return False
+
+def console_set_fullscreen(fullscreen):
+    global _fullscreen
+    _fullscreen = fullscreen
+
+def console_is_fullscreen():
+    return _fullscreen
+
+def console_set_window_title(title):
+    pass
+
+
+# offscreen consoles
+
+def console_new(w, h):
+    return Console(w, h)
+
+def console_delete(con):
+    pass
+
+def console_get_width(con):
+    return _get(con).w
+
+def console_get_height(con):
+    return _get(con).h
+
+
+# console defaults
+
+def console_set_default_background(con, col):
+    _get(con).back = _rgb(col)
+
+def console_set_default_foreground(con, col):
+    _get(con).fore = _rgb(col)
+
+def console_get_default_background(con):
+    return Color(*_get(con).back)
+
+def console_get_default_foreground(con):
+    return Color(*_get(con).fore)
+
+def console_set_background_flag(con, flag):
+    _get(con).bkgnd_flag = flag
+
+def console_get_background_flag(con):
+    return _get(con).bkgnd_flag
+
+def console_set_alignment(con, alignment):
+    _get(con).alignment = alignment
+
+def console_get_alignment(con):
+    return _get(con).alignment
+
+def console_set_key_color(con, col):
+    _get(con).key_color = _rgb(col)
+
+def console_set_color_control(con, fore, back):
+    # con is the colour control number, as in libtcod
+    _color_control[con - COLCTRL_1] = (_rgb(fore), _rgb(back))
+
+
+# drawing on a console
+
+def console_clear(con):
+    _get(con).clear()
+
+def console_put_char(con, x, y, c, flag=BKGND_DEFAULT):
+    con = _get(con)
+    if not (0 <= x < con.w and 0 <= y < con.h): return
+    con.ch[y, x] = _char_code(c)
+    con.fg[y, x] = con.fore
+    _set_background(con, y, x, con.back, flag)
+
+def console_put_char_ex(con, x, y, c, fore, back):
+    con = _get(con)
+    if not (0 <= x < con.w and 0 <= y < con.h): return
+    con.ch[y, x] = _char_code(c)
+    con.fg[y, x] = _rgb(fore)
+    con.bg[y, x] = _rgb(back)
+
+def console_set_char(con, x, y, c):
+    con = _get(con)
+    if not (0 <= x < con.w and 0 <= y < con.h): return
+    con.ch[y, x] = _char_code(c)
+
+def console_set_char_background(con, x, y, col, flag=BKGND_SET):
+    con = _get(con)
+    if not (0 <= x < con.w and 0 <= y < con.h): return
+    _set_background(con, y, x, _rgb(col), flag)
+
+def console_set_char_foreground(con, x, y, col):
+    con = _get(con)
+    if not (0 <= x < con.w and 0 <= y < con.h): return
+    con.fg[y, x] = _rgb(col)
+
+def console_get_char(con, x, y):
+    return int(_get(con).ch[y, x])
+
+def console_get_char_background(con, x, y):
+    return Color(*[int(v) for v in _get(con).bg[y, x]])
+
+def console_get_char_foreground(con, x, y):
+    return Color(*[int(v) for v in _get(con).fg[y, x]])
+
+# print one line of text, handling colour control codes
+def _print_line(con, x, y, flag, alignment, text):
+    codes = []
+    fores = []
+    backs = []
+    fore = con.fore
+    back = con.back
+    i = 0
+    while i < len(text):
+        c = ord(text[i])
+        if COLCTRL_1 <= c <= COLCTRL_NUMBER:
+            (fore, back) = _color_control[c - COLCTRL_1]
+        elif c == COLCTRL_FORE_RGB and i + 3 < len(text):
+            fore = (ord(text[i+1]), ord(text[i+2]), ord(text[i+3]))
+            i += 3
+        elif c == COLCTRL_BACK_RGB and i + 3 < len(text):
+            back = (ord(text[i+1]), ord(text[i+2]), ord(text[i+3]))
+            i += 3
+        elif c == COLCTRL_STOP:
+            (fore, back) = (con.fore, con.back)
+        else:
+            codes.append(c)
+            fores.append(fore)
+            backs.append(back)
+        i += 1
+
+    if alignment == RIGHT:
+        x -= len(codes) - 1
+    elif alignment == CENTER:
+        x -= len(codes) // 2
+
+    # clip to console
+    if y < 0 or y >= con.h: return
+    start = max(0, -x)
+    end = min(len(codes), con.w - x)
+    if start >= end: return
+    cols = slice(x + start, x + end)
+    con.ch[y, cols] = codes[start:end]
+    con.fg[y, cols] = fores[start:end]
+    _set_background(con, y, cols, backs[start:end], flag)
+
+def _print(con, x, y, flag, alignment, fmt):
+    con = _get(con)
+    if type(fmt) == bytes:
+        fmt = fmt.decode('latin-1')
+    for line in str(fmt).split('\n'):
+        _print_line(con, x, y, flag, alignment, line)
+        y += 1
+
+def console_print(con, x, y, fmt):
+    c = _get(con)
+    _print(c, x, y, c.bkgnd_flag, c.alignment, fmt)
+
+def console_print_ex(con, x, y, flag, alignment, fmt):
+    _print(con, x, y, flag, alignment, fmt)
+
+def console_rect(con, x, y, w, h, clr, flag=BKGND_DEFAULT):
+    con = _get(con)
+    area = _clip(con, x, y, w, h)
+    if area is None: return
+    (rows, cols) = area
+    _set_background(con, rows, cols, con.back, flag)
+    if clr:
+        con.ch[rows, cols] = ord(' ')
+
+def console_hline(con, x, y, l, flag=BKGND_DEFAULT):
+    con = _get(con)
+    area = _clip(con, x, y, l, 1)
+    if area is None: return
+    (rows, cols) = area
+    con.ch[rows, cols] = CHAR_HLINE
+    con.fg[rows, cols] = con.fore
+    _set_background(con, rows, cols, con.back, flag)
+
+def console_vline(con, x, y, l, flag=BKGND_DEFAULT):
+    con = _get(con)
+    area = _clip(con, x, y, 1, l)
+    if area is None: return
+    (rows, cols) = area
+    con.ch[rows, cols] = CHAR_VLINE
+    con.fg[rows, cols] = con.fore
+    _set_background(con, rows, cols, con.back, flag)
+
+def console_print_frame(con, x, y, w, h, clear=True, flag=BKGND_DEFAULT, fmt=''):
+    c = _get(con)
+    console_put_char(c, x, y, CHAR_NW, flag)
+    console_put_char(c, x+w-1, y, CHAR_NE, flag)
+    console_put_char(c, x, y+h-1, CHAR_SW, flag)
+    console_put_char(c, x+w-1, y+h-1, CHAR_SE, flag)
+    console_hline(c, x+1, y, w-2, flag)
+    console_hline(c, x+1, y+h-1, w-2, flag)
+    if h > 2:
+        console_vline(c, x, y+1, h-2, flag)
+        console_vline(c, x+w-1, y+1, h-2, flag)
+        if clear:
+            console_rect(c, x+1, y+1, w-2, h-2, True, flag)
+    if fmt:
+        # title is printed on the top line with the default colours swapped
+        if type(fmt) == bytes:
+            fmt = fmt.decode('latin-1')
+        title = ' ' + fmt + ' '
+        (fore, back) = (c.fore, c.back)
+        (c.fore, c.back) = (back, fore)
+        _print(c, x + (w - len(title)) // 2, y, BKGND_SET, LEFT, title)
+        (c.fore, c.back) = (fore, back)
+
+def console_blit(src, x, y, w, h, dst, xdst, ydst, ffade=1.0, bfade=1.0):
+    src = _get(src)
+    dst = _get(dst)
+    if w == 0: w = src.w
+    if h == 0: h = src.h
+
+    # clip to both consoles
+    if x < 0:
+        (w, xdst, x) = (w + x, xdst - x, 0)
+    if y < 0:
+        (h, ydst, y) = (h + y, ydst - y, 0)
+    if xdst < 0:
+        (w, x, xdst) = (w + xdst, x - xdst, 0)
+    if ydst < 0:
+        (h, y, ydst) = (h + ydst, y - ydst, 0)
+    w = min(w, src.w - x, dst.w - xdst)
+    h = min(h, src.h - y, dst.h - ydst)
+    if w <= 0 or h <= 0: return
+
+    # copy the source first, since it may be the same console as the destination
+    s_rows = slice(y, y+h)
+    s_cols = slice(x, x+w)
+    sch = src.ch[s_rows, s_cols].copy()
+    sfg = src.fg[s_rows, s_cols].copy()
+    sbg = src.bg[s_rows, s_cols].copy()
+    d_rows = slice(ydst, ydst+h)
+    d_cols = slice(xdst, xdst+w)
+    dch = dst.ch[d_rows, d_cols]
+    dfg = dst.fg[d_rows, d_cols]
+    dbg = dst.bg[d_rows, d_cols]
+
+    # cells with the key colour as background are not copied
+    if src.key_color is not None:
+        mask = numpy.any(sbg != src.key_color, axis=2)
+    else:
+        mask = numpy.ones((h, w), dtype=bool)
+
+    if ffade == 1.0 and bfade == 1.0:
+        dch[mask] = sch[mask]
+        dfg[mask] = sfg[mask]
+        dbg[mask] = sbg[mask]
+        return
+
+    # faded blit, as TCOD_console_blit
+    new_ch = dch.copy()
+    new_fg = dfg.copy()
+    new_bg = _lerp(dbg, sbg, bfade)
+
+    src_blank = (sch == ord(' '))
+    dst_blank = (dch == ord(' '))
+    same = (dch == sch)
+
+    m = src_blank
+    new_fg[m] = _lerp(dfg, sbg, bfade)[m]
+    m = ~src_blank & dst_blank
+    new_ch[m] = sch[m]
+    new_fg[m] = _lerp(dbg, sfg, ffade)[m]
+    m = ~src_blank & ~dst_blank & same
+    new_fg[m] = _lerp(dfg, sfg, ffade)[m]
+    m = ~src_blank & ~dst_blank & ~same
+    if ffade < 0.5:
+        new_fg[m] = _lerp(dfg, dbg, ffade * 2)[m]
+    else:
+        new_ch[m] = sch[m]
+        new_fg[m] = _lerp(dbg, sfg, (ffade - 0.5) * 2)[m]
+
+    dch[mask] = new_ch[mask]
+    dfg[mask] = new_fg[mask]
+    dbg[mask] = new_bg[mask]
+
+def console_set_fade(fade, fadingColor):
+    global _fade, _fading_color
+    _fade = fade
+    _fading_color = _rgb(fadingColor)
+
+def console_get_fade():
+    return _fade
+
+def console_get_fading_color():
+    return Color(*_fading_color)
+
+def color_lerp(c1, c2, a):
+    return Color(int(c1[0] + (c2[0] - c1[0]) * a), int(c1[1] + (c2[1] - c1[1]) * a),
+        int(c1[2] + (c2[2] - c1[2]) * a))
+
+
+# input; there is never any
+
+def _clear_events(k, m):
+    if k is not None:
+        ctypes.memset(ctypes.byref(k), 0, ctypes.sizeof(k))
+    if m is not None:
+        ctypes.memset(ctypes.byref(m), 0, ctypes.sizeof(m))
+
+def console_check_for_keypress(flags=KEY_RELEASED):
+    return Key()
+
+def console_wait_for_keypress(flush):
+    return Key()
+
+def console_is_key_pressed(key):
+    return False
+
+def sys_check_for_event(mask, k, m):
+    _clear_events(k, m)
+    return EVENT_NONE
+
+def sys_wait_for_event(mask, k, m, flush):
+    _clear_events(k, m)
+    return EVENT_NONE
+
+
+# system
+
+def sys_set_fps(fps):
+    global _fps
+    _fps = fps
+
+def sys_get_fps():
+    return _fps
+
+def sys_sleep_milli(val):
+    pass
+
+def sys_get_renderer():
+    return _renderer
+
+def sys_set_renderer(renderer):
+    global _renderer
+    _renderer = renderer
+
+def sys_force_fullscreen_resolution(width, height):
+    pass
+
+
+# random number generators
+
+def _get_random(rnd):
+    if rnd is None or rnd == 0:
+        return _random
+    return rnd
+
+def random_get_instance():
+    return _random
+
+def random_new(algo=0):
+    return random.Random()
+
+def random_new_from_seed(seed, algo=0):
+    return random.Random(seed)
+
+def random_set_distribution(rnd, dist):
+    pass
+
+def random_get_int(rnd, mi, ma):
+    if mi > ma:
+        (mi, ma) = (ma, mi)
+    return _get_random(rnd).randint(mi, ma)
+
+def random_get_float(rnd, mi, ma):
+    return _get_random(rnd).uniform(mi, ma)
+
+def random_get_double(rnd, mi, ma):
+    return _get_random(rnd).uniform(mi, ma)
+
+def random_save(rnd):
+    backup = random.Random()
+    backup.setstate(_get_random(rnd).getstate())
+    return backup
+
+def random_restore(rnd, backup):
+    _get_random(rnd).setstate(backup.getstate())
+
+def random_delete(rnd):
+    pass
+
+
+# reading back console contents
+
+def console_get_arrays(con):
+    '''return the character, foreground and background arrays of a console'''
+    con = _get(con)
+    return (con.ch, con.fg, con.bg)
+
+def console_to_text(con):
+    '''return the characters of a console as a list of strings, one per row'''
+    con = _get(con)
+    return [''.join([chr(c) for c in row]) for row in con.ch]
@@ -40,6 +40,19 @@ class STEAMWORKS(object):
     _arch = s_util.get_arch()
     _native_supported_platforms = ['linux', 'linux2', 'darwin', 'win32']
 
+    # Interface classes, created on first access
+    _interfaces = {
+        'Apps':         SteamApps,
+        'Friends':      SteamFriends,
+        'Matchmaking':  SteamMatchmaking,
+        'Music':        SteamMusic,
+        'Screenshots':  SteamScreenshots,
+        'Users':        SteamUsers,
+        'UserStats':    SteamUserStats,
+        'Utils':        SteamUtils,
+        'Workshop':     SteamWorkshop
+    }
+
     def __init__(self, supported_platforms: list = []) -> None:
         self._supported_platforms = supported_platforms
         self._loaded 	= False
@@ -95,41 +108,73 @@ class STEAMWORKS(object):
 
 
     def _load_steamworks_api(self) -> None:
-        """Load all methods from steamworks api and assign their correct arg/res types based on method map
+        """Prepare the steamworks api. Methods are bound, with their correct arg/res types based on
+        the method map, the first time that they are used
 
         :return: None
         """
         if not self._loaded:
             raise SteamNotLoadedException('STEAMWORKS not yet loaded')
 
-        for method_name, attributes in STEAMWORKS_METHODS.items():
-            f = getattr(self._cdll, method_name)
+        self._unbind_steamworks_api()
+
+
+    def _bind_method(self, method_name: str) -> object:
+        """Look up a method from the steamworks api and assign its arg/res types
+
+        :param method_name: str
+        :return: object
+        """
+        if not self._loaded:
+            raise SteamNotLoadedException('STEAMWORKS not yet loaded')
+
+        f = getattr(self._cdll, method_name)
+        attributes = STEAMWORKS_METHODS[method_name]
+
+        if 'restype' in attributes:
+            f.restype = attributes['restype']
 
-            if 'restype' in attributes:
-                f.restype = attributes['restype']
+        if 'argtypes' in attributes:
+            f.argtypes = attributes['argtypes']
 
-            if 'argtypes' in attributes:
-                f.argtypes = attributes['argtypes']
+        setattr(self, method_name, f)
+        return f
 
-            setattr(self, method_name, f)
 
-        self._reload_steamworks_interfaces()
+    def _unbind_steamworks_api(self) -> None:
+        """Forget all bound methods and interfaces, so they will be set up again when next used
+
+        :return: None
+        """
+        for name in list(self.__dict__.keys()):
+            if name in STEAMWORKS_METHODS or name in STEAMWORKS._interfaces:
+                del self.__dict__[name]
 
 
     def _reload_steamworks_interfaces(self) -> None:
-        """Reload all interface classes
+        """Reload all interface classes. They will be created again when next used
 
         :return: None
         """
-        self.Apps           = SteamApps(self)
-        self.Friends        = SteamFriends(self)
-        self.Matchmaking    = SteamMatchmaking(self)
-        self.Music          = SteamMusic(self)
-        self.Screenshots    = SteamScreenshots(self)
-        self.Users          = SteamUsers(self)
-        self.UserStats      = SteamUserStats(self)
-        self.Utils          = SteamUtils(self)
-        self.Workshop       = SteamWorkshop(self)
+        for name in STEAMWORKS._interfaces:
+            self.__dict__.pop(name, None)
+
+
+    def __getattr__(self, name: str) -> object:
+        """Bind steamworks api methods and create interfaces on first access
+
+        :param name: str
+        :return: object
+        """
+        if name in STEAMWORKS_METHODS:
+            return self._bind_method(name)
+
+        if name in STEAMWORKS._interfaces:
+            interface = STEAMWORKS._interfaces[name](self)
+            setattr(self, name, interface)
+            return interface
+
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
 
 
     def initialize(self) -> bool:
@@ -172,6 +217,7 @@ class STEAMWORKS(object):
         self._cdll.SteamShutdown()
         self._loaded    = False
         self._cdll      = None
+        self._unbind_steamworks_api()
 
 
     def loaded(self) -> bool:
@@ -0,0 +1,85 @@
+# -*- coding: UTF-8 -*-
+# checks that a campaign day map generated in the background is the one the day uses
+#   python -m unittest discover tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import armcom_sim                       # starts the game up without a window
+from armcom_sim import armcom, libtcod
+
+# game functions that wait for input or go on to play the day, left out while testing
+UI_FUNCTIONS = ['CampaignViewTank', 'TutorialMessage', 'WaitForEnter', 'PopUp',
+    'WriteJournal', 'SaveGame', 'DoCampaignDay']
+
+
+class MapPrefetchTest(unittest.TestCase):
+
+    def setUp(self):
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        # as in InitRootConsole(), without a window
+        libtcod.console_init_root(armcom.SCREEN_WIDTH, armcom.SCREEN_HEIGHT, 'Test', False)
+        armcom.con = libtcod.console_new(armcom.SCREEN_WIDTH, armcom.SCREEN_HEIGHT)
+        armcom.mouse = libtcod.Mouse()
+        armcom.key = libtcod.Key()
+        armcom.InitMenuConsoles()
+        armcom.InitGameConsoles()
+        armcom_sim.SetupGame(armcom_sim.Scenario(date=(1944, 7, 27)))
+        campaign = armcom.campaign
+        campaign.days = []
+        campaign.scen_res = 'Medium'
+        campaign.action_day = True
+        armcom.battle = None
+
+        self.functions = {}
+        for name in UI_FUNCTIONS:
+            self.functions[name] = getattr(armcom, name)
+            setattr(armcom, name, lambda *args, **kwargs: None)
+
+        # note each map handed over by the prefetcher
+        self.taken = []
+        take = armcom.MapPrefetcher.Take
+        def Take(prefetcher, key):
+            self.taken.append((prefetcher.job, take(prefetcher, key)))
+            return self.taken[-1][1]
+        self.functions['Take'] = take
+        armcom.MapPrefetcher.Take = Take
+
+    def tearDown(self):
+        armcom.MapPrefetcher.Take = self.functions.pop('Take')
+        for (name, function) in self.functions.items():
+            setattr(armcom, name, function)
+        armcom.map_prefetcher.Cancel()
+
+    # start a prefetch as the calendar screen does, and start the day
+    def StartDay(self, seed, wait):
+        armcom_sim.SeedGame(seed)
+        armcom.map_prefetcher.Start(armcom.GetMapPrefetchKey())
+        job = armcom.map_prefetcher.job
+        if wait:
+            self.assertTrue(job.done.wait(30))
+        armcom.InitCampaignDay()
+        return job
+
+    # return what makes up a day map
+    def GetMapSignature(self, day_map):
+        return (day_map.seed, [(node.x, node.y, node.node_type, node.resistance) for node
+            in day_map.nodes])
+
+    def testPrefetchedMapUsed(self):
+        job = self.StartDay(1, True)
+        self.assertEqual(len(self.taken), 1)
+        self.assertIs(self.taken[0][1], job.day_map)
+        self.assertIs(armcom.campaign.day_map, job.day_map)
+
+    def testSameMapWithoutWaiting(self):
+        prefetched = self.GetMapSignature(self.StartDay(2, True).day_map)
+        self.StartDay(2, False)
+        self.assertEqual(self.GetMapSignature(armcom.campaign.day_map), prefetched)
+
+
+if __name__ == '__main__':
+    unittest.main()
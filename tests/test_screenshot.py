@@ -0,0 +1,56 @@
+# -*- coding: UTF-8 -*-
+# checks that screenshots can be taken and saved as text without a window
+#   python -m unittest discover tests
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('LIBTCOD_BACKEND', 'offscreen')
+import libtcodpy_local as libtcod
+
+from armcom_screenshot import GrabScreen, ScreenshotWriter
+
+
+class ScreenshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        libtcod.console_init_root(20, 3, 'Screenshot Test', False)
+        libtcod.console_set_default_foreground(0, libtcod.white)
+        libtcod.console_set_default_background(0, libtcod.black)
+        libtcod.console_clear(0)
+        libtcod.console_print(0, 1, 1, 'Panzer ahead')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testGrabCells(self):
+        grab = GrabScreen(libtcod, cells=True)
+        self.assertIsNone(grab.image)
+        self.assertEqual(len(grab.chars), 3)
+        self.assertEqual(len(grab.chars[0]), 20)
+        self.assertEqual(grab.fore[1][1], (255, 255, 255))
+        self.assertEqual(grab.back[1][1], (0, 0, 0))
+
+    def testWriteText(self):
+        filename = os.path.join(self.directory, 'screenshot')
+        writer = ScreenshotWriter(libtcod)
+        self.assertTrue(writer.Save(GrabScreen(libtcod, cells=True), filename))
+        writer.Finish()
+        self.assertEqual(writer.GetErrors(), [])
+        self.assertFalse(os.path.exists(filename + '.png'))
+        with open(filename + '.txt', encoding='utf-8') as f:
+            self.assertEqual(f.read().splitlines(), ['', ' Panzer ahead', ''])
+        with open(filename + '.ans', encoding='utf-8') as f:
+            text = f.read()
+        self.assertIn('\x1b[38;2;255;255;255m\x1b[48;2;0;0;0m', text)
+        self.assertIn('Panzer ahead', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# -*- coding: UTF-8 -*-
+# checks that snapshots of an encounter put back everything that can change during one
+#   python -m unittest discover tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import armcom_sim                       # starts the game up without a window
+from armcom_sim import armcom
+from armcom_snapshot import Fork
+
+# game functions that draw or wait for input, left out while testing
+UI_FUNCTIONS = ['PopUp', 'WriteJournal', 'UpdateDateCon', 'PaintMapCon', 'UpdateMapOverlay']
+
+
+class ForkTest(unittest.TestCase):
+
+    def setUp(self):
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        armcom_sim.SetupGame(armcom_sim.Scenario(date=(1944, 7, 27)))
+        for (unit_class, unit_type) in armcom_sim.DEFAULT_ENEMIES:
+            armcom_sim.SpawnUnit(unit_class, unit_type)
+        campaign = armcom.campaign
+        campaign.hour = 12
+        campaign.minute = 0
+        campaign.weather.clouds = 'Overcast'
+
+        # a rescue quest that runs out at 13:00
+        day_map = campaign.day_map
+        day_map.nodes = [day_map.player_node, armcom.MapNode(1, 0)]
+        node = day_map.nodes[1]
+        node.quest_type = 'RESCUE'
+        node.quest_vp_bonus = 15
+        node.quest_time_limit = (13, 0)
+        day_map.AddQuestDeadline(node)
+        campaign.quest_active = True
+
+        # the game's consoles are not made without a window, and pop-ups would wait for
+        #  a key
+        self.functions = {}
+        for name in UI_FUNCTIONS:
+            self.functions[name] = getattr(armcom, name)
+            setattr(armcom, name, lambda *args, **kwargs: None)
+
+    def tearDown(self):
+        for (name, function) in self.functions.items():
+            setattr(armcom, name, function)
+
+    # return the weather, and the quest state of the campaign and day map
+    def GetState(self):
+        campaign = armcom.campaign
+        weather = campaign.weather
+        node = campaign.day_map.nodes[1]
+        return ((weather.clouds, weather.fog, weather.precip, weather.ground,
+            weather.rain_time, weather.dry_time), campaign.quest_active, node.quest_type,
+            node.quest_time_limit, node.quest_vp_bonus,
+            list(campaign.day_map.quest_deadlines), campaign.hour, campaign.minute)
+
+    def testWeatherAndQuestRestored(self):
+        before = self.GetState()
+        weather_changed = False
+        for seed in range(50):
+            armcom_sim.SeedGame(seed)
+            with Fork(armcom):
+                armcom.campaign.SpendTime(3, 0)
+                during = self.GetState()
+                self.assertIsNone(during[2])
+                self.assertFalse(during[1])
+                if during[0][:3] != before[0][:3]:
+                    weather_changed = True
+            self.assertEqual(self.GetState(), before)
+            if weather_changed: break
+        self.assertTrue(weather_changed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -117,9 +117,10 @@ def load_xp_string(file_string, reverse_endian=True):
 
 	offset = 0
 
-	version = file_string[offset : offset + version_bytes]
+	# copy the small slices that get reversed, in case file_string is a memoryview
+	version = bytes(file_string[offset : offset + version_bytes])
 	offset += version_bytes
-	layer_count = file_string[offset : offset + layer_count_bytes]
+	layer_count = bytes(file_string[offset : offset + layer_count_bytes])
 	offset += layer_count_bytes
 
 	if reverse_endian:
@@ -138,8 +139,8 @@ def load_xp_string(file_string, reverse_endian=True):
 	for layer in range(layer_count):
 		#slight lookahead to figure out how much data to feed load_layer
 
-		this_layer_width = file_string[offset:offset + layer_width_bytes]
-		this_layer_height = file_string[offset + layer_width_bytes:offset + layer_width_bytes + layer_height_bytes]
+		this_layer_width = bytes(file_string[offset:offset + layer_width_bytes])
+		this_layer_height = bytes(file_string[offset + layer_width_bytes:offset + layer_width_bytes + layer_height_bytes])
 
 		if reverse_endian:
 			this_layer_width = this_layer_width[::-1]
@@ -174,9 +175,9 @@ def load_xp_string(file_string, reverse_endian=True):
 def parse_layer(layer_string, reverse_endian=True):
 	offset = 0
 
-	width = layer_string[offset:offset + layer_width_bytes]
+	width = bytes(layer_string[offset:offset + layer_width_bytes])
 	offset += layer_width_bytes
-	height = layer_string[offset:offset + layer_height_bytes]
+	height = bytes(layer_string[offset:offset + layer_height_bytes])
 	offset += layer_height_bytes
 
 	if reverse_endian:
@@ -211,7 +212,7 @@ def parse_layer(layer_string, reverse_endian=True):
 def parse_individual_cell(cell_string, reverse_endian=True):
 	offset = 0
 
-	keycode = cell_string[offset:offset + layer_keycode_bytes]
+	keycode = bytes(cell_string[offset:offset + layer_keycode_bytes])
 	if reverse_endian:
 		keycode = keycode[::-1]
 	